@@ -2,8 +2,11 @@
 API Clients for Economic Data Sources
 """
 
-from .base_client import BaseAPIClient
-from .fred_client import FREDClient, get_fred_client
+from .base_client import BaseAPIClient, CircuitOpenError
+from .http_cache import HTTPCache, NotModified
+from .price_cache import PriceHistoryCache
+from .sdmx import iter_sdmx_csv, parse_time_period
+from .fred_client import FREDClient, SeriesFetchError, get_fred_client
 from .yfinance_client import YFinanceClient, get_yfinance_client
 from .bls_client import BLSClient, get_bls_client
 from .oecd_client import OECDClient, get_oecd_client
@@ -14,8 +17,11 @@ from .ecb_client import ECBClient, get_ecb_client
 from .world_bank_client import WorldBankClient, get_world_bank_client
 
 __all__ = [
-    'BaseAPIClient',
-    'FREDClient', 'get_fred_client',
+    'BaseAPIClient', 'CircuitOpenError',
+    'HTTPCache', 'NotModified',
+    'PriceHistoryCache',
+    'iter_sdmx_csv', 'parse_time_period',
+    'FREDClient', 'SeriesFetchError', 'get_fred_client',
     'YFinanceClient', 'get_yfinance_client',
     'BLSClient', 'get_bls_client',
     'OECDClient', 'get_oecd_client',
@@ -3,30 +3,433 @@ Base API Client for all economic data sources
 """
 
 import os
+import json
 import time
+import random
+import asyncio
+import functools
+import threading
 import requests
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import pandas as pd
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from .http_cache import NotModified, get_http_cache
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+# Reserve one token from a bucket stored in a Redis hash and return how long the
+# caller must wait for it. Uses the Redis clock so every worker agrees on time.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 60)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+_redis_client = None
+
+
+def _get_redis_client():
+    """Shared Redis connection for rate limiting, or None when Redis is not installed"""
+    global _redis_client
+    if redis is None:
+        return None
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            os.getenv('API_RATE_LIMIT_REDIS_URL', 'redis://redis:6379/2'),
+            socket_timeout=2,
+            socket_connect_timeout=2
+        )
+    return _redis_client
+
+
+class TokenBucketRateLimiter:
+    """Per-source token bucket shared by every Airflow worker through Redis
+
+    Each request reserves one token; it only waits when the bucket is empty.
+    If Redis is unreachable the limiter falls back to a per-process bucket.
+    """
+
+    _local_buckets: Dict[str, Tuple[float, float]] = {}
+    _local_lock = threading.Lock()
+
+    def __init__(self, source: str, requests_per_minute: float, burst: int = 1):
+        self.key = f"api_rate_limit:{source}"
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, burst)
+        client = _get_redis_client()
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT) if client else None
+
+    def acquire(self):
+        """Block until a token is available for this source"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _reserve(self) -> float:
+        if self._script is not None:
+            try:
+                return float(self._script(keys=[self.key], args=[self.capacity, self.rate]))
+            except redis.RedisError as e:
+                print(f"Redis rate limiter unavailable for {self.key}, using local bucket: {e}")
+                self._script = None
+        return self._reserve_local()
+
+    def _reserve_local(self) -> float:
+        now = time.monotonic()
+        with self._local_lock:
+            tokens, updated_at = self._local_buckets.get(self.key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.rate) - 1
+            self._local_buckets[self.key] = (tokens, now)
+        return max(0.0, -tokens / self.rate)
+
+
+# Status codes worth retrying; any other 4xx is a caller error and fails immediately
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Per-source circuit breaker shared by every Airflow worker through Redis
+
+    After failure_threshold consecutive requests exhaust their retries the
+    circuit opens and requests to the source fail fast for reset_timeout
+    seconds. Falls back to per-process state if Redis is unreachable.
+    """
+
+    _local_state: Dict[str, Dict[str, float]] = {}
+    _local_lock = threading.Lock()
+
+    def __init__(self, source: str, failure_threshold: int, reset_timeout: int):
+        self.source = source
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures_key = f"api_circuit:{source}:failures"
+        self.open_key = f"api_circuit:{source}:open"
+        self._redis = _get_redis_client()
+
+    def check(self):
+        """Raise CircuitOpenError while the circuit for this source is open"""
+        if self._call(self._redis_is_open, self._local_is_open):
+            raise CircuitOpenError(
+                f"Circuit open for {self.source}: {self.failure_threshold} consecutive failures, "
+                f"retrying after {self.reset_timeout}s"
+            )
+
+    def record_success(self):
+        self._call(self._redis_reset, self._local_reset)
+
+    def record_failure(self):
+        if self._call(self._redis_add_failure, self._local_add_failure):
+            print(f"Circuit breaker opened for {self.source} for {self.reset_timeout}s")
+
+    def _call(self, redis_op, local_op):
+        if self._redis is not None:
+            try:
+                return redis_op()
+            except redis.RedisError as e:
+                print(f"Redis circuit breaker unavailable for {self.source}, using local state: {e}")
+                self._redis = None
+        with self._local_lock:
+            return local_op(self._local_state.setdefault(self.source, {'failures': 0, 'open_until': 0}))
+
+    def _redis_is_open(self) -> bool:
+        return bool(self._redis.exists(self.open_key))
+
+    def _redis_reset(self):
+        self._redis.delete(self.failures_key)
+
+    def _redis_add_failure(self) -> bool:
+        failures = self._redis.incr(self.failures_key)
+        self._redis.expire(self.failures_key, self.reset_timeout)
+        if failures < self.failure_threshold:
+            return False
+        self._redis.set(self.open_key, 1, ex=self.reset_timeout)
+        self._redis.delete(self.failures_key)
+        return True
+
+    def _local_is_open(self, state) -> bool:
+        return time.monotonic() < state['open_until']
+
+    def _local_reset(self, state):
+        state['failures'] = 0
+
+    def _local_add_failure(self, state) -> bool:
+        state['failures'] += 1
+        if state['failures'] < self.failure_threshold:
+            return False
+        state['open_until'] = time.monotonic() + self.reset_timeout
+        state['failures'] = 0
+        return True
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def pack_codes(codes: List[str], separator: str, max_length: int) -> List[List[str]]:
+    """Split codes into as few groups as possible whose separator-joined length fits max_length
+
+    Used to put many countries or indicators in one URL path segment. A code
+    longer than max_length on its own still gets a group of its own.
+    """
+    groups, group, length = [], [], 0
+    for code in codes:
+        added = len(code) + (len(separator) if group else 0)
+        if group and length + added > max_length:
+            groups.append(group)
+            group, length = [], 0
+            added = len(code)
+        group.append(code)
+        length += added
+    if group:
+        groups.append(group)
+    return groups
 
 
 class BaseAPIClient:
     """Base class for API clients"""
-    
+
+    # Concurrent requests allowed per host in fetch_many; None uses API_MAX_CONCURRENCY
+    max_concurrency: Optional[int] = None
+    # Provider quota shared by all workers; None derives it from API_RATE_LIMIT_DELAY
+    requests_per_minute: Optional[float] = None
+    # Key for the shared rate-limit budget; defaults to the class name
+    source_name: Optional[str] = None
+    # Seconds a cached response is served without revalidation; None uses API_CACHE_TTL
+    cache_ttl: Optional[int] = None
+
     def __init__(self, base_url: str, api_key: Optional[str] = None):
         self.base_url = base_url
         self.api_key = api_key
         self.session = requests.Session()
+        # Compressed transfer; requests decodes the body transparently
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
         self.rate_limit_delay = float(os.getenv('API_RATE_LIMIT_DELAY', 1))
         self.max_retries = int(os.getenv('API_MAX_RETRIES', 3))
         self.timeout = int(os.getenv('API_TIMEOUT', 30))
-    
-    def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
-        """Make API request with retry logic"""
+        self.backoff_base = float(os.getenv('API_BACKOFF_BASE', 1))
+        self.backoff_max = float(os.getenv('API_BACKOFF_MAX', 60))
+        # Conservative limit for request URLs that pack many codes into one query
+        self.max_url_length = int(os.getenv('API_MAX_URL_LENGTH', 2000))
+        self.max_concurrency = self.max_concurrency or int(os.getenv('API_MAX_CONCURRENCY', 4))
+        self.source_name = self.source_name or type(self).__name__.lower()
+        self.rate_limiter = TokenBucketRateLimiter(
+            self.source_name,
+            self.requests_per_minute or 60.0 / max(self.rate_limit_delay, 0.001),
+            burst=self.max_concurrency
+        )
+        self.circuit_breaker = CircuitBreaker(
+            self.source_name,
+            failure_threshold=int(os.getenv('API_CIRCUIT_FAILURE_THRESHOLD', 5)),
+            reset_timeout=int(os.getenv('API_CIRCUIT_RESET_TIMEOUT', 300))
+        )
+
+        self.cache = get_http_cache()
+        self.cache_ttl = self.cache_ttl if self.cache_ttl is not None else int(os.getenv('API_CACHE_TTL', 0))
+        self._pending_loads: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+
+        # Keep enough pooled connections for every concurrent request
+        adapter = HTTPAdapter(pool_maxsize=self.max_concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _make_request(self, endpoint: str, params: Dict = None, if_changed: bool = False) -> Dict:
+        """Make API request with retry logic
+
+        Responses go through the on-disk HTTP cache. With if_changed=True,
+        NotModified is raised instead of returning data that was already
+        loaded downstream (see confirm_loaded).
+        """
+        return json.loads(self._request_body(endpoint, params, if_changed))
+
+    def _request_body(self, endpoint: str, params: Dict = None, if_changed: bool = False) -> bytes:
+        """Raw (decompressed) response body, for callers that parse it themselves"""
         url = f"{self.base_url}/{endpoint}"
-        
+        if self.cache is None:
+            return self._send(url, params).content
+        return self._cached_body(url, params, if_changed)
+
+    def _cached_body(self, url: str, params: Dict = None, if_changed: bool = False) -> bytes:
+        """Response body from the cache, revalidated with ETag/Last-Modified once its TTL expires"""
+        key = self.cache.make_key(url, params)
+        entry = self.cache.get(key)
+
+        if entry and time.time() - entry['stored_at'] < self.cache_ttl:
+            self.cache.record('hits')
+            body, digest = entry['body'], entry['digest']
+        else:
+            headers = {}
+            if entry and entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry and entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+            response = self._send(url, params, headers=headers)
+            if response.status_code == 304 and entry:
+                self.cache.touch(key)
+                self.cache.record('revalidated')
+                body, digest = entry['body'], entry['digest']
+            else:
+                self.cache.record('misses')
+                body = response.content
+                digest = self._content_digest(url, body)
+                self.cache.put(key, url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                               digest=digest)
+
+        if if_changed:
+            if entry and entry['loaded_digest'] == digest:
+                self.cache.record('not_modified')
+                raise NotModified(f"{url} unchanged since last load")
+            with self._pending_lock:
+                self._pending_loads[key] = digest
+        return body
+
+    def _content_digest(self, url: str, body: bytes) -> str:
+        """Digest of the data in a response body, compared by if_changed
+
+        Hashes the whole body; clients whose bodies also echo request-time
+        values (such as today's date) override it to hash only the data.
+        """
+        return self.cache.digest(body)
+
+    def _post_json(self, endpoint: str, payload: Dict) -> Dict:
+        """POST a JSON payload and decode the JSON response; POST responses are not cached"""
+        return self._send(f"{self.base_url}/{endpoint}", method='POST', json_body=payload).json()
+
+    def confirm_loaded(self):
+        """Mark every response fetched with if_changed=True as loaded downstream
+
+        Call this once the data is safely in the database; until then a
+        re-run fetches and loads the same response again.
+        """
+        with self._pending_lock:
+            pending, self._pending_loads = self._pending_loads, {}
+        if self.cache is not None and pending:
+            self.cache.mark_loaded(pending)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """HTTP cache hit/miss counters for this process"""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def _send(self, url: str, params: Dict = None, headers: Dict = None,
+              method: str = 'GET', json_body: Any = None, stream: bool = False) -> requests.Response:
+        """Request url with rate limiting, retries with backoff and the source circuit breaker
+
+        Connection errors, timeouts and RETRYABLE_STATUS_CODES are retried up to
+        max_retries times with exponential backoff and full jitter, honoring
+        Retry-After. Other 4xx responses raise immediately. The breaker is
+        checked before every attempt, so retries stop once another request
+        opens it. With stream=True the body is left unread for the caller to
+        consume (and close); failed responses are closed to free their connection.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.circuit_breaker.check()
+            self.rate_limiter.acquire()
+            retry_after = None
+            try:
+                response = self.session.request(
+                    method, url, params=params, json=json_body, headers=headers,
+                    timeout=self.timeout, stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            else:
+                if response.status_code < 400:
+                    self.circuit_breaker.record_success()
+                    return response
+                response.close()
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    # Bad request, auth or unknown series: retrying will not help
+                    response.raise_for_status()
+                retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+                error = requests.HTTPError(
+                    f"{response.status_code} {response.reason} for url: {response.url}",
+                    response=response
+                )
+
+            if attempt == self.max_retries:
+                break
+            delay = self._backoff_delay(attempt, retry_after)
+            if delay is None:
+                print(f"Retry-After of {retry_after:.0f}s for {url} exceeds API_BACKOFF_MAX, giving up")
+                break
+            print(f"Request to {url} failed ({error}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+        self.circuit_breaker.record_failure()
+        raise error
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Delay before the next attempt, or None if the server asks for longer than backoff_max"""
+        if retry_after is not None:
+            return retry_after if retry_after <= self.backoff_max else None
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def fetch_many(self, calls: List[Tuple[str, Optional[Dict]]], if_changed: bool = False,
+                   raw: bool = False, method: str = 'GET') -> List[Any]:
+        """Fetch several (endpoint, params) pairs concurrently
+
+        Results come back in input order, as decoded JSON or, with raw=True,
+        as response bodies. With method='POST' the second element of each
+        call is sent as the JSON body; POST responses are not cached, so
+        if_changed applies to GET requests only. A request that failed yields its
+        exception in place of the payload so one bad series does not sink the batch.
+        """
+        if not calls:
+            return []
+        return asyncio.run(self._fetch_many_async(calls, if_changed, raw, method))
+
+    async def _fetch_many_async(self, calls: List[Tuple[str, Optional[Dict]]],
+                                if_changed: bool = False, raw: bool = False,
+                                method: str = 'GET') -> List[Any]:
+        """Run _make_request (or _request_body, _post_json) for every call under a per-host semaphore"""
+        loop = asyncio.get_running_loop()
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        if method == 'POST':
+            request = self._post_json
+        else:
+            request = functools.partial(self._request_body if raw else self._make_request, if_changed=if_changed)
+
+        async def fetch(executor, endpoint, params):
+            host = urlparse(f"{self.base_url}/{endpoint}").netloc
+            semaphore = semaphores.setdefault(host, asyncio.Semaphore(self.max_concurrency))
+            async with semaphore:
+                return await loop.run_in_executor(executor, functools.partial(request, endpoint, params))
 
-        response = self.session.get(url, params=params, timeout=self.timeout)
-        response.raise_for_status()
-        time.sleep(self.rate_limit_delay)
-        return response.json()
+        with ThreadPoolExecutor(max_workers=min(len(calls), 32)) as executor:
+            return await asyncio.gather(
+                *(fetch(executor, endpoint, params) for endpoint, params in calls),
+                return_exceptions=True
+            )
@@ -2,18 +2,111 @@
 BLS (Bureau of Labor Statistics) API Client
 """
 
+import os
 import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Tuple
 from .base_client import BaseAPIClient
 
 
+# BLS period codes mapped to the month of the observation; M13 (annual
+# average) and other aggregates are dropped
+_QUARTER_MONTHS = {'Q01': 1, 'Q02': 4, 'Q03': 7, 'Q04': 10}
+
+
 class BLSClient(BaseAPIClient):
     """BLS API client for labor statistics"""
-    
+
+    # BLS v2 allows 50 requests per 10 seconds and 500 per day
+    source_name = 'bls'
+    requests_per_minute = 50
+
     def __init__(self):
+        api_key = os.getenv('BLS_API_KEY')
+
         super().__init__(
             base_url='https://api.bls.gov/publicAPI/v2',
-            api_key=None
+            api_key=api_key
+        )
+
+        # Registered keys get 50 series and 20 years per query, anonymous use 25 and 10
+        self.max_series_per_request = 50 if api_key else 25
+        self.max_years_per_request = 20 if api_key else 10
+        if not api_key:
+            print("BLS_API_KEY not set, using the lower anonymous BLS limits")
+
+    def _payloads(self, series_ids: List[str], start_year: int, end_year: int) -> List[Dict]:
+        """One request body per (series batch, year window)"""
+        payloads = []
+        for i in range(0, len(series_ids), self.max_series_per_request):
+            batch = series_ids[i:i + self.max_series_per_request]
+            for window_start in range(start_year, end_year + 1, self.max_years_per_request):
+                payload = {
+                    'seriesid': batch,
+                    'startyear': str(window_start),
+                    'endyear': str(min(window_start + self.max_years_per_request - 1, end_year)),
+                }
+                if self.api_key:
+                    payload['registrationkey'] = self.api_key
+                payloads.append(payload)
+        return payloads
+
+    @staticmethod
+    def _parse_results(data: Dict) -> List[Tuple[str, str, str, str]]:
+        """(series_id, year, period, value) tuples from a timeseries/data response"""
+        if data.get('status') != 'REQUEST_SUCCEEDED':
+            raise ValueError(f"BLS request failed: {data.get('status')} {data.get('message')}")
+
+        return [
+            (series['seriesID'], item['year'], item['period'], item['value'])
+            for series in data.get('Results', {}).get('series', [])
+            for item in series.get('data', [])
+        ]
+
+    def get_many_series(self, series_ids: List[str], start_year: int = None,
+                        end_year: int = None) -> pd.DataFrame:
+        """Get several BLS series as one long frame with series_id, date and value columns
+
+        Series are batched up to the per-request series limit and long ranges
+        split into year windows; all requests run concurrently. Raises if any
+        request fails, so a partial history is never returned.
+        """
+        end_year = end_year or datetime.now().year
+        start_year = start_year or end_year - self.max_years_per_request + 1
+        series_ids = list(dict.fromkeys(series_ids))
+
+        payloads = self._payloads(series_ids, start_year, end_year)
+        print(f"Requesting {len(series_ids)} BLS series for {start_year}-{end_year} in {len(payloads)} calls")
+
+        records = []
+        for response in self.fetch_many([('timeseries/data/', payload) for payload in payloads], method='POST'):
+            if isinstance(response, Exception):
+                raise response
+            records.extend(self._parse_results(response))
+
+        if not records:
+            print(f"No data found for BLS series {series_ids}")
+            return pd.DataFrame(columns=['series_id', 'date', 'value'])
+
+        df = pd.DataFrame.from_records(records, columns=['series_id', 'year', 'period', 'value'])
+
+        monthly = df['period'].str.match(r'M(0[1-9]|1[0-2])$')
+        quarterly = df['period'].isin(list(_QUARTER_MONTHS))
+        df = df[monthly | quarterly].copy()
+        month = df['period'].map(_QUARTER_MONTHS).fillna(
+            pd.to_numeric(df['period'].str[1:], errors='coerce')
+        ).astype(int)
+        df['date'] = pd.to_datetime(
+            {'year': df['year'].astype(int), 'month': month, 'day': 1}
         )
+        # '-' marks values BLS has not published
+        df['value'] = pd.to_numeric(df['value'], errors='coerce')
+        df = df.dropna(subset=['value'])
+
+        df = df[['series_id', 'date', 'value']].drop_duplicates(['series_id', 'date'], keep='last')
+        df = df.sort_values(['series_id', 'date'], ignore_index=True)
+        print(f"Retrieved {len(df)} records for {df['series_id'].nunique()} BLS series")
+        return df
 
 
 def get_bls_client() -> BLSClient:
@@ -3,18 +3,89 @@ ECB (European Central Bank) API Client
 """
 
 import pandas as pd
+import requests
+from typing import Iterator, List
 from .base_client import BaseAPIClient
+from .sdmx import iter_sdmx_csv
+
+
+# Wildcard SDMX queries making up the benchmark yield panel
+YIELD_QUERIES = [
+    # Long-term (10Y) government bond yields of every EU country, monthly
+    {'flow': 'IRS', 'key': 'M..L.L40.CI.0000..N.Z', 'dimensions': ['KEY', 'REF_AREA'], 'maturity': '10Y'},
+    # Euro area AAA government spot curve at several maturities, daily
+    {'flow': 'YC', 'key': 'B.U2.EUR.4F.G_N_A.SV_C_YM.SR_1Y+SR_2Y+SR_5Y+SR_10Y+SR_30Y',
+     'dimensions': ['KEY', 'DATA_TYPE_FM'], 'country': 'EA_AAA'},
+]
 
 
 class ECBClient(BaseAPIClient):
     """ECB API client for European economic data"""
-    
+
+    # ECB publishes no quota; stay polite
+    source_name = 'ecb'
+    requests_per_minute = 60
+
     def __init__(self):
         super().__init__(
-            base_url='https://sdw-wsrest.ecb.europa.eu/service',
+            base_url='https://data-api.ecb.europa.eu/service',
             api_key=None
         )
 
+    def iter_data(self, flow: str, key: str, dimensions: List[str], start_period: str = None,
+                  end_period: str = None, chunk_rows: int = 50000) -> Iterator[pd.DataFrame]:
+        """Stream an SDMX-CSV data query as typed frames of at most chunk_rows rows
+
+        The response is parsed while it downloads, so a wildcard query over a
+        whole panel never has to fit in memory. Yields nothing when the query
+        matches no data.
+        """
+        params = {'format': 'csvdata', 'detail': 'dataonly'}
+        if start_period:
+            params['startPeriod'] = start_period
+        if end_period:
+            params['endPeriod'] = end_period
+
+        try:
+            response = self._send(
+                f"{self.base_url}/data/{flow}/{key}", params,
+                headers={'Accept': 'text/csv'}, stream=True
+            )
+        except requests.HTTPError as e:
+            # The ECB answers 404 when a query matches no observations
+            if e.response is not None and e.response.status_code == 404:
+                print(f"No ECB data for {flow}/{key}")
+                return
+            raise
+
+        try:
+            response.raw.decode_content = True
+            yield from iter_sdmx_csv(response.raw, dimensions, chunk_rows)
+        except pd.errors.EmptyDataError:
+            print(f"No ECB data for {flow}/{key}")
+        finally:
+            response.close()
+
+    def iter_benchmark_yields(self, start_date: str = None, end_date: str = None) -> Iterator[pd.DataFrame]:
+        """Stream government bond yields shaped for europe.benchmark_yields_ecb"""
+        for query in YIELD_QUERIES:
+            rows = 0
+            for chunk in self.iter_data(query['flow'], query['key'], query['dimensions'], start_date, end_date):
+                country = chunk['REF_AREA'] if 'REF_AREA' in chunk else query['country']
+                if 'DATA_TYPE_FM' in chunk:
+                    maturity = chunk['DATA_TYPE_FM'].str.replace('SR_', '', regex=False)
+                else:
+                    maturity = query['maturity']
+                rows += len(chunk)
+                yield pd.DataFrame({
+                    'date': chunk['date'],
+                    'country': country,
+                    'maturity': maturity,
+                    'yield': chunk['value'],
+                    'series_id': chunk['KEY'],
+                })
+            print(f"Retrieved {rows} ECB yield records from {query['flow']}")
+
 
 def get_ecb_client() -> ECBClient:
     return ECBClient()
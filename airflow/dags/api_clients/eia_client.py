@@ -2,18 +2,99 @@
 EIA (Energy Information Administration) API Client
 """
 
+import os
 import pandas as pd
+from typing import Dict, Iterator, List, Optional
 from .base_client import BaseAPIClient
 
 
 class EIAClient(BaseAPIClient):
     """EIA API client for energy data"""
     
+    # EIA throttles keys at roughly 5,000 requests per hour
+    source_name = 'eia'
+    requests_per_minute = 80
+    # Largest page the v2 API returns for JSON
+    page_size = 5000
+    
     def __init__(self):
+        api_key = os.getenv('EIA_API_KEY')
+        if not api_key:
+            raise ValueError("EIA_API_KEY environment variable is required")
+        
         super().__init__(
             base_url='https://api.eia.gov/v2',
-            api_key=None
+            api_key=api_key
         )
+    
+    def _data_params(self, series_ids: List[str], frequency: str, start: Optional[str],
+                     end: Optional[str]) -> Dict:
+        """Query parameters of a v2 data request for some series, in a stable page order"""
+        params = {
+            'api_key': self.api_key,
+            'frequency': frequency,
+            'data[0]': 'value',
+            'facets[series][]': list(series_ids),
+            # A total order keeps offset pages disjoint while they are fetched concurrently
+            'sort[0][column]': 'period',
+            'sort[0][direction]': 'asc',
+            'sort[1][column]': 'series',
+            'sort[1][direction]': 'asc',
+        }
+        if start:
+            params['start'] = self._period(start, frequency)
+        if end:
+            params['end'] = self._period(end, frequency)
+        return params
+
+    @staticmethod
+    def _period(date: str, frequency: str) -> str:
+        """A YYYY-MM-DD date in the period format of a frequency"""
+        if frequency == 'annual':
+            return date[:4]
+        if frequency == 'monthly':
+            return date[:7]
+        return date[:10]
+
+    @staticmethod
+    def _records_frame(records: List[Dict]) -> pd.DataFrame:
+        """series_id, date, value and unit columns from a page of data records"""
+        df = pd.DataFrame(records, columns=['series', 'period', 'value', 'units'])
+        df = df.rename(columns={'series': 'series_id', 'period': 'date', 'units': 'unit'})
+        df['date'] = pd.to_datetime(df['date'])
+        df['value'] = pd.to_numeric(df['value'], errors='coerce')
+        return df.dropna(subset=['value'])
+
+    def iter_data(self, route: str, series_ids: List[str], frequency: str, start: Optional[str] = None,
+                  end: Optional[str] = None, page_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Stream the observations of some series of a v2 data route, one frame per page
+
+        The first page also returns the total row count; the remaining
+        offset/length pages are then fetched concurrently under the rate
+        limiter, a window of pages at a time so memory stays bounded, and
+        yielded in order. start/end (YYYY-MM-DD) filter on the period.
+        """
+        page_size = page_size or self.page_size
+        endpoint = f"{route}/data/"
+        params = self._data_params(series_ids, frequency, start, end)
+
+        first = self._make_request(endpoint, {**params, 'offset': 0, 'length': page_size}).get('response', {})
+        total = int(first.get('total') or 0)
+        offsets = list(range(page_size, total, page_size))
+        print(f"Retrieving {total} EIA records from {route} in {len(offsets) + 1} pages")
+        if first.get('data'):
+            yield self._records_frame(first['data'])
+
+        window = self.max_concurrency * 2
+        for i in range(0, len(offsets), window):
+            calls = [(endpoint, {**params, 'offset': offset, 'length': page_size})
+                     for offset in offsets[i:i + window]]
+            for response in self.fetch_many(calls):
+                if isinstance(response, Exception):
+                    raise response
+                records = response.get('response', {}).get('data')
+                if records:
+                    yield self._records_frame(records)
 
 
 def get_eia_client() -> EIAClient:
@@ -2,16 +2,152 @@
 FRED (Federal Reserve Economic Data) API Client
 """
 
+import io
 import os
+import re
+import json
+import hashlib
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Iterator, List, Tuple
 from .base_client import BaseAPIClient
+from .http_cache import NotModified
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# FRED's marker for a missing observation
+MISSING_VALUE = '.'
+
+# Real-time period bounds covering every ALFRED vintage
+ALFRED_REALTIME_START = '1776-07-04'
+ALFRED_REALTIME_END = '9999-12-31'
+
+# Smallest possible encoding of one observation: {"date":"YYYY-MM-DD","value":"."}
+_MIN_OBSERVATION_BYTES = 32
+
+_COUNT_PATTERN = re.compile(rb'"count"\s*:\s*(\d+)')
+
+
+def _capacity(body: bytes) -> int:
+    """Array size that fits every observation in body
+
+    FRED sends the total count ahead of the observations; without it the
+    body size bounds the number of observations.
+    """
+    match = _COUNT_PATTERN.search(body, 0, 1024)
+    bound = len(body) // _MIN_OBSERVATION_BYTES
+    return min(int(match.group(1)), bound) if match else bound
+
+
+def _decode_streaming(body: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Incrementally decode observations into preallocated arrays with ijson"""
+    size = _capacity(body)
+    dates = np.empty(size, dtype='S10')
+    values = np.empty(size, dtype=np.float64)
+    n_dates = n_values = 0
+    for key, item in ijson.kvitems(io.BytesIO(body), 'observations.item'):
+        if key == 'date':
+            dates[n_dates] = item
+            n_dates += 1
+        elif key == 'value':
+            values[n_values] = np.nan if item == MISSING_VALUE else float(item)
+            n_values += 1
+    if n_dates != n_values:
+        raise ValueError("FRED observations without a date or value")
+    return dates, values, n_dates
+
+
+def _decode_json(body: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Decode observations with the json module into preallocated arrays"""
+    observations = json.loads(body).get('observations') or []
+    n = len(observations)
+    dates = np.empty(n, dtype='S10')
+    values = np.empty(n, dtype=np.float64)
+    for i, observation in enumerate(observations):
+        dates[i] = observation['date']
+        value = observation['value']
+        values[i] = np.nan if value == MISSING_VALUE else float(value)
+    return dates, values, n
+
+
+def _decode_observations(body: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
+    return (_decode_streaming if ijson is not None else _decode_json)(body)
+
+
+def _observations_frame(dates: np.ndarray, values: np.ndarray, n: int) -> pd.DataFrame:
+    dates, values = dates[:n], values[:n]
+    present = ~np.isnan(values)
+    return pd.DataFrame({
+        'date': dates[present].astype('datetime64[D]').astype('datetime64[ns]'),
+        'value': values[present],
+    })
+
+
+def parse_observations(body: bytes) -> pd.DataFrame:
+    """Parse a series/observations body into a compact date/value DataFrame
+
+    Observations are decoded in one pass into a fixed-width date array and a
+    float64 array (streamed with ijson when it is installed) instead of a
+    list of dicts and an object-dtype frame. Missing values are dropped.
+    """
+    return _observations_frame(*_decode_observations(body))
+
+
+def parse_vintages(body: bytes) -> Tuple[pd.DataFrame, int]:
+    """Parse an ALFRED series/observations body into date/realtime_start/value rows
+
+    Each row is the value an observation date had from realtime_start until
+    the next row of that date. FRED's missing marker becomes NaN (no value
+    was published in that vintage). Returns the frame and the number of
+    observations in the body.
+    """
+    if ijson is not None:
+        observations = ijson.items(io.BytesIO(body), 'observations.item')
+    else:
+        observations = json.loads(body).get('observations') or []
+
+    dates, starts, values = [], [], []
+    for observation in observations:
+        dates.append(observation['date'])
+        starts.append(observation['realtime_start'])
+        value = observation['value']
+        values.append(np.nan if value == MISSING_VALUE else float(value))
+
+    frame = pd.DataFrame({
+        'date': np.array(dates, dtype='S10').astype('datetime64[D]').astype('datetime64[ns]'),
+        'realtime_start': np.array(starts, dtype='S10').astype('datetime64[D]').astype('datetime64[ns]'),
+        'value': np.array(values, dtype=np.float64),
+    })
+    return frame, len(dates)
+
+
+class SeriesFetchError(Exception):
+    """Raised by get_many_series when some series failed; carries the ones that were fetched
+
+    errors maps each failed series_id to its exception; results holds the
+    DataFrames of every other series, as get_many_series would have returned them.
+    """
+
+    def __init__(self, errors: Dict[str, Exception], results: Dict[str, pd.DataFrame]):
+        super().__init__(
+            f"Failed to fetch FRED series: {', '.join(f'{series_id} ({error})' for series_id, error in errors.items())}"
+        )
+        self.errors = errors
+        self.results = results
 
 
 class FREDClient(BaseAPIClient):
     """FRED API client for economic data"""
     
+    # FRED allows 120 requests per minute per API key
+    source_name = 'fred'
+    requests_per_minute = 120
+    max_concurrency = 8
+    
     def __init__(self):
         api_key = os.getenv('FRED_API_KEY')
         if not api_key:
@@ -22,42 +158,136 @@ class FREDClient(BaseAPIClient):
             api_key=api_key
         )
     
-    def get_series(self, series_id: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
-        """Get economic series data from FRED"""
-        try:
-            params = {
-                'series_id': series_id,
-                'api_key': self.api_key,
-                'file_type': 'json'
-            }
-            
-            if start_date:
-                params['observation_start'] = start_date
-            if end_date:
-                params['observation_end'] = end_date
-            
-            data = self._make_request('series/observations', params)
-            
-            if 'observations' in data:
-                df = pd.DataFrame(data['observations'])
-                if not df.empty:
-                    # Convert date and value columns
-                    df['date'] = pd.to_datetime(df['date'])
-                    df['value'] = pd.to_numeric(df['value'], errors='coerce')
-                    # Remove rows with missing values
-                    df = df.dropna(subset=['value'])
-                    df = df[['date', 'value']]
-                    
-                    print(f"Retrieved {len(df)} records for series {series_id}")
-                    return df
-            
+    def _observation_params(self, series_id: str, start_date: str = None, end_date: str = None) -> Dict:
+        """Build the query parameters for a series/observations request"""
+        params = {
+            'series_id': series_id,
+            'api_key': self.api_key,
+            'file_type': 'json'
+        }
+        
+        if start_date:
+            params['observation_start'] = start_date
+        if end_date:
+            params['observation_end'] = end_date
+        
+        return params
+    
+    def _content_digest(self, url: str, body: bytes) -> str:
+        """Digest of the observation dates and values only
+
+        series/observations bodies also carry the request's realtime_start and
+        realtime_end (today by default), which change daily with the data unchanged.
+        """
+        if not url.endswith('/series/observations'):
+            return super()._content_digest(url, body)
+        dates, values, n = _decode_observations(body)
+        return hashlib.sha256(dates[:n].tobytes() + values[:n].tobytes()).hexdigest()
+    
+    def _parse_observations(self, series_id: str, body: bytes) -> pd.DataFrame:
+        """Convert a series/observations body into a date/value DataFrame"""
+        df = parse_observations(body)
+        if df.empty:
             print(f"No data found for series {series_id}")
             return pd.DataFrame()
-            
-        except Exception as e:
-            print(f"Error retrieving FRED series {series_id}: {e}")
+        
+        print(f"Retrieved {len(df)} records for series {series_id}")
+        return df
+    
+    def get_series(self, series_id: str, start_date: str = None, end_date: str = None,
+                   if_changed: bool = False) -> pd.DataFrame:
+        """Get economic series data from FRED
+        
+        With if_changed=True an empty DataFrame is returned, without parsing,
+        when the response is unchanged since the last confirm_loaded().
+        Request errors (including CircuitOpenError) propagate.
+        """
+        params = self._observation_params(series_id, start_date, end_date)
+        try:
+            body = self._request_body('series/observations', params, if_changed=if_changed)
+        except NotModified:
+            print(f"Series {series_id} unchanged since last load, skipping")
             return pd.DataFrame()
+        return self._parse_observations(series_id, body)
+    
+    def get_many_series(self, series_ids: List[str], start_dates: Dict[str, str] = None,
+                        end_date: str = None, if_changed: bool = False) -> Dict[str, pd.DataFrame]:
+        """Get several FRED series concurrently, keyed by series_id
+        
+        start_dates maps series_id to its observation_start; series without an
+        entry are fetched from the beginning. Unchanged series (if_changed=True)
+        map to an empty DataFrame. If any series fails, SeriesFetchError is
+        raised once the whole batch has been fetched, carrying the other results.
+        """
+        start_dates = start_dates or {}
+        calls = [
+            ('series/observations', self._observation_params(series_id, start_dates.get(series_id), end_date))
+            for series_id in series_ids
+        ]
+        
+        results = {}
+        errors = {}
+        for series_id, data in zip(series_ids, self.fetch_many(calls, if_changed=if_changed, raw=True)):
+            if isinstance(data, NotModified):
+                print(f"Series {series_id} unchanged since last load, skipping")
+                results[series_id] = pd.DataFrame()
+            elif isinstance(data, Exception):
+                print(f"Error retrieving FRED series {series_id}: {data}")
+                errors[series_id] = data
+            else:
+                results[series_id] = self._parse_observations(series_id, data)
+        
+        if errors:
+            raise SeriesFetchError(errors, results)
+        return results
+    
+    def iter_series_pages(self, series_id: str, start_date: str = None, end_date: str = None,
+                          page_size: int = None) -> Iterator[pd.DataFrame]:
+        """Yield a series as date/value DataFrames of at most page_size observations
+        
+        Pages are requested with FRED's limit/offset one at a time as the
+        caller consumes them, so only one page is held in memory.
+        """
+        page_size = page_size or int(os.getenv('FRED_PAGE_SIZE', 10000))
+        offset = 0
+        while True:
+            params = self._observation_params(series_id, start_date, end_date)
+            params.update({'limit': page_size, 'offset': offset})
+            dates, values, n = _decode_observations(self._request_body('series/observations', params))
+            
+            page = _observations_frame(dates, values, n)
+            if not page.empty:
+                yield page
+            if n < page_size:
+                return
+            offset += n
     
+    def iter_vintage_pages(self, series_id: str, realtime_start: str = None, start_date: str = None,
+                           end_date: str = None, page_size: int = None) -> Iterator[pd.DataFrame]:
+        """Yield every vintage of a series from ALFRED as date/realtime_start/value DataFrames
+
+        Observations are requested by real-time period from realtime_start
+        (default: the first ALFRED vintage) on, so each row is a value that
+        changed in that vintage rather than a full copy of every release.
+        Pages follow iter_series_pages.
+        """
+        page_size = page_size or int(os.getenv('FRED_PAGE_SIZE', 10000))
+        offset = 0
+        while True:
+            params = self._observation_params(series_id, start_date, end_date)
+            params.update({
+                'realtime_start': realtime_start or ALFRED_REALTIME_START,
+                'realtime_end': ALFRED_REALTIME_END,
+                'limit': page_size,
+                'offset': offset,
+            })
+            page, n = parse_vintages(self._request_body('series/observations', params))
+            if not page.empty:
+                yield page
+            if n < page_size:
+                return
+            offset += n
+
     def get_series_info(self, series_id: str) -> dict:
         """Get series information from FRED"""
         try:
@@ -77,6 +307,26 @@ class FREDClient(BaseAPIClient):
         except Exception as e:
             print(f"Error retrieving FRED series info for {series_id}: {e}")
             return {}
+    
+    def get_many_series_info(self, series_ids: List[str]) -> Dict[str, dict]:
+        """Get series information for several FRED series concurrently
+        
+        Series whose metadata could not be retrieved map to an empty dict.
+        """
+        calls = [
+            ('series', {'series_id': series_id, 'api_key': self.api_key, 'file_type': 'json'})
+            for series_id in series_ids
+        ]
+        
+        results = {}
+        for series_id, data in zip(series_ids, self.fetch_many(calls)):
+            if isinstance(data, Exception):
+                print(f"Error retrieving FRED series info for {series_id}: {data}")
+                results[series_id] = {}
+            else:
+                results[series_id] = data['seriess'][0] if data.get('seriess') else {}
+        
+        return results
 
 
 def get_fred_client() -> FREDClient:
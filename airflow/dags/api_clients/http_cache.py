@@ -0,0 +1,179 @@
+"""
+Persistent HTTP response cache for API clients
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Optional
+
+
+# Query parameters carrying credentials; they never become part of a cache key
+SECRET_PARAMS = {'api_key', 'apikey', 'registrationkey', 'token'}
+
+
+class NotModified(Exception):
+    """Raised when a conditional request finds data unchanged since it was last loaded"""
+
+
+class HTTPCache:
+    """On-disk response cache keyed by URL and params, with LRU eviction
+
+    Bodies are stored with their ETag / Last-Modified validators and a digest.
+    The digest lets callers tell "unchanged since the last successful load"
+    even for providers that send no validators. Entries are evicted least
+    recently used first once the cache grows beyond max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    loaded_digest TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Cache key for a request, ignoring credential parameters"""
+        clean = sorted(
+            (name, str(value)) for name, value in (params or {}).items()
+            if name.lower() not in SECRET_PARAMS
+        )
+        return hashlib.sha256(json.dumps([url, clean]).encode()).hexdigest()
+
+    @staticmethod
+    def digest(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry for key and mark it recently used"""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT body, digest, loaded_digest, etag, last_modified, stored_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+
+        body, digest, loaded_digest, etag, last_modified, stored_at = row
+        return {
+            'body': body,
+            'digest': digest,
+            'loaded_digest': loaded_digest,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': stored_at,
+        }
+
+    def put(self, key: str, url: str, body: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, digest: Optional[str] = None):
+        """Store a fresh response body, keeping the digest of the last loaded version
+
+        digest identifies the data in the body and defaults to a hash of the
+        whole body.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO entries (key, url, body, size, digest, etag, last_modified, stored_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    body = excluded.body, size = excluded.size, digest = excluded.digest,
+                    etag = excluded.etag, last_modified = excluded.last_modified,
+                    stored_at = excluded.stored_at, accessed_at = excluded.accessed_at
+                """,
+                (key, url, body, len(body), digest or self.digest(body), etag, last_modified, now, now)
+            )
+            self._evict(conn)
+
+    def touch(self, key: str):
+        """Restart the TTL of an entry the upstream confirmed as not modified"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+
+    def mark_loaded(self, digests: Dict[str, str]):
+        """Record the body digests whose data has been loaded downstream"""
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "UPDATE entries SET loaded_digest = ? WHERE key = ?",
+                [(digest, key) for key, digest in digests.items()]
+            )
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidated': self.revalidated,
+                'not_modified': self.not_modified,
+            }
+
+    def record(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+
+_caches: Dict[str, HTTPCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Process-wide cache configured from the environment, or None when disabled"""
+    if os.getenv('API_CACHE_ENABLED', 'true').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    cache_dir = os.getenv(
+        'API_CACHE_DIR',
+        os.path.join(os.getenv('AIRFLOW_HOME', tempfile.gettempdir()), 'cache', 'http')
+    )
+    path = os.path.join(cache_dir, 'responses.sqlite3')
+    with _caches_lock:
+        if path not in _caches:
+            max_bytes = int(os.getenv('API_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+            _caches[path] = HTTPCache(path, max_bytes)
+        return _caches[path]
@@ -3,18 +3,80 @@ IMF API Client
 """
 
 import pandas as pd
-from .base_client import BaseAPIClient
+from typing import Dict, List, Optional
+from .base_client import BaseAPIClient, pack_codes
+from .sdmx import parse_time_period
+
+
+# Name of the indicator dimension in datasets that do not call it INDICATOR
+INDICATOR_DIMENSIONS = {'PCPS': 'COMMODITY'}
 
 
 class IMFClient(BaseAPIClient):
     """IMF API client for economic data"""
     
+    # IMF throttles bursts of more than 10 requests per 5 seconds
+    source_name = 'imf'
+    requests_per_minute = 50
+    # Revalidate monthly commodity prices at most twice a day
+    cache_ttl = 43200
+    
     def __init__(self):
         super().__init__(
             base_url='https://dataservices.imf.org/REST/SDMX_JSON.svc',
             api_key=None
         )
 
+    @staticmethod
+    def _as_list(value) -> List:
+        # SDMX-JSON collapses one-element lists into a bare object
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+    def get_compact_data(self, dataset: str, frequency: str, areas: List[str], indicators: List[str],
+                         suffix: Optional[str] = None, start_period: Optional[str] = None,
+                         end_period: Optional[str] = None) -> pd.DataFrame:
+        """Get several areas and indicators of a dataset as one long frame
+
+        The series key is frequency.areas.indicators[.suffix], with areas and
+        indicators '+'-separated and packed into as few requests as
+        API_MAX_URL_LENGTH allows; the requests run concurrently. Returns
+        area, indicator, unit, date and value columns.
+        """
+        params = {}
+        if start_period:
+            params['startPeriod'] = start_period
+        if end_period:
+            params['endPeriod'] = end_period
+
+        budget = self.max_url_length - len(self.base_url) - len(dataset) - 100
+        calls = []
+        for area_group in pack_codes(areas, '+', budget // 4):
+            for indicator_group in pack_codes(indicators, '+', budget - budget // 4):
+                key = [frequency, '+'.join(area_group), '+'.join(indicator_group)] + ([suffix] if suffix else [])
+                calls.append((f"CompactData/{dataset}/{'.'.join(key)}", params))
+
+        indicator_attribute = f"@{INDICATOR_DIMENSIONS.get(dataset, 'INDICATOR')}"
+        rows: Dict[str, List] = {'area': [], 'indicator': [], 'unit': [], 'date': [], 'value': []}
+        for data in self.fetch_many(calls):
+            if isinstance(data, Exception):
+                raise data
+            dataset_node = data.get('CompactData', {}).get('DataSet', {})
+            for series in self._as_list(dataset_node.get('Series')):
+                observations = self._as_list(series.get('Obs'))
+                rows['area'].extend([series.get('@REF_AREA')] * len(observations))
+                rows['indicator'].extend([series.get(indicator_attribute)] * len(observations))
+                rows['unit'].extend([series.get('@UNIT_MEASURE')] * len(observations))
+                rows['date'].extend(obs.get('@TIME_PERIOD') for obs in observations)
+                rows['value'].extend(obs.get('@OBS_VALUE') for obs in observations)
+        print(f"Retrieved {len(rows['value'])} IMF {dataset} observations in {len(calls)} requests")
+
+        df = pd.DataFrame(rows)
+        df['date'] = parse_time_period(df['date'])
+        df['value'] = pd.to_numeric(df['value'], errors='coerce')
+        return df.dropna(subset=['date', 'value']).reset_index(drop=True)
+
 
 def get_imf_client() -> IMFClient:
     return IMFClient()
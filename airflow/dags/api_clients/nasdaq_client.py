@@ -2,18 +2,87 @@
 NASDAQ API Client
 """
 
+import os
+import time
+import zipfile
+import tempfile
 import pandas as pd
+from typing import Callable, Dict, Iterator, Optional
 from .base_client import BaseAPIClient
 
 
 class NASDAQClient(BaseAPIClient):
     """NASDAQ API client for financial data"""
-    
+
+    # NASDAQ Data Link allows 2,000 requests per 10 minutes
+    source_name = 'nasdaq'
+    requests_per_minute = 200
+
     def __init__(self):
+        api_key = os.getenv('NASDAQ_API_KEY')
+        if not api_key:
+            raise ValueError("NASDAQ_API_KEY environment variable is required")
+
         super().__init__(
             base_url='https://data.nasdaq.com/api/v3',
-            api_key=None
+            api_key=api_key
         )
+        self.export_poll_interval = int(os.getenv('NASDAQ_EXPORT_POLL_INTERVAL', 15))
+        self.export_timeout = int(os.getenv('NASDAQ_EXPORT_TIMEOUT', 900))
+
+    def get_bulk_export(self, table: str) -> Dict:
+        """File info of a zipped CSV export of a whole datatable
+
+        Nasdaq generates the export on request; the status is polled until
+        the file is fresh. Returns the 'file' object with 'link' and
+        'data_snapshot_time'. Status requests bypass the HTTP cache.
+        """
+        url = f"{self.base_url}/datatables/{table}.json"
+        params = {'qopts.export': 'true', 'api_key': self.api_key}
+        deadline = time.time() + self.export_timeout
+        while True:
+            file = self._send(url, params).json()['datatable_bulk_download']['file']
+            if file.get('status') == 'fresh' and file.get('link'):
+                return file
+            if time.time() >= deadline:
+                raise TimeoutError(f"Export of {table} not ready after {self.export_timeout}s")
+            print(f"Export of {table} is {file.get('status')}, checking again in {self.export_poll_interval}s")
+            time.sleep(self.export_poll_interval)
+
+    def get_delta_files(self, table: str) -> Dict:
+        """Delta file listing of a datatable
+
+        Returns the 'data' object: 'files' holds one entry per interval with
+        'from'/'to' timestamps and 'insertions', 'updates' and 'deletions'
+        links; 'latest_full_data' points at the matching full export.
+        """
+        url = f"{self.base_url}/datatables/{table}/delta.json"
+        return self._send(url, {'api_key': self.api_key}).json()['data']
+
+    def iter_export_csv(self, link: str, usecols: Callable[[str], bool], dtype: Optional[Dict] = None,
+                        chunk_rows: int = 100000) -> Iterator[pd.DataFrame]:
+        """Download a zipped CSV export and parse its CSV members chunk by chunk
+
+        A zip's directory sits at the end of the archive, so the download is
+        streamed to a temporary file first; members are then decompressed
+        while they are parsed and only the columns accepted by usecols are
+        read, so neither the archive nor the table is held in memory.
+        """
+        response = self._send(link, stream=True)
+        with tempfile.TemporaryFile() as archive:
+            try:
+                for block in response.iter_content(chunk_size=1 << 20):
+                    archive.write(block)
+            finally:
+                response.close()
+            archive.seek(0)
+
+            with zipfile.ZipFile(archive) as zf:
+                for name in zf.namelist():
+                    if not name.lower().endswith('.csv'):
+                        continue
+                    with zf.open(name) as member:
+                        yield from pd.read_csv(member, usecols=usecols, dtype=dtype, chunksize=chunk_rows)
 
 
 def get_nasdaq_client() -> NASDAQClient:
@@ -3,18 +3,94 @@ OECD API Client
 """
 
 import pandas as pd
+import requests
+from typing import Iterator, List, Optional, Tuple
 from .base_client import BaseAPIClient
+from .sdmx import iter_sdmx_csv
+
+
+# Dataflows and series keys ({areas} is replaced by '+'-joined ISO3 codes)
+SHORT_TERM_RATES = ('OECD.SDD.STES,DSD_STES@DF_FINMARK,4.0', '{areas}.M.IR3TIB.PA.....')
+CPI_INFLATION = ('OECD.SDD.TPS,DSD_PRICES@DF_PRICES_ALL,1.0', '{areas}.M.N.CPI.PA._T.N.GY')
 
 
 class OECDClient(BaseAPIClient):
     """OECD API client for economic data"""
-    
+
+    # OECD limits anonymous access to 20 data queries per minute
+    source_name = 'oecd'
+    requests_per_minute = 20
+    # Revalidate monthly indicators at most twice a day
+    cache_ttl = 43200
+
     def __init__(self):
         super().__init__(
             base_url='https://sdmx.oecd.org/public/rest/data',
             api_key=None
         )
 
+    def iter_data(self, dataflow: str, key: str, dimensions: List[str], start_period: Optional[str] = None,
+                  end_period: Optional[str] = None, chunk_rows: int = 50000) -> Iterator[pd.DataFrame]:
+        """Stream an SDMX-CSV data query as typed frames of at most chunk_rows rows
+
+        One query covers every area and measure in key ('+' lists and empty
+        wildcard positions); only the dimensions asked for are parsed.
+        Yields nothing when the query matches no data.
+        """
+        params = {'format': 'csvfile', 'dimensionAtObservation': 'AllDimensions'}
+        if start_period:
+            params['startPeriod'] = start_period
+        if end_period:
+            params['endPeriod'] = end_period
+
+        try:
+            response = self._send(f"{self.base_url}/{dataflow}/{key}", params, stream=True)
+        except requests.HTTPError as e:
+            # The OECD answers 404 "NoRecordsFound" when a query matches nothing
+            if e.response is not None and e.response.status_code == 404:
+                print(f"No OECD data for {dataflow}/{key}")
+                return
+            raise
+
+        try:
+            response.raw.decode_content = True
+            yield from iter_sdmx_csv(response.raw, dimensions, chunk_rows)
+        except pd.errors.EmptyDataError:
+            print(f"No OECD data for {dataflow}/{key}")
+        finally:
+            response.close()
+
+    def get_panel(self, query: Tuple[str, str], areas: List[str], start_period: Optional[str] = None) -> pd.DataFrame:
+        """One measure for many areas as a long REF_AREA/date/value frame, from a single request"""
+        dataflow, key = query
+        chunks = list(self.iter_data(dataflow, key.format(areas='+'.join(areas)), ['REF_AREA'], start_period))
+        if not chunks:
+            return pd.DataFrame({
+                'REF_AREA': pd.Series(dtype=str),
+                'date': pd.Series(dtype='datetime64[ns]'),
+                'value': pd.Series(dtype='float64'),
+            })
+        df = pd.concat(chunks, ignore_index=True).drop_duplicates(['REF_AREA', 'date'], keep='last')
+        print(f"Retrieved {len(df)} OECD records for {df['REF_AREA'].nunique()} areas from {dataflow}")
+        return df
+
+    def get_real_rates(self, areas: List[str], start_period: Optional[str] = None) -> pd.DataFrame:
+        """Real short-term rates for many areas: 3-month rate minus CPI inflation (YoY)
+
+        Both panels are aligned on (area, date) and the real rate computed
+        on whole columns. Returns REF_AREA, date, nominal_rate,
+        inflation_rate and real_rate columns for the months both exist.
+        """
+        nominal = self.get_panel(SHORT_TERM_RATES, areas, start_period)
+        inflation = self.get_panel(CPI_INFLATION, areas, start_period)
+
+        df = nominal.rename(columns={'value': 'nominal_rate'}).merge(
+            inflation.rename(columns={'value': 'inflation_rate'}),
+            on=['REF_AREA', 'date'], how='inner'
+        )
+        df['real_rate'] = df['nominal_rate'] - df['inflation_rate']
+        return df.sort_values(['REF_AREA', 'date'], ignore_index=True)
+
 
 def get_oecd_client() -> OECDClient:
     return OECDClient()
@@ -0,0 +1,95 @@
+"""
+Per-ticker Parquet cache of price history
+"""
+
+import os
+import json
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Schema metadata key holding the date range a file covers
+_COVERAGE_KEY = b'price_cache_coverage'
+
+
+class PriceHistoryCache:
+    """One Parquet file per ticker and interval, with the date range it covers
+
+    Coverage is recorded separately from the data so that a range Yahoo has
+    no bars for (e.g. before a listing date) is not requested again.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ticker: str, interval: str) -> str:
+        safe = ticker.replace('/', '_').replace('^', '_')
+        return os.path.join(self.directory, f"{safe}_{interval}.parquet")
+
+    def read(self, ticker: str, interval: str) -> Tuple[pd.DataFrame, Optional[Dict[str, str]]]:
+        """Cached bars indexed by date and the {'start', 'end'} range they cover"""
+        path = self._path(ticker, interval)
+        if not os.path.exists(path):
+            return pd.DataFrame(), None
+
+        table = pq.read_table(path)
+        metadata = table.schema.metadata or {}
+        coverage = json.loads(metadata[_COVERAGE_KEY]) if _COVERAGE_KEY in metadata else None
+        return table.to_pandas(), coverage
+
+    def write(self, ticker: str, interval: str, df: pd.DataFrame, coverage: Dict[str, str]):
+        """Replace the cached bars for ticker, atomically"""
+        table = pa.Table.from_pandas(df)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _COVERAGE_KEY: json.dumps(coverage).encode(),
+        })
+
+        path = self._path(ticker, interval)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with self._lock:
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, path)
+
+    def missing_ranges(self, coverage: Optional[Dict[str, str]], df: pd.DataFrame,
+                       start: str, end: str) -> List[Tuple[str, str]]:
+        """Date ranges within [start, end) that have to be downloaded
+
+        The tail range starts at the last cached bar so a bar that was still
+        forming when it was cached (current month or day) is refreshed.
+        """
+        if coverage is None:
+            return [(start, end)]
+
+        ranges = []
+        if start < coverage['start']:
+            ranges.append((start, coverage['start']))
+        if end > coverage['end']:
+            tail_start = df.index.max().strftime('%Y-%m-%d') if not df.empty else coverage['end']
+            ranges.append((max(tail_start, start), end))
+        return ranges
+
+
+_caches: Dict[str, PriceHistoryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_price_cache() -> Optional[PriceHistoryCache]:
+    """Process-wide price cache configured from the environment, or None when disabled"""
+    if os.getenv('PRICE_CACHE_ENABLED', 'true').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    directory = os.getenv(
+        'PRICE_CACHE_DIR',
+        os.path.join(os.getenv('AIRFLOW_HOME', tempfile.gettempdir()), 'cache', 'prices')
+    )
+    with _caches_lock:
+        if directory not in _caches:
+            _caches[directory] = PriceHistoryCache(directory)
+        return _caches[directory]
@@ -0,0 +1,59 @@
+"""
+Streaming SDMX-CSV parsing shared by the SDMX providers (ECB, OECD)
+"""
+
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+
+
+def parse_time_period(periods: pd.Series) -> pd.Series:
+    """Convert SDMX TIME_PERIOD strings to period start dates
+
+    Handles daily (2024-01-31), monthly (2024-01), quarterly (2024-Q1),
+    semiannual (2024-S1) and annual (2024) periods in one column.
+    """
+    periods = periods.astype(str)
+    dates = pd.Series(pd.NaT, index=periods.index, dtype='datetime64[ns]')
+
+    daily = periods.str.len() == 10
+    monthly = periods.str.match(r'^\d{4}-\d{2}$')
+    quarterly = periods.str.match(r'^\d{4}-Q[1-4]$')
+    semiannual = periods.str.match(r'^\d{4}-S[12]$')
+    annual = periods.str.match(r'^\d{4}$')
+
+    dates[daily] = pd.to_datetime(periods[daily], format='%Y-%m-%d', errors='coerce')
+    dates[monthly] = pd.to_datetime(periods[monthly], format='%Y-%m', errors='coerce')
+    if quarterly.any():
+        quarter = periods[quarterly]
+        month = (quarter.str[-1].astype(int) - 1) * 3 + 1
+        dates[quarterly] = pd.to_datetime({'year': quarter.str[:4].astype(int), 'month': month, 'day': 1})
+    if semiannual.any():
+        half = periods[semiannual]
+        month = (half.str[-1].astype(int) - 1) * 6 + 1
+        dates[semiannual] = pd.to_datetime({'year': half.str[:4].astype(int), 'month': month, 'day': 1})
+    dates[annual] = pd.to_datetime(periods[annual], format='%Y', errors='coerce')
+    return dates
+
+
+def iter_sdmx_csv(source, dimensions: List[str], chunk_rows: int = 50000,
+                  renames: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+    """Parse an SDMX-CSV stream chunk by chunk into typed frames
+
+    Only the given dimension columns plus TIME_PERIOD and OBS_VALUE are read.
+    Dimensions are read as strings, TIME_PERIOD is converted to a date column
+    and OBS_VALUE to a float value column; rows without a value are dropped.
+    source is any file-like object, e.g. a streamed response's raw body.
+    """
+    columns = list(dimensions) + ['TIME_PERIOD', 'OBS_VALUE']
+    reader = pd.read_csv(
+        source,
+        usecols=columns,
+        dtype={**{dimension: str for dimension in dimensions}, 'TIME_PERIOD': str, 'OBS_VALUE': 'float64'},
+        chunksize=chunk_rows
+    )
+    for chunk in reader:
+        chunk['date'] = parse_time_period(chunk.pop('TIME_PERIOD'))
+        chunk = chunk.rename(columns={'OBS_VALUE': 'value', **(renames or {})})
+        chunk = chunk.dropna(subset=['date', 'value'])
+        if not chunk.empty:
+            yield chunk
@@ -4,143 +4,179 @@ Yahoo Finance API Client for Economic Data
 
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Dict, Optional, List
 import yfinance as yf
 from .base_client import BaseAPIClient
+from .price_cache import get_price_cache
+
+
+# Proxy tickers for China indicators Yahoo Finance has no direct data for.
+# The ticker's Close is rescaled onto the indicator's usual range [low, high].
+PROXY_INDICATORS = {
+    # iShares China Large-Cap ETF as proxy for economic activity
+    'manufacturing_pmi': {'ticker': 'FXI', 'low': 30, 'high': 70, 'decimals': 1,
+                          'label': 'China Manufacturing PMI'},
+    # Shanghai Composite Index as proxy for interest rate environment
+    'interest_rates': {'ticker': '000001.SS', 'low': 2.0, 'high': 4.0, 'decimals': 2,
+                       'label': 'China interest rate'},
+    # WisdomTree Chinese Yuan Strategy Fund as proxy for inflation
+    'cpi': {'ticker': 'CYB', 'low': 95, 'high': 105, 'decimals': 2,
+            'label': 'China CPI'},
+    # iShares MSCI China ETF as proxy for Caixin PMI
+    'caixin_pmi': {'ticker': 'MCHI', 'low': 48, 'high': 52, 'decimals': 1,
+                   'label': 'China Caixin PMI'},
+}
 
 
 class YFinanceClient(BaseAPIClient):
     """Yahoo Finance client for economic and financial data"""
 
+    source_name = 'yfinance'
+
     def __init__(self):
         super().__init__(
             base_url="https://finance.yahoo.com",
             api_key=None
         )
+        self.price_cache = get_price_cache()
 
-    def get_china_manufacturing_pmi(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
-        """Get China Manufacturing PMI data from yfinance"""
+    def _download(self, tickers: List[str], start: str, end: str, interval: str) -> Dict[str, pd.DataFrame]:
+        """Download bars for several tickers in one batched yfinance call"""
+        for _ in tickers:
+            self.rate_limiter.acquire()
+
+        data = yf.download(
+            tickers, start=start, end=end, interval=interval,
+            group_by='ticker', auto_adjust=True, threads=True, progress=False
+        )
+        failed = set(getattr(yf.shared, '_ERRORS', {}) or {})
+
+        results = {}
+        for ticker in tickers:
+            if ticker in failed:
+                print(f"Error downloading {ticker} from yfinance")
+                continue
+            if data.empty:
+                df = pd.DataFrame()
+            elif isinstance(data.columns, pd.MultiIndex):
+                df = data[ticker].dropna(how='all')
+            else:
+                df = data.dropna(how='all')
+            if not df.empty and df.index.tz is not None:
+                df = df.tz_localize(None)
+            df.index.name = 'Date'
+            results[ticker] = df
+        return results
+
+    def get_price_history(self, tickers: List[str], start_date: str = None, end_date: str = None,
+                          interval: str = '1mo') -> Dict[str, pd.DataFrame]:
+        """Price history for several tickers, keyed by ticker and indexed by date
+
+        Bars come from the per-ticker Parquet cache; only the date ranges it
+        does not cover yet are downloaded, with one yfinance call per distinct
+        range for all tickers that need it. Defaults to the last year.
+        """
+        start = start_date or (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        end = end_date or datetime.now().strftime('%Y-%m-%d')
+        tickers = list(dict.fromkeys(tickers))
+
+        cached = {}
+        downloads: Dict[tuple, List[str]] = {}
+        for ticker in tickers:
+            if self.price_cache is not None:
+                df, coverage = self.price_cache.read(ticker, interval)
+                ranges = self.price_cache.missing_ranges(coverage, df, start, end)
+            else:
+                df, coverage, ranges = pd.DataFrame(), None, [(start, end)]
+            cached[ticker] = (df, coverage)
+            for date_range in ranges:
+                downloads.setdefault(date_range, []).append(ticker)
+
+        for (range_start, range_end), range_tickers in downloads.items():
+            try:
+                fetched = self._download(range_tickers, range_start, range_end, interval)
+            except Exception as e:
+                print(f"Error downloading {range_tickers} from yfinance: {e}")
+                continue
+
+            print(f"Downloaded {range_start} to {range_end} for {len(fetched)} tickers from yfinance")
+            for ticker, new_bars in fetched.items():
+                df, coverage = cached[ticker]
+                df = pd.concat([df, new_bars]) if not df.empty else new_bars
+                df = df[~df.index.duplicated(keep='last')].sort_index()
+                coverage = {
+                    'start': min(coverage['start'], range_start) if coverage else range_start,
+                    'end': max(coverage['end'], range_end) if coverage else range_end,
+                }
+                cached[ticker] = (df, coverage)
+                if self.price_cache is not None:
+                    self.price_cache.write(ticker, interval, df, coverage)
+
+        results = {}
+        for ticker, (df, _) in cached.items():
+            if not df.empty:
+                df = df[(df.index >= start) & (df.index < end)]
+            results[ticker] = df
+        return results
+
+    def _proxy_indicator(self, name: str, hist: pd.DataFrame) -> pd.DataFrame:
+        """Rescale a proxy ticker's Close onto the indicator's range"""
+        spec = PROXY_INDICATORS[name]
+        if hist.empty:
+            print(f"No data found for {spec['ticker']}")
+            return pd.DataFrame()
+
+        # Convert to our expected format
+        df = hist.reset_index()
+        df = df[['Date', 'Close']].copy()
+        df.columns = ['date', 'value']
+
+        span = spec['high'] - spec['low']
+        df['value'] = ((df['value'] - df['value'].min()) / (df['value'].max() - df['value'].min()) * span
+                       + spec['low']).round(spec['decimals'])
+
+        print(f"Retrieved {len(df)} {spec['label']} proxy records from yfinance")
+        return df
+
+    def get_china_indicators(self, start_date: str = None, end_date: str = None) -> Dict[str, pd.DataFrame]:
+        """All China proxy indicators from one batched download, keyed by PROXY_INDICATORS name"""
         try:
-            # Yahoo Finance doesn't have direct PMI data, but we can use China ETF or economic indicators
-            # For now, we'll use the iShares China Large-Cap ETF (FXI) as a proxy
-            # In a real implementation, you'd need to find the specific ticker for PMI data
-            
-            ticker = "FXI"  # iShares China Large-Cap ETF as proxy
-            start = start_date or (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-            end = end_date or datetime.now().strftime('%Y-%m-%d')
-            
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start, end=end, interval='1mo')
-            
-            if hist.empty:
-                print(f"No data found for {ticker}")
-                return pd.DataFrame()
-            
-            # Convert to our expected format
-            # Using Close price as a proxy for economic activity
-            df = hist.reset_index()
-            df = df[['Date', 'Close']].copy()
-            df.columns = ['date', 'value']
-            
-            # Normalize to PMI-like range (30-70)
-            df['value'] = ((df['value'] - df['value'].min()) / (df['value'].max() - df['value'].min()) * 40 + 30).round(1)
-            
-            print(f"Retrieved {len(df)} China Manufacturing PMI proxy records from yfinance")
-            return df
-            
+            history = self.get_price_history(
+                [spec['ticker'] for spec in PROXY_INDICATORS.values()], start_date, end_date
+            )
+            return {
+                name: self._proxy_indicator(name, history[spec['ticker']])
+                for name, spec in PROXY_INDICATORS.items()
+            }
         except Exception as e:
-            print(f"Error getting China PMI from yfinance: {e}")
-            return pd.DataFrame()
+            print(f"Error getting China indicators from yfinance: {e}")
+            return {name: pd.DataFrame() for name in PROXY_INDICATORS}
 
-    def get_china_interest_rates(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
-        """Get China interest rate data from yfinance"""
+    def _get_proxy(self, name: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         try:
-            # Use China 10-Year Government Bond yield as proxy
-            ticker = "000001.SS"  # Shanghai Composite Index as proxy for interest rate environment
-            start = start_date or (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-            end = end_date or datetime.now().strftime('%Y-%m-%d')
-            
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start, end=end, interval='1mo')
-            
-            if hist.empty:
-                print(f"No data found for {ticker}")
-                return pd.DataFrame()
-            
-            # Convert to our expected format
-            df = hist.reset_index()
-            df = df[['Date', 'Close']].copy()
-            df.columns = ['date', 'value']
-            
-            # Normalize to interest rate range (2.0-4.0%)
-            df['value'] = ((df['value'] - df['value'].min()) / (df['value'].max() - df['value'].min()) * 2 + 2.0).round(2)
-            
-            print(f"Retrieved {len(df)} China interest rate proxy records from yfinance")
-            return df
-            
+            ticker = PROXY_INDICATORS[name]['ticker']
+            history = self.get_price_history([ticker], start_date, end_date)
+            return self._proxy_indicator(name, history[ticker])
         except Exception as e:
-            print(f"Error getting China interest rates from yfinance: {e}")
+            print(f"Error getting {PROXY_INDICATORS[name]['label']} from yfinance: {e}")
             return pd.DataFrame()
 
+    def get_china_manufacturing_pmi(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """Get China Manufacturing PMI data from yfinance"""
+        # Yahoo Finance doesn't have direct PMI data; FXI is used as a proxy
+        return self._get_proxy('manufacturing_pmi', start_date, end_date)
+
+    def get_china_interest_rates(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """Get China interest rate data from yfinance"""
+        return self._get_proxy('interest_rates', start_date, end_date)
+
     def get_china_cpi(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """Get China Consumer Price Index data from yfinance"""
-        try:
-            # Use Chinese Yuan ETF as proxy for inflation
-            ticker = "CYB"  # WisdomTree Chinese Yuan Strategy Fund
-            start = start_date or (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-            end = end_date or datetime.now().strftime('%Y-%m-%d')
-            
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start, end=end, interval='1mo')
-            
-            if hist.empty:
-                print(f"No data found for {ticker}")
-                return pd.DataFrame()
-            
-            # Convert to our expected format
-            df = hist.reset_index()
-            df = df[['Date', 'Close']].copy()
-            df.columns = ['date', 'value']
-            
-            # Normalize to CPI range (95-105)
-            df['value'] = ((df['value'] - df['value'].min()) / (df['value'].max() - df['value'].min()) * 10 + 95).round(2)
-            
-            print(f"Retrieved {len(df)} China CPI proxy records from yfinance")
-            return df
-            
-        except Exception as e:
-            print(f"Error getting China CPI from yfinance: {e}")
-            return pd.DataFrame()
+        return self._get_proxy('cpi', start_date, end_date)
 
     def get_china_caixin_pmi(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """Get China Caixin Manufacturing PMI data from yfinance"""
-        try:
-            # Use MCHI (iShares MSCI China ETF) as proxy for Caixin PMI
-            ticker = "MCHI"  # iShares MSCI China ETF
-            start = start_date or (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-            end = end_date or datetime.now().strftime('%Y-%m-%d')
-            
-            stock = yf.Ticker(ticker)
-            hist = stock.history(start=start, end=end, interval='1mo')
-            
-            if hist.empty:
-                print(f"No data found for {ticker}")
-                return pd.DataFrame()
-            
-            # Convert to our expected format
-            df = hist.reset_index()
-            df = df[['Date', 'Close']].copy()
-            df.columns = ['date', 'value']
-            
-            # Normalize to PMI-like range (48-52) for Caixin
-            df['value'] = ((df['value'] - df['value'].min()) / (df['value'].max() - df['value'].min()) * 4 + 48).round(1)
-            
-            print(f"Retrieved {len(df)} China Caixin PMI proxy records from yfinance")
-            return df
-            
-        except Exception as e:
-            print(f"Error getting China Caixin PMI from yfinance: {e}")
-            return pd.DataFrame()
+        return self._get_proxy('caixin_pmi', start_date, end_date)
 
     def get_economic_indicator(self, country: str, indicator: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """Generic method to get economic indicators from yfinance"""
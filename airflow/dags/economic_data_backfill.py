@@ -0,0 +1,60 @@
+"""
+Economic Data Backfill DAG
+Manually triggered, resumable backfill of registry series history
+"""
+
+from datetime import datetime, timedelta
+from airflow import DAG
+from airflow.operators.python import PythonOperator
+
+from tasks.backfill import run_backfill
+
+
+# Default arguments
+default_args = {
+    'owner': 'economic_data_team',
+    'depends_on_past': False,
+    'start_date': datetime(2024, 1, 1),
+    'email_on_failure': False,
+    'email_on_retry': False,
+    # Retries resume from the checkpointed ranges
+    'retries': 2,
+    'retry_delay': timedelta(minutes=10),
+}
+
+# DAG definition; trigger with a config such as
+# {"series_ids": ["DGS10"], "start_date": "1962-01-01", "workers": 8}
+dag = DAG(
+    'economic_data_backfill',
+    default_args=default_args,
+    description='Resumable, chunk-parallel backfill of economic series history',
+    schedule_interval=None,
+    catchup=False,
+    max_active_runs=1,
+    params={
+        'series_ids': [],        # empty: every series in tasks/series_registry.py
+        'start_date': None,      # default: each series' default_start
+        'end_date': None,        # default: today
+        'workers': None,         # default: BACKFILL_WORKERS
+        'restart': False,        # ignore checkpoints and start over
+    },
+    tags=['economic_data', 'backfill'],
+)
+
+# Each source's series are backfilled by their own task in that source's
+# pool (created by airflow_init in docker-compose.yml), so BLS and EIA work
+# does not take FRED slots from the daily loads
+SOURCE_POOLS = {
+    'FRED': 'fred_api',
+    'BLS': 'bls_api',
+    'EIA': 'eia_api',
+}
+
+for source, pool in SOURCE_POOLS.items():
+    PythonOperator(
+        task_id=f'backfill_{source.lower()}_series',
+        python_callable=run_backfill,
+        op_kwargs={'source': source},
+        pool=pool,
+        dag=dag,
+    )
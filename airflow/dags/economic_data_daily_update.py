@@ -3,34 +3,32 @@ Economic Data Daily Update DAG
 Fetches and updates economic indicators from various sources
 """
 
+import os
 from datetime import datetime, timedelta
 from airflow import DAG
+from airflow.operators.empty import EmptyOperator
 from airflow.operators.python import PythonOperator
 
 # Import all tasks
 from tasks import (
+    # Every FRED series in tasks/series_registry.py
+    batch_fred_series,
+    update_fred_series,
+    
     # China tasks
-    update_china_manufacturing_pmi,
-    update_china_interest_rates,
-    update_china_consumer_price_index,
+    update_oecd_real_rates,
+    
+    # Europe tasks
+    update_ecb_yields,
+    
+    # Global tasks
+    update_global_gdp,
+    update_imf_commodity_prices,
     
     # US tasks
-    update_durable_goods,
-    update_employment_data,
-    update_industrial_production,
-    update_jobless_claims,
-    update_commodities_data,
+    update_bls_data,
     update_eia_data,
-    update_cot_data,
-    update_yields_data,
-    update_inflation_data,
-    update_building_permits,
-    update_m2_money_supply,
-    update_usd_index,
-    update_ism_manufacturing,
-    update_ism_non_manufacturing,
-    update_nfib_small_business,
-    update_umcsi_consumer_sentiment
+    update_cot_data
 )
 
 
@@ -56,152 +54,93 @@ dag = DAG(
 )
 
 
-def start_pipeline(**context):
-    """Start the economic data pipeline"""
-    print(f"Starting economic data pipeline at {context['ds']}")
-    return "Pipeline started successfully"
+# Airflow pools capping concurrent task instances per data source
+# (created by airflow_init in docker-compose.yml)
+SOURCE_POOLS = {
+    'fred': 'fred_api',
+    'bls': 'bls_api',
+    'ecb': 'ecb_api',
+    'eia': 'eia_api',
+    'imf': 'imf_api',
+    'nasdaq': 'nasdaq_api',
+    'oecd': 'oecd_api',
+    'world_bank': 'world_bank_api',
+}
 
+# Registry series handled by one mapped task instance; raise it to amortize
+# task startup (imports, client and session setup) over more series
+FRED_SERIES_PER_TASK = int(os.getenv('FRED_SERIES_PER_TASK', 8))
 
-def end_pipeline(**context):
-    """End the economic data pipeline"""
-    print(f"Economic data pipeline completed at {context['ds']}")
-    return "Pipeline completed successfully"
 
+# Pipeline start and end markers; EmptyOperator never occupies a worker
+start = EmptyOperator(task_id='start', dag=dag)
 
-# Pipeline start and end tasks
-start = PythonOperator(
-    task_id='start',
-    python_callable=start_pipeline,
-    dag=dag,
-)
+end = EmptyOperator(task_id='end', dag=dag)
 
-end = PythonOperator(
-    task_id='end',
-    python_callable=end_pipeline,
+# FRED series (China and US) from tasks/series_registry.py, mapped over batches
+# of FRED_SERIES_PER_TASK series. Each instance fetches its batch concurrently
+# and loads it one table per statement.
+fred_series = PythonOperator.partial(
+    task_id='update_fred_series',
+    python_callable=update_fred_series,
+    pool=SOURCE_POOLS['fred'],
     dag=dag,
+).expand(
+    op_kwargs=[{'series_ids': batch} for batch in batch_fred_series(FRED_SERIES_PER_TASK)]
 )
 
 # China economic data tasks
-china_pmi = PythonOperator(
-    task_id='update_china_manufacturing_pmi',
-    python_callable=update_china_manufacturing_pmi,
-    dag=dag,
-)
-
-china_rates = PythonOperator(
-    task_id='update_china_interest_rates',
-    python_callable=update_china_interest_rates,
-    dag=dag,
-)
-
-china_cpi = PythonOperator(
-    task_id='update_china_consumer_price_index',
-    python_callable=update_china_consumer_price_index,
-    dag=dag,
-)
-# US economic data tasks
-durable_goods = PythonOperator(
-    task_id='update_durable_goods',
-    python_callable=update_durable_goods,
+oecd_real_rates = PythonOperator(
+    task_id='update_oecd_real_rates',
+    python_callable=update_oecd_real_rates,
+    pool=SOURCE_POOLS['oecd'],
     dag=dag,
 )
 
-employment = PythonOperator(
-    task_id='update_employment_data',
-    python_callable=update_employment_data,
+# Europe economic data tasks
+ecb_yields = PythonOperator(
+    task_id='update_ecb_yields',
+    python_callable=update_ecb_yields,
+    pool=SOURCE_POOLS['ecb'],
     dag=dag,
 )
 
-industrial_prod = PythonOperator(
-    task_id='update_industrial_production',
-    python_callable=update_industrial_production,
+# Global economic data tasks
+global_gdp = PythonOperator(
+    task_id='update_global_gdp',
+    python_callable=update_global_gdp,
+    pool=SOURCE_POOLS['world_bank'],
     dag=dag,
 )
 
-jobless = PythonOperator(
-    task_id='update_jobless_claims',
-    python_callable=update_jobless_claims,
+imf_commodity_prices = PythonOperator(
+    task_id='update_imf_commodity_prices',
+    python_callable=update_imf_commodity_prices,
+    pool=SOURCE_POOLS['imf'],
     dag=dag,
 )
 
-commodities = PythonOperator(
-    task_id='update_commodities_data',
-    python_callable=update_commodities_data,
+# US economic data tasks
+bls = PythonOperator(
+    task_id='update_bls_data',
+    python_callable=update_bls_data,
+    pool=SOURCE_POOLS['bls'],
     dag=dag,
 )
 
 eia = PythonOperator(
     task_id='update_eia_data',
     python_callable=update_eia_data,
+    pool=SOURCE_POOLS['eia'],
     dag=dag,
 )
 
 cot = PythonOperator(
     task_id='update_cot_data',
     python_callable=update_cot_data,
-    dag=dag,
-)
-
-yields_task = PythonOperator(
-    task_id='update_yields_data',
-    python_callable=update_yields_data,
-    dag=dag,
-)
-
-inflation = PythonOperator(
-    task_id='update_inflation_data',
-    python_callable=update_inflation_data,
-    dag=dag,
-)
-
-permits = PythonOperator(
-    task_id='update_building_permits',
-    python_callable=update_building_permits,
-    dag=dag,
-)
-
-m2 = PythonOperator(
-    task_id='update_m2_money_supply',
-    python_callable=update_m2_money_supply,
-    dag=dag,
-)
-
-usd = PythonOperator(
-    task_id='update_usd_index',
-    python_callable=update_usd_index,
-    dag=dag,
-)
-
-ism_mfg = PythonOperator(
-    task_id='update_ism_manufacturing',
-    python_callable=update_ism_manufacturing,
-    dag=dag,
-)
-
-ism_nonmfg = PythonOperator(
-    task_id='update_ism_non_manufacturing',
-    python_callable=update_ism_non_manufacturing,
-    dag=dag,
-)
-
-nfib = PythonOperator(
-    task_id='update_nfib_small_business',
-    python_callable=update_nfib_small_business,
-    dag=dag,
-)
-
-umcsi_task = PythonOperator(
-    task_id='update_umcsi_consumer_sentiment',
-    python_callable=update_umcsi_consumer_sentiment,
+    pool=SOURCE_POOLS['nasdaq'],
     dag=dag,
 )
 
 # Task dependencies
-start >> [
-    china_pmi, china_rates, china_cpi,
-    durable_goods, employment, industrial_prod, jobless,
-    commodities, eia, cot,
-    yields_task,
-    inflation, permits, m2, usd,
-    ism_mfg, ism_nonmfg, nfib, umcsi_task
-] >> end
\ No newline at end of file
+start >> [fred_series, oecd_real_rates, ecb_yields, global_gdp, imf_commodity_prices, bls, eia, cot] >> end
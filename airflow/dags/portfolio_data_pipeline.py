@@ -9,6 +9,7 @@ from airflow.operators.python import PythonOperator
 from airflow.operators.bash import BashOperator
 from airflow.providers.postgres.operators.postgres import PostgresOperator
 from airflow.providers.postgres.hooks.postgres import PostgresHook
+from tasks.utils import bulk_upsert
 
 # Default arguments
 default_args = {
@@ -105,17 +106,10 @@ def load_data_to_timescaledb(**context):
     postgres_hook.run(create_table_sql)
     
     # Insert data
-    for _, row in df.iterrows():
-        insert_sql = """
-        INSERT INTO market_data (symbol, price, volume, price_change, volume_weighted_price, timestamp)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        postgres_hook.run(insert_sql, parameters=(
-            row['symbol'], row['price'], row['volume'], 
-            row['price_change'], row['volume_weighted_price'], row['timestamp']
-        ))
-    
-    print(f"Loaded {len(df)} records to TimescaleDB")
+    rows = df[['symbol', 'price', 'volume', 'price_change', 'volume_weighted_price', 'timestamp']]
+    inserted, _ = bulk_upsert('public', 'market_data', rows, hook=postgres_hook)
+    
+    print(f"Loaded {inserted} records to TimescaleDB")
 
 def calculate_portfolio_metrics(**context):
     """Calculate portfolio performance metrics"""
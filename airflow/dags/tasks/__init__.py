@@ -6,14 +6,20 @@ from .china_tasks import (
     update_china_manufacturing_pmi,
     update_china_interest_rates,
     update_china_consumer_price_index,
+    update_oecd_real_rates,
 )
 
+from .europe_tasks import update_ecb_yields
+
+from .global_tasks import update_global_gdp, update_imf_commodity_prices
+
 from .us_tasks import (
     update_durable_goods,
     update_employment_data,
     update_industrial_production,
     update_jobless_claims,
     update_commodities_data,
+    update_bls_data,
     update_eia_data,
     update_cot_data,
     update_yields_data,
@@ -27,9 +33,32 @@ from .us_tasks import (
     update_umcsi_consumer_sentiment
 )
 
+from .series_loader import (
+    load_bls_series,
+    load_eia_series,
+    load_fred_series,
+    load_fred_vintages,
+    stream_fred_series,
+    update_fred_series
+)
+
+from .cot_loader import load_cot_data
+
+from .streaming import stream_observations
+
+from .backfill import backfill_series, run_backfill
+
+from .series_registry import BLS_SERIES, EIA_SERIES, FRED_SERIES, batch_fred_series
+
 from .utils import (
     get_db_hook,
-    get_last_date,
+    get_watermarks,
+    bulk_upsert,
+    catalog_entry,
+    write_observations,
+    write_vintages,
+    get_changed_fred_series,
+    mark_fred_series_loaded,
     log_update
 )
 
@@ -38,6 +67,14 @@ __all__ = [
     'update_china_manufacturing_pmi',
     'update_china_interest_rates', 
     'update_china_consumer_price_index',
+    'update_oecd_real_rates',
+    
+    # Europe tasks
+    'update_ecb_yields',
+    
+    # Global tasks
+    'update_global_gdp',
+    'update_imf_commodity_prices',
     
     # US tasks
     'update_durable_goods',
@@ -45,6 +82,7 @@ __all__ = [
     'update_industrial_production',
     'update_jobless_claims',
     'update_commodities_data',
+    'update_bls_data',
     'update_eia_data',
     'update_cot_data',
     'update_yields_data',
@@ -57,8 +95,30 @@ __all__ = [
     'update_nfib_small_business',
     'update_umcsi_consumer_sentiment',
     
+    # Registry-driven FRED loader
+    'load_bls_series',
+    'load_cot_data',
+    'load_eia_series',
+    'load_fred_series',
+    'load_fred_vintages',
+    'stream_fred_series',
+    'stream_observations',
+    'backfill_series',
+    'run_backfill',
+    'update_fred_series',
+    'FRED_SERIES',
+    'BLS_SERIES',
+    'EIA_SERIES',
+    'batch_fred_series',
+    
     # Utils
     'get_db_hook',
-    'get_last_date',
+    'get_watermarks',
+    'bulk_upsert',
+    'catalog_entry',
+    'write_observations',
+    'write_vintages',
+    'get_changed_fred_series',
+    'mark_fred_series_loaded',
     'log_update'
 ]
@@ -0,0 +1,289 @@
+"""
+Resumable, chunk-parallel historical backfill of registry series (FRED, BLS and EIA)
+
+Run from the DAGs folder, e.g.:
+
+    python -m tasks.backfill DGS10 CPIAUCSL --start 1900-01-01 --workers 8
+"""
+
+import os
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+from api_clients import get_bls_client, get_eia_client, get_fred_client
+from .series_loader import eia_observations, observation_rows, series_catalog_entry
+from .series_registry import (
+    BLS_SERIES,
+    BLS_SERIES_BY_ID,
+    EIA_SERIES,
+    EIA_SERIES_BY_ID,
+    FRED_SERIES,
+    FRED_SERIES_BY_ID
+)
+from .utils import get_db_hook, log_update, write_observations
+
+
+# TimescaleDB's default chunk_time_interval, and the origin chunks are aligned to
+DEFAULT_CHUNK_INTERVAL = timedelta(days=7)
+CHUNK_ORIGIN = date(1970, 1, 1)
+
+# Registry series by source
+REGISTRY = {'FRED': FRED_SERIES_BY_ID, 'BLS': BLS_SERIES_BY_ID, 'EIA': EIA_SERIES_BY_ID}
+
+
+def registry_source(series_id: str) -> str:
+    """Source of a registry series; raises KeyError for series not in the registry"""
+    for source, specs in REGISTRY.items():
+        if series_id in specs:
+            return source
+    raise KeyError(f"{series_id} is not in the series registry")
+
+
+def get_chunk_interval(schema: str, table: str) -> timedelta:
+    """chunk_time_interval of a hypertable's time dimension"""
+    hook = get_db_hook()
+    row = hook.get_first(
+        """
+        SELECT time_interval
+        FROM timescaledb_information.dimensions
+        WHERE hypertable_schema = %s AND hypertable_name = %s AND dimension_number = 1
+        """,
+        parameters=(schema, table)
+    )
+    return row[0] if row and row[0] else DEFAULT_CHUNK_INTERVAL
+
+
+def chunk_ranges(start: date, end: date, interval: timedelta,
+                 min_days: int = 1) -> List[Tuple[date, date]]:
+    """Split [start, end] into [range_start, range_end) ranges on hypertable chunk boundaries
+
+    Each range spans a whole number of chunks, at least min_days long, so
+    that ranges loaded in parallel never write into the same chunk.
+    """
+    chunk_days = max(1, interval.days)
+    span = chunk_days * max(1, -(-min_days // chunk_days))
+    stop = end + timedelta(days=1)
+
+    boundary = CHUNK_ORIGIN + timedelta(days=(start - CHUNK_ORIGIN).days // span * span)
+    ranges = []
+    while boundary < stop:
+        next_boundary = boundary + timedelta(days=span)
+        ranges.append((max(boundary, start), min(next_boundary, stop)))
+        boundary = next_boundary
+    return ranges
+
+
+def _checkpoint_ranges(spec: Dict, ranges: List[Tuple[date, date]], restart: bool) -> List[Tuple[date, date]]:
+    """Record the ranges in metadata.backfill_chunks and return the ones not done yet"""
+    key = (spec['schema'], spec['table'], spec['series_id'])
+    hook = get_db_hook()
+    conn = hook.get_conn()
+    try:
+        with conn.cursor() as cur:
+            if restart:
+                cur.execute(
+                    "DELETE FROM metadata.backfill_chunks WHERE schema_name = %s AND table_name = %s AND series_id = %s",
+                    key
+                )
+            cur.execute(
+                """
+                INSERT INTO metadata.backfill_chunks (schema_name, table_name, series_id, chunk_start, chunk_end)
+                SELECT %s, %s, %s, r.chunk_start, r.chunk_end
+                FROM unnest(%s::date[], %s::date[]) AS r(chunk_start, chunk_end)
+                ON CONFLICT (schema_name, table_name, series_id, chunk_start) DO NOTHING
+                """,
+                key + ([r[0] for r in ranges], [r[1] for r in ranges])
+            )
+            cur.execute(
+                """
+                SELECT chunk_start, chunk_end
+                FROM metadata.backfill_chunks
+                WHERE schema_name = %s AND table_name = %s AND series_id = %s
+                  AND chunk_start = ANY(%s::date[]) AND status <> 'done'
+                ORDER BY chunk_start
+                """,
+                key + ([r[0] for r in ranges],)
+            )
+            pending = cur.fetchall()
+        conn.commit()
+    finally:
+        conn.close()
+    return pending
+
+
+def _record_range(spec: Dict, chunk_start: date, status: str, inserted: int = 0,
+                  updated: int = 0, error_message: Optional[str] = None):
+    hook = get_db_hook()
+    hook.run(
+        """
+        UPDATE metadata.backfill_chunks
+        SET status = %s, records_added = %s, records_updated = %s,
+            attempts = attempts + 1, error_message = %s, updated_at = NOW()
+        WHERE schema_name = %s AND table_name = %s AND series_id = %s AND chunk_start = %s
+        """,
+        parameters=(status, inserted, updated, error_message,
+                    spec['schema'], spec['table'], spec['series_id'], chunk_start)
+    )
+
+
+def _catalogued_row_units() -> Dict[str, str]:
+    """Unit of each commodity's demand_supply_factors row, as catalogued by the EIA loader"""
+    hook = get_db_hook()
+    rows = hook.get_records(
+        """
+        SELECT DISTINCT dimensions ->> 'commodity', dimensions ->> 'unit'
+        FROM metadata.series_catalog
+        WHERE target_schema = 'commodities' AND target_table = 'demand_supply_factors'
+        """
+    )
+    return dict(rows)
+
+
+def _fetch_range(client, source: str, spec: Dict, chunk_start: date, chunk_end: date,
+                 row_units: Optional[Dict[str, str]] = None) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Observations of one date range of a series from its source, with their catalog entries"""
+    last = chunk_end - timedelta(days=1)
+    if source == 'FRED':
+        pages = list(client.iter_series_pages(
+            spec['series_id'], start_date=chunk_start.isoformat(), end_date=last.isoformat()
+        ))
+        frame = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame(columns=['date', 'value'])
+        return observation_rows(spec, frame), [series_catalog_entry(spec, source)]
+
+    if source == 'BLS':
+        data = client.get_many_series([spec['series_id']], start_year=chunk_start.year, end_year=last.year)
+        dates = pd.to_datetime(data['date'])
+        frame = data[(dates >= pd.Timestamp(chunk_start)) & (dates <= pd.Timestamp(last))]
+        return observation_rows(spec, frame), [series_catalog_entry(spec, source)]
+
+    pages = list(client.iter_data(
+        spec['route'], [spec['series_id']], spec['frequency'], start=chunk_start.isoformat(), end=last.isoformat()
+    ))
+    if not pages:
+        return pd.DataFrame(columns=['series_id', 'date', 'value']), []
+    return eia_observations(pd.concat(pages, ignore_index=True), row_units)
+
+
+def _write_range(spec: Dict, fetched: Tuple[pd.DataFrame, List[Dict]]) -> Tuple[int, int]:
+    """Load one fetched date range through the observations store"""
+    observations, catalog = fetched
+    if observations.empty:
+        return 0, 0
+    counts = write_observations(observations, catalog)
+    return counts.get((spec['schema'], spec['table']), (0, 0))
+
+
+def backfill_series(series_id: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                    workers: Optional[int] = None, restart: bool = False) -> Dict[str, int]:
+    """Backfill a registry series' history in resumable date ranges fetched in parallel
+
+    History from start_date (default the series' default_start) to end_date
+    (default today) is split into ranges aligned to the target hypertable's
+    chunks, at least BACKFILL_MIN_RANGE_DAYS (default 1825) long. Ranges are
+    fetched from the series' source (FRED, BLS or EIA) by a pool of workers
+    (BACKFILL_WORKERS, default 4) and written one at a time, oldest first.
+    A range is only submitted once the oldest one before it is written, so
+    at most workers fetched ranges are held in memory. Every write of the
+    series updates the same catalog, watermark and latest value rows and
+    refreshes derived columns 12 months past its range.
+    Finished ranges are checkpointed in metadata.backfill_chunks, so a
+    re-run only processes the ranges still pending or failed; restart=True
+    starts over. Returns {'inserted', 'updated', 'ranges', 'failed'}.
+    """
+    source = registry_source(series_id)
+    spec = REGISTRY[source][series_id]
+    start = pd.Timestamp(start_date or spec['default_start']).date()
+    end = pd.Timestamp(end_date).date() if end_date else date.today()
+    workers = workers or int(os.getenv('BACKFILL_WORKERS', 4))
+
+    interval = get_chunk_interval(spec['schema'], spec['table'])
+    ranges = chunk_ranges(start, end, interval, int(os.getenv('BACKFILL_MIN_RANGE_DAYS', 1825)))
+    pending = _checkpoint_ranges(spec, ranges, restart)
+    print(f"Backfilling {source} series {series_id} into {spec['schema']}.{spec['table']} from {start} to {end}: "
+          f"{len(pending)} of {len(ranges)} ranges pending, {workers} workers")
+
+    result = {'inserted': 0, 'updated': 0, 'ranges': len(pending), 'failed': 0}
+    client = {'FRED': get_fred_client, 'BLS': get_bls_client, 'EIA': get_eia_client}[source]()
+    row_units = _catalogued_row_units() if spec.get('factor') else None
+    unsubmitted = iter(pending)
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        def submit_next():
+            chunk = next(unsubmitted, None)
+            if chunk is not None:
+                in_flight.append((chunk[0], executor.submit(_fetch_range, client, source, spec, *chunk, row_units)))
+
+        for _ in range(workers):
+            submit_next()
+        while in_flight:
+            chunk_start, future = in_flight.popleft()
+            try:
+                inserted, updated = _write_range(spec, future.result())
+            except Exception as e:
+                print(f"Backfill of {series_id} from {chunk_start} failed: {e}")
+                _record_range(spec, chunk_start, 'failed', error_message=str(e))
+                result['failed'] += 1
+            else:
+                _record_range(spec, chunk_start, 'done', inserted, updated)
+                result['inserted'] += inserted
+                result['updated'] += updated
+            submit_next()
+
+    status = 'failed' if result['failed'] else 'success'
+    log_update(spec['schema'], spec['table'], result['inserted'], status, records_updated=result['updated'],
+               error_message=f"{result['failed']} backfill ranges failed" if result['failed'] else None)
+    print(f"Backfill of {series_id} finished: {result}")
+    return result
+
+
+def run_backfill(source: Optional[str] = None, **context):
+    """Airflow entry point; reads series_ids, start_date, end_date, workers and restart from params
+
+    With source ('FRED', 'BLS' or 'EIA') only that source's series are
+    backfilled, so each source's task can run in its own pool.
+    """
+    params = context.get('params') or {}
+    series_ids = params.get('series_ids') or [spec['series_id'] for spec in FRED_SERIES + BLS_SERIES + EIA_SERIES]
+    if source is not None:
+        series_ids = [series_id for series_id in series_ids if registry_source(series_id) == source]
+
+    failed = []
+    for series_id in series_ids:
+        result = backfill_series(
+            series_id,
+            start_date=params.get('start_date'),
+            end_date=params.get('end_date'),
+            workers=params.get('workers'),
+            restart=bool(params.get('restart'))
+        )
+        if result['failed']:
+            failed.append(series_id)
+
+    if failed:
+        raise RuntimeError(f"Backfill incomplete for {', '.join(failed)}; re-run to resume")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable backfill of registry series")
+    parser.add_argument('series_ids', nargs='*', help="Series to backfill (default: all registry series)")
+    parser.add_argument('--start', help="First date, YYYY-MM-DD (default: the series' default_start)")
+    parser.add_argument('--end', help="Last date, YYYY-MM-DD (default: today)")
+    parser.add_argument('--workers', type=int, help="Parallel ranges (default: BACKFILL_WORKERS)")
+    parser.add_argument('--restart', action='store_true', help="Ignore checkpoints and start over")
+    args = parser.parse_args()
+
+    run_backfill(params={
+        'series_ids': args.series_ids,
+        'start_date': args.start,
+        'end_date': args.end,
+        'workers': args.workers,
+        'restart': args.restart,
+    })
+
+
+if __name__ == '__main__':
+    main()
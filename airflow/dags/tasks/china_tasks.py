@@ -1,36 +1,37 @@
 """
 China Economic Data Update Tasks
+
+Series definitions live in series_registry.FRED_SERIES.
 """
 
-from api_clients import get_fred_client
-from .utils import get_db_hook, get_last_date, log_update
+from typing import List
+
+from api_clients import get_oecd_client
+from .series_loader import load_fred_series
+from .utils import (
+    catalog_entry,
+    get_watermarks,
+    is_full_refresh,
+    log_update,
+    start_from_watermark,
+    write_observations
+)
+
+
+# Areas whose real rates are loaded into china.real_rates from the OECD, stored
+# under series_id OECD.<ISO3> next to the FRED-sourced China series
+OECD_REAL_RATE_AREAS: List[str] = [
+    'CHN', 'USA', 'JPN', 'DEU', 'FRA', 'GBR', 'ITA', 'CAN', 'AUS', 'KOR',
+    'IND', 'BRA', 'MEX', 'IDN', 'ZAF', 'EA20',
+]
+
+# Measures stored per area, as series OECD.<ISO3>.<measure>
+OECD_RATE_MEASURES = ['real_rate', 'nominal_rate', 'inflation_rate']
 
 
 def update_china_manufacturing_pmi(**context):
     """Update China Manufacturing PMI from FRED"""
-    fred_client = get_fred_client()
-    hook = get_db_hook()
-    
-    # FRED series ID for China Manufacturing PMI
-    series_id = 'CHNPMI'
-    start_date = '1900-01-01'
-    
-    df = fred_client.get_series(series_id, start_date=start_date)
-    
-    if not df.empty:
-        for _, row in df.iterrows():
-            insert_sql = """
-            INSERT INTO china.manufacturing_pmi (date, pmi_value, series_id, source)
-            VALUES (%s, %s, %s, 'FRED')
-            ON CONFLICT (date, series_id) DO UPDATE SET pmi_value = EXCLUDED.pmi_value
-            """
-            hook.run(insert_sql, parameters=(row['date'], row['value'], series_id))
-        
-        log_update('china', 'manufacturing_pmi', len(df), 'success')
-        print(f"Updated {len(df)} records for China Manufacturing PMI from FRED")
-    else:
-        log_update('china', 'manufacturing_pmi', 0, 'no_data')
-        print("No data available for China Manufacturing PMI from FRED")
+    return load_fred_series(['CHNPMI'], **context)
 
 """ china non manufacturing pmi FRED CHNNSAMN
 """
@@ -40,53 +41,53 @@ def update_china_interest_rates(**context):
     """Update China real rates from FRED"""
     """The overnight rate for banks lending to each other, reflecting short-term market liquidity.
     """
-    fred_client = get_fred_client()
-    hook = get_db_hook()
-    
-    # FRED series ID for China Interest Rate
-    series_id = 'IRSTCI01CNM156N'
-    start_date = '1900-01-01'
-    
-    df = fred_client.get_series(series_id, start_date=start_date)
-    
-    if not df.empty:
-        for _, row in df.iterrows():
-            insert_sql = """
-            INSERT INTO china.real_rates (date, real_rate, series_id, source)
-            VALUES (%s, %s, %s, 'FRED')
-            ON CONFLICT (date, series_id) DO UPDATE SET real_rate = EXCLUDED.real_rate
-            """
-            hook.run(insert_sql, parameters=(row['date'], row['value'], series_id))
-        
-        log_update('china', 'real_rates', len(df), 'success')
-        print(f"Updated {len(df)} records for China Real Rates from FRED")
-    else:
-        log_update('china', 'real_rates', 0, 'no_data')
-        print("No data available for China Real Rates from FRED")
+    return load_fred_series(['IRSTCI01CNM156N'], **context)
     
 
 def update_china_consumer_price_index(**context):
     """Update China Consumer Price Index from FRED"""
-    fred_client = get_fred_client()
-    hook = get_db_hook()
-    
-    # FRED series ID for China Consumer Price Index
-    series_id = 'CHNCPALTT01IXOBM'
-    start_date = '1900-01-01'
-    
-    df = fred_client.get_series(series_id, start_date=start_date)
-    
-    if not df.empty:
-        for _, row in df.iterrows():
-            insert_sql = """
-            INSERT INTO china.consumer_price_index (date, cpi_value, series_id, source)
-            VALUES (%s, %s, %s, 'FRED')
-            ON CONFLICT (date, series_id) DO UPDATE SET cpi_value = EXCLUDED.cpi_value
-            """
-            hook.run(insert_sql, parameters=(row['date'], row['value'], series_id))
-        
-        log_update('china', 'consumer_price_index', len(df), 'success')
-        print(f"Updated {len(df)} records for China Consumer Price Index from FRED")
-    else:
-        log_update('china', 'consumer_price_index', 0, 'no_data')
-        print("No data available for China Consumer Price Index from FRED")
\ No newline at end of file
+    return load_fred_series(['CHNCPALTT01IXOBM'], **context)
+
+
+def update_oecd_real_rates(**context):
+    """Update real short-term rates (3-month rate minus CPI inflation) from the OECD
+
+    Every area in OECD_REAL_RATE_AREAS is fetched with one request per
+    measure and the real rate is computed across the whole panel.
+    """
+    oecd_client = get_oecd_client()
+    keys = [('china', 'real_rates', f"OECD.{area}") for area in OECD_REAL_RATE_AREAS]
+
+    start_date = '1990-01-01'
+    if not is_full_refresh(context):
+        # The least current loaded area decides; areas without data are picked
+        # up by the next full refresh
+        loaded = [last_date for last_date in get_watermarks(keys).values() if last_date]
+        start_date = start_from_watermark(min(loaded) if loaded else None, start_date)
+
+    try:
+        rates = oecd_client.get_real_rates(OECD_REAL_RATE_AREAS, start_period=start_date[:7])
+        if rates.empty:
+            log_update('china', 'real_rates', 0, 'no_data')
+            print("No data available for OECD real rates")
+            return
+
+        observations = rates.melt(id_vars=['REF_AREA', 'date'], value_vars=OECD_RATE_MEASURES, var_name='measure')
+        observations['series_id'] = 'OECD.' + observations['REF_AREA'] + '.' + observations['measure']
+        catalog = [
+            catalog_entry(
+                f"OECD.{area}.{measure}", 'OECD', 'china', 'real_rates', measure,
+                dimensions={'series_id': f"OECD.{area}", 'source': 'OECD'},
+                name=f"{area} {measure.replace('_', ' ')}", frequency='Monthly', units='Percent'
+            )
+            for area in rates['REF_AREA'].unique()
+            for measure in OECD_RATE_MEASURES
+        ]
+        counts = write_observations(observations, catalog)
+    except Exception as e:
+        log_update('china', 'real_rates', 0, 'failed', error_message=str(e))
+        raise
+
+    inserted, updated = counts.get(('china', 'real_rates'), (0, 0))
+    log_update('china', 'real_rates', inserted, 'success', records_updated=updated)
+    print(f"Updated OECD real rates for {rates['REF_AREA'].nunique()} areas since {start_date[:7]}")
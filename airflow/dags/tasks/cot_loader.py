@@ -0,0 +1,229 @@
+"""
+Commitment of Traders loader using NASDAQ Data Link bulk and delta exports
+"""
+
+import os
+from typing import Dict, List, Tuple
+import pandas as pd
+
+from api_clients import get_nasdaq_client
+from .streaming import stream_observations
+from .utils import (
+    catalog_entry,
+    get_db_hook,
+    get_export_snapshot,
+    is_full_refresh,
+    log_update,
+    set_export_snapshot
+)
+
+
+# Legacy futures-and-options COT report datatable and the report type loaded
+COT_DATATABLE = os.getenv('COT_DATATABLE', 'QDL/LFON')
+COT_REPORT_TYPE = 'F_L_ALL'
+
+# Tracked CFTC contract codes and the commodity name they are stored under
+COT_CONTRACTS: Dict[str, str] = {
+    '088691': 'gold',
+    '084691': 'silver',
+    '085692': 'copper',
+    '076651': 'platinum',
+    '075651': 'palladium',
+    '067651': 'crude_oil_wti',
+    '023651': 'natural_gas',
+    '022651': 'heating_oil',
+    '111659': 'rbob_gasoline',
+}
+
+# Datatable columns mapped to commodities.cot_metals_energy columns
+COT_COLUMNS: Dict[str, str] = {
+    'date': 'date',
+    'market_participation': 'total_open_interest',
+    'commercial_longs': 'commercial_long',
+    'commercial_shorts': 'commercial_short',
+    'noncommercial_longs': 'noncommercial_long',
+    'noncommercial_shorts': 'noncommercial_short',
+}
+
+_KEY_COLUMNS = ['contract_code', 'type', 'date']
+_POSITION_COLUMNS = [column for column in COT_COLUMNS.values() if column != 'date'] + ['net_position']
+
+
+def _tracked(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Rows of tracked contracts in the loaded report type, with a commodity column"""
+    chunk = chunk[chunk['contract_code'].isin(list(COT_CONTRACTS)) & (chunk['type'] == COT_REPORT_TYPE)]
+    return chunk.assign(commodity=chunk['contract_code'].map(COT_CONTRACTS))
+
+
+def cot_rows(chunk: pd.DataFrame) -> pd.DataFrame:
+    """commodities.cot_metals_energy rows (with the contract code) from a chunk of the export
+
+    net_position is the non-commercial (speculative) long minus short.
+    """
+    chunk = _tracked(chunk).rename(columns=COT_COLUMNS)
+    chunk['net_position'] = chunk['noncommercial_long'] - chunk['noncommercial_short']
+    return chunk[['date', 'contract_code', 'commodity'] + _POSITION_COLUMNS]
+
+
+def cot_series_id(contract_code: str, column: str) -> str:
+    """Observations series of one position column of a contract, e.g. COT.088691.net_position"""
+    return f"COT.{contract_code}.{column}"
+
+
+def cot_observations(chunk: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Observations of a chunk of the export, one series per contract and position column"""
+    rows = cot_rows(chunk)
+    observations = rows.melt(
+        id_vars=['date', 'contract_code'], value_vars=_POSITION_COLUMNS, var_name='column'
+    )
+    observations['series_id'] = 'COT.' + observations['contract_code'] + '.' + observations['column']
+
+    catalog = [
+        catalog_entry(
+            cot_series_id(code, column), 'NASDAQ', 'commodities', 'cot_metals_energy', column,
+            dimensions={'commodity': COT_CONTRACTS[code]},
+            name=f"COT {COT_CONTRACTS[code]} {column}", frequency='Weekly', units='Contracts'
+        )
+        for code in rows['contract_code'].unique()
+        for column in _POSITION_COLUMNS
+    ]
+    return observations[['series_id', 'date', 'value']], catalog
+
+
+def _read_export(nasdaq_client, link: str):
+    return nasdaq_client.iter_export_csv(
+        link,
+        usecols=lambda column: column in _KEY_COLUMNS or column in COT_COLUMNS,
+        dtype={'contract_code': str, 'type': str, 'date': str}
+    )
+
+
+def _load_export(nasdaq_client, link: str) -> Tuple[int, int]:
+    """Stream an export (or delta insertions/updates) file through the observations store"""
+    counts = stream_observations(_read_export(nasdaq_client, link), cot_observations)
+    return counts.get(('commodities', 'cot_metals_energy'), (0, 0))
+
+
+def _apply_deletions(nasdaq_client, link: str) -> int:
+    """Delete the rows listed in a delta deletions file
+
+    Their observations get a new vintage (today) with a NULL value, so
+    earlier vintages stay queryable as of the dates they were known.
+    """
+    keys = pd.concat(
+        [_tracked(chunk)[['date', 'contract_code', 'commodity']] for chunk in _read_export(nasdaq_client, link)],
+        ignore_index=True
+    )
+    if keys.empty:
+        return 0
+
+    series = [(date, cot_series_id(code, column))
+              for date, code in zip(keys['date'], keys['contract_code'])
+              for column in _POSITION_COLUMNS]
+    hook = get_db_hook()
+    conn = hook.get_conn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                WITH latest AS (
+                    SELECT DISTINCT ON (o.series_id, o.date) o.series_id, o.date, o.value
+                    FROM metadata.observations o
+                    JOIN unnest(%s::date[], %s::text[]) AS k(date, series_id)
+                      ON o.date = k.date AND o.series_id = k.series_id
+                    ORDER BY o.series_id, o.date, o.vintage DESC
+                )
+                INSERT INTO metadata.observations (series_id, date, value, vintage)
+                SELECT series_id, date, NULL, CURRENT_DATE FROM latest WHERE value IS NOT NULL
+                ON CONFLICT (series_id, date, vintage) DO UPDATE SET value = EXCLUDED.value
+                RETURNING series_id
+                """,
+                ([date for date, _ in series], [series_id for _, series_id in series])
+            )
+            deleted_series = sorted({row[0] for row in cur.fetchall()})
+            if deleted_series:
+                cur.execute("SELECT metadata.refresh_latest_values(%s::text[])", (deleted_series,))
+            cur.execute(
+                """
+                DELETE FROM commodities.cot_metals_energy t
+                USING unnest(%s::date[], %s::text[]) AS k(date, commodity)
+                WHERE t.date = k.date AND t.commodity = k.commodity
+                """,
+                (keys['date'].tolist(), keys['commodity'].tolist())
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return len(keys)
+
+
+def _utc(timestamp) -> pd.Timestamp:
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_localize('UTC') if timestamp.tzinfo is None else timestamp.tz_convert('UTC')
+
+
+def _pending_deltas(nasdaq_client, snapshot: pd.Timestamp):
+    """Delta files published after snapshot, oldest first
+
+    Returns None when the deltas cannot bring the table up to date (the
+    listing failed, or the oldest delta still available starts after the
+    snapshot), in which case a full export is needed.
+    """
+    try:
+        files = nasdaq_client.get_delta_files(COT_DATATABLE).get('files') or []
+    except Exception as e:
+        print(f"Delta files for {COT_DATATABLE} unavailable ({e})")
+        return None
+
+    pending = sorted(
+        (file for file in files if _utc(file['to']) > snapshot),
+        key=lambda file: _utc(file['from'])
+    )
+    if pending and _utc(pending[0]['from']) > snapshot:
+        print(f"Delta files for {COT_DATATABLE} start at {pending[0]['from']}, after the last load at {snapshot}")
+        return None
+    return pending
+
+
+def load_cot_data(**context) -> Dict[str, int]:
+    """Load weekly COT positions of the tracked metals and energy contracts
+
+    The first run, and full refreshes, load the datatable's zipped bulk
+    export. Later runs apply only the delta files published since the last
+    loaded snapshot (metadata.bulk_exports), falling back to the full export
+    when the deltas do not reach back that far.
+    Returns {'inserted': n, 'updated': n, 'deleted': n}.
+    """
+    nasdaq_client = get_nasdaq_client()
+    snapshot = None if is_full_refresh(context) else get_export_snapshot(COT_DATATABLE)
+    deltas = _pending_deltas(nasdaq_client, snapshot) if snapshot is not None else None
+
+    totals = {'inserted': 0, 'updated': 0, 'deleted': 0}
+    try:
+        if deltas is None:
+            export = nasdaq_client.get_bulk_export(COT_DATATABLE)
+            print(f"Loading full export of {COT_DATATABLE} as of {export.get('data_snapshot_time')}")
+            totals['inserted'], totals['updated'] = _load_export(nasdaq_client, export['link'])
+            set_export_snapshot(COT_DATATABLE, export['data_snapshot_time'], 'full')
+        else:
+            print(f"Applying {len(deltas)} delta files of {COT_DATATABLE} since {snapshot}")
+            for delta in deltas:
+                if delta.get('deletions'):
+                    totals['deleted'] += _apply_deletions(nasdaq_client, delta['deletions'])
+                for kind in ('insertions', 'updates'):
+                    if delta.get(kind):
+                        inserted, updated = _load_export(nasdaq_client, delta[kind])
+                        totals['inserted'] += inserted
+                        totals['updated'] += updated
+                set_export_snapshot(COT_DATATABLE, delta['to'], 'delta')
+    except Exception as e:
+        log_update('commodities', 'cot_metals_energy', totals['inserted'], 'failed',
+                   records_updated=totals['updated'], error_message=str(e))
+        raise
+
+    status = 'success' if any(totals.values()) else 'no_data'
+    log_update('commodities', 'cot_metals_energy', totals['inserted'], status, records_updated=totals['updated'])
+    return totals
@@ -0,0 +1,55 @@
+"""
+Europe Economic Data Update Tasks
+"""
+
+from typing import Dict, List, Tuple
+import pandas as pd
+
+from api_clients import get_ecb_client
+from .streaming import stream_observations
+from .utils import catalog_entry, get_table_watermark, is_full_refresh, log_update, start_from_watermark
+
+
+def ecb_yield_observations(chunk: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Observations of a chunk of ECB yields and their europe.benchmark_yields_ecb catalog entries"""
+    series = chunk.drop_duplicates('series_id', keep='last')
+    catalog = [
+        catalog_entry(
+            row.series_id, 'ECB', 'europe', 'benchmark_yields_ecb', 'yield',
+            dimensions={'country': row.country, 'maturity': row.maturity, 'series_id': row.series_id},
+            units='Percent'
+        )
+        for row in series.itertuples(index=False)
+    ]
+    return chunk[['series_id', 'date']].assign(value=chunk['yield']), catalog
+
+
+def update_ecb_yields(**context):
+    """Update European government bond yields from the ECB
+
+    The SDMX-CSV panel is streamed through the observations store in chunks,
+    one series per ECB series key, starting REVISION_LOOKBACK_MONTHS before
+    the table's watermark.
+    """
+    ecb_client = get_ecb_client()
+
+    start_date = '1990-01-01'
+    if not is_full_refresh(context):
+        start_date = start_from_watermark(get_table_watermark('europe', 'benchmark_yields_ecb'), start_date)
+
+    try:
+        counts = stream_observations(
+            ecb_client.iter_benchmark_yields(start_date=start_date),
+            ecb_yield_observations
+        )
+    except Exception as e:
+        log_update('europe', 'benchmark_yields_ecb', 0, 'failed', error_message=str(e))
+        raise
+
+    inserted, updated = counts.get(('europe', 'benchmark_yields_ecb'), (0, 0))
+    if inserted or updated:
+        log_update('europe', 'benchmark_yields_ecb', inserted, 'success', records_updated=updated)
+        print(f"Updated ECB benchmark yields since {start_date}")
+    else:
+        log_update('europe', 'benchmark_yields_ecb', 0, 'no_data')
+        print("No new ECB benchmark yields")
@@ -0,0 +1,148 @@
+"""
+Global (multi-country) Economic Data Update Tasks
+"""
+
+from typing import Dict, List, Tuple
+import pandas as pd
+
+from api_clients import get_imf_client, get_world_bank_client
+from .utils import (
+    catalog_entry,
+    get_table_watermark,
+    is_full_refresh,
+    log_update,
+    start_from_watermark,
+    write_observations
+)
+
+
+# World Bank WDI indicators and the europe.global_gdp columns they fill
+GDP_INDICATORS: Dict[str, str] = {
+    'NY.GDP.MKTP.CD': 'gdp_current_usd',
+    'NY.GDP.MKTP.KD.ZG': 'gdp_growth_rate',
+    'NY.GDP.PCAP.CD': 'gdp_per_capita',
+}
+
+# G20 members, other large European economies and the EU aggregate (ISO2)
+GDP_COUNTRIES = [
+    'AR', 'AU', 'BR', 'CA', 'CN', 'DE', 'FR', 'GB', 'ID', 'IN', 'IT', 'JP', 'KR', 'MX',
+    'RU', 'SA', 'TR', 'US', 'ZA', 'AT', 'BE', 'CH', 'ES', 'GR', 'IE', 'NL', 'NO', 'PL',
+    'PT', 'SE', 'EU',
+]
+
+# series_id stored with the pivoted World Bank rows
+GDP_SERIES_ID = 'WB_WDI'
+
+# IMF Primary Commodity Prices (PCPS) codes and the names they are stored under
+IMF_COMMODITIES: Dict[str, str] = {
+    'PALUM': 'aluminum',
+    'PCOPP': 'copper',
+    'PIORECR': 'iron_ore',
+    'PNICK': 'nickel',
+    'PZINC': 'zinc',
+    'PGOLD': 'gold',
+    'PSILVER': 'silver',
+    'POILBRE': 'crude_oil_brent',
+    'POILWTI': 'crude_oil_wti',
+    'PNGASUS': 'natural_gas_us',
+    'PCOALAU': 'coal_australia',
+    'PWHEAMT': 'wheat',
+    'PMAIZMT': 'maize',
+    'PSOYB': 'soybeans',
+}
+
+
+def gdp_observations(observations: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Long World Bank observations as WB.<country>.<indicator> series, catalogued into europe.global_gdp
+
+    The indicators of a country fill the columns of one row per year.
+    """
+    pairs = observations[['country', 'indicator']].drop_duplicates()
+    catalog = [
+        catalog_entry(
+            f"WB.{country}.{indicator}", 'WORLD_BANK', 'europe', 'global_gdp', GDP_INDICATORS[indicator],
+            dimensions={'country': country, 'series_id': GDP_SERIES_ID}, frequency='Annual'
+        )
+        for country, indicator in pairs.itertuples(index=False)
+    ]
+    series = pd.DataFrame({
+        'series_id': 'WB.' + observations['country'] + '.' + observations['indicator'],
+        'date': observations['date'],
+        'value': observations['value'],
+    })
+    return series, catalog
+
+
+def imf_observations(observations: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict]]:
+    """IMF PCPS observations as IMF.PCPS.<code> series, catalogued into commodities.commodity_prices"""
+    units = observations.groupby('indicator')['unit'].first()
+    catalog = [
+        catalog_entry(
+            f"IMF.PCPS.{code}", 'IMF', 'commodities', 'commodity_prices', 'price',
+            dimensions={'commodity_name': IMF_COMMODITIES[code], 'price_type': 'monthly_average',
+                        'currency': 'USD', 'unit': unit},
+            name=IMF_COMMODITIES[code], frequency='Monthly', units=unit
+        )
+        for code, unit in units.items()
+    ]
+    series = pd.DataFrame({
+        'series_id': 'IMF.PCPS.' + observations['indicator'],
+        'date': observations['date'],
+        'value': observations['value'],
+    })
+    return series, catalog
+
+
+def update_global_gdp(**context):
+    """Update GDP level, growth and per-capita GDP for major economies from the World Bank"""
+    world_bank_client = get_world_bank_client()
+
+    # Annual figures are revised for years; always re-pull the last few
+    start_date = '1960-01-01'
+    if not is_full_refresh(context):
+        start_date = start_from_watermark(get_table_watermark('europe', 'global_gdp'), start_date, 36)
+
+    try:
+        observations = world_bank_client.get_indicators(
+            GDP_COUNTRIES, list(GDP_INDICATORS), start_year=pd.Timestamp(start_date).year
+        )
+        if observations.empty:
+            log_update('europe', 'global_gdp', 0, 'no_data')
+            print("No data available for global GDP")
+            return
+
+        counts = write_observations(*gdp_observations(observations))
+    except Exception as e:
+        log_update('europe', 'global_gdp', 0, 'failed', error_message=str(e))
+        raise
+
+    inserted, updated = counts.get(('europe', 'global_gdp'), (0, 0))
+    log_update('europe', 'global_gdp', inserted, 'success', records_updated=updated)
+    print(f"Updated global GDP for {observations['country'].nunique()} countries since {start_date[:4]}")
+
+
+def update_imf_commodity_prices(**context):
+    """Update monthly world commodity prices from the IMF Primary Commodity Price System"""
+    imf_client = get_imf_client()
+
+    start_date = '1990-01-01'
+    if not is_full_refresh(context):
+        start_date = start_from_watermark(get_table_watermark('commodities', 'commodity_prices'), start_date)
+
+    try:
+        observations = imf_client.get_compact_data(
+            'PCPS', 'M', ['W00'], list(IMF_COMMODITIES), suffix='USD', start_period=start_date[:7]
+        )
+        if observations.empty:
+            log_update('commodities', 'commodity_prices', 0, 'no_data')
+            print("No data available for IMF commodity prices")
+            return
+
+        counts = write_observations(*imf_observations(observations))
+    except Exception as e:
+        log_update('commodities', 'commodity_prices', 0, 'failed', error_message=str(e))
+        raise
+
+    inserted, updated = counts.get(('commodities', 'commodity_prices'), (0, 0))
+    log_update('commodities', 'commodity_prices', inserted, 'success', records_updated=updated)
+    print(f"Updated IMF prices for {observations['indicator'].nunique()} commodities since {start_date[:7]}")
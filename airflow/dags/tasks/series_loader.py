@@ -0,0 +1,468 @@
+"""
+Generic loader for the FRED, BLS and EIA series in the series registry
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import pandas as pd
+
+from api_clients import SeriesFetchError, get_bls_client, get_eia_client, get_fred_client
+from .series_registry import (
+    BLS_SERIES,
+    BLS_SERIES_BY_ID,
+    EIA_SERIES,
+    EIA_SERIES_BY_ID,
+    FRED_SERIES,
+    FRED_SERIES_BY_ID
+)
+from .streaming import stream_observations
+from .utils import (
+    add_counts,
+    catalog_entry,
+    get_changed_fred_series,
+    get_vintages_loaded,
+    get_watermarks,
+    is_full_refresh,
+    is_stream_mode,
+    is_vintage_mode,
+    log_update,
+    mark_fred_series_loaded,
+    mark_vintages_loaded,
+    start_from_watermark,
+    write_observations,
+    write_vintages
+)
+
+
+def _group_by_table(specs: List[Dict]) -> Dict[Tuple[str, str], List[Dict]]:
+    tables = {}
+    for spec in specs:
+        tables.setdefault((spec['schema'], spec['table']), []).append(spec)
+    return tables
+
+
+def series_catalog_entry(spec: Dict, source: str) -> Dict:
+    """Catalog entry projecting a registry series into its table's value_column"""
+    dimensions = dict(spec['constants'])
+    if spec.get('series_id_column', True):
+        dimensions['series_id'] = spec['series_id']
+    return catalog_entry(
+        spec['series_id'], source, spec['schema'], spec['table'], spec['value_column'],
+        dimensions=dimensions,
+        name=spec['name'],
+        frequency=spec['frequency']
+    )
+
+
+def observation_rows(spec: Dict, df: pd.DataFrame) -> pd.DataFrame:
+    """Shape a date/value frame into series_id/date/value observations of the spec's series"""
+    return df[['date', 'value']].assign(series_id=spec['series_id'])
+
+
+def _load_tables(specs: List[Dict], frames: Dict[str, pd.DataFrame], source: str,
+                 on_loaded: Optional[Callable[[List[Dict]], None]] = None) -> Tuple[Dict[str, int], List[str]]:
+    """Write fetched frames through the observations store, one write_observations per target table
+
+    on_loaded is called with the specs of each table that loaded. Returns
+    the insert/update totals and the tables that failed.
+    """
+    totals = {'inserted': 0, 'updated': 0}
+    failed = []
+    for (schema, table), table_specs in _group_by_table(specs).items():
+        loaded_specs = [spec for spec in table_specs if not frames[spec['series_id']].empty]
+        if not loaded_specs:
+            log_update(schema, table, 0, 'no_data')
+            print(f"No data available for {schema}.{table} from {source}")
+            continue
+
+        observations = pd.concat(
+            [observation_rows(spec, frames[spec['series_id']]) for spec in loaded_specs],
+            ignore_index=True
+        )
+        try:
+            counts = write_observations(
+                observations, [series_catalog_entry(spec, source) for spec in loaded_specs]
+            )
+        except Exception as e:
+            print(f"Error loading {schema}.{table}: {e}")
+            log_update(schema, table, 0, 'failed', error_message=str(e))
+            failed.append(f"{schema}.{table}")
+            continue
+
+        inserted, updated = counts.get((schema, table), (0, 0))
+        log_update(schema, table, inserted, 'success', records_updated=updated)
+        if on_loaded is not None:
+            on_loaded(loaded_specs)
+        totals['inserted'] += inserted
+        totals['updated'] += updated
+        for spec in loaded_specs:
+            print(f"Updated {len(frames[spec['series_id']])} records for {spec['name']}")
+
+    return totals, failed
+
+
+def watermark_key(spec: Dict) -> Tuple[str, str, str]:
+    """Key of the watermark projections keep for a registry series
+
+    Tables without a series_id column keep one watermark under series_id ''.
+    """
+    series_id = spec['series_id'] if spec.get('series_id_column', True) else ''
+    return spec['schema'], spec['table'], series_id
+
+
+def _start_dates(specs: List[Dict], full_refresh: bool) -> Dict[str, str]:
+    """First date to fetch per series: its watermark minus the revision window"""
+    watermarks = get_watermarks([watermark_key(spec) for spec in specs])
+    return {
+        spec['series_id']: spec['default_start'] if full_refresh else start_from_watermark(
+            watermarks[watermark_key(spec)],
+            spec['default_start'],
+            spec['lookback_months']
+        )
+        for spec in specs
+    }
+
+
+def stream_fred_series(spec: Dict, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                       fred_client=None) -> Tuple[int, int]:
+    """Stream one registry series into the observations store page by page with bounded memory"""
+    fred_client = fred_client or get_fred_client()
+    pages = fred_client.iter_series_pages(spec['series_id'], start_date=start_date, end_date=end_date)
+    counts = stream_observations(
+        pages,
+        lambda page: (observation_rows(spec, page), [series_catalog_entry(spec, 'FRED')])
+    )
+    return counts.get((spec['schema'], spec['table']), (0, 0))
+
+
+def _stream_tables(fred_client, specs: List[Dict], start_dates: Dict[str, str]) -> Dict[str, int]:
+    """Streaming counterpart of the batched fetch and load in load_fred_series"""
+    totals = {'inserted': 0, 'updated': 0}
+    failed = []
+    for (schema, table), table_specs in _group_by_table(specs).items():
+        inserted = updated = 0
+        try:
+            for spec in table_specs:
+                series_inserted, series_updated = stream_fred_series(
+                    spec, start_dates[spec['series_id']], fred_client=fred_client
+                )
+                inserted += series_inserted
+                updated += series_updated
+        except Exception as e:
+            print(f"Error streaming {schema}.{table}: {e}")
+            log_update(schema, table, inserted, 'failed', records_updated=updated, error_message=str(e))
+            failed.append(f"{schema}.{table}")
+            continue
+
+        log_update(schema, table, inserted, 'success' if inserted or updated else 'no_data',
+                   records_updated=updated)
+        mark_fred_series_loaded([spec['series_id'] for spec in table_specs])
+        totals['inserted'] += inserted
+        totals['updated'] += updated
+
+    if failed:
+        raise RuntimeError(f"FRED load failed for {', '.join(failed)}")
+    return totals
+
+
+def load_fred_vintages(specs: List[Dict], full_refresh: bool, fred_client=None) -> Dict[str, int]:
+    """Load registry series with their ALFRED vintage history, one series at a time
+
+    Each series is paged from ALFRED by real-time period, starting where its
+    vintages were last loaded (all of them on the first run or a full
+    refresh), and streamed through write_vintages, so revised values are
+    kept next to the values they replaced. A series' vintages are marked
+    loaded only once every one of its pages is written, so a failed series
+    is fetched from its previous mark again on the next run.
+    """
+    fred_client = fred_client or get_fred_client()
+    ids = [spec['series_id'] for spec in specs]
+    loaded_through = {} if full_refresh else get_vintages_loaded(ids)
+    today = pd.Timestamp.today().strftime('%Y-%m-%d')
+
+    totals = {'inserted': 0, 'updated': 0}
+    failed = []
+    for (schema, table), table_specs in _group_by_table(specs).items():
+        inserted = updated = 0
+        errors = []
+        for spec in table_specs:
+            try:
+                pages = fred_client.iter_vintage_pages(spec['series_id'], loaded_through.get(spec['series_id']))
+                counts = stream_observations(
+                    pages,
+                    lambda page, spec=spec: (
+                        page.rename(columns={'realtime_start': 'vintage'}).assign(series_id=spec['series_id']),
+                        [series_catalog_entry(spec, 'FRED')]
+                    ),
+                    write=write_vintages
+                )
+            except Exception as e:
+                print(f"Error loading vintages of {spec['series_id']}: {e}")
+                errors.append(f"{spec['series_id']}: {e}")
+                failed.append(spec['series_id'])
+                continue
+
+            mark_vintages_loaded([spec['series_id']], today)
+            series_inserted, series_updated = counts.get((schema, table), (0, 0))
+            inserted += series_inserted
+            updated += series_updated
+
+        if errors:
+            log_update(schema, table, inserted, 'failed', records_updated=updated, error_message='; '.join(errors))
+        else:
+            log_update(schema, table, inserted, 'success', records_updated=updated)
+        totals['inserted'] += inserted
+        totals['updated'] += updated
+
+    if failed:
+        raise RuntimeError(f"FRED vintage load failed for {', '.join(failed)}")
+    return totals
+
+
+def load_fred_series(series_ids: Optional[List[str]] = None, **context) -> Dict[str, int]:
+    """Fetch registry series from FRED concurrently and bulk load them per table
+
+    series_ids defaults to every series in FRED_SERIES. Series unchanged
+    upstream since their last load are skipped, the rest are fetched in
+    one concurrent batch from their watermarks, and each target table is
+    loaded with a single write_observations. In stream mode (is_stream_mode)
+    each series is instead paged through stream_observations with bounded
+    memory; in vintage mode (is_vintage_mode) load_fred_vintages loads their
+    ALFRED history instead. A failing table or series fetch does not stop
+    the others; the task fails at the end if any of them failed.
+    Returns {'inserted': n, 'updated': n}.
+    """
+    specs = [FRED_SERIES_BY_ID[series_id] for series_id in series_ids] if series_ids else FRED_SERIES
+    fred_client = get_fred_client()
+    full_refresh = is_full_refresh(context)
+
+    if is_vintage_mode(context):
+        return load_fred_vintages(specs, full_refresh, fred_client)
+
+    ids = [spec['series_id'] for spec in specs]
+    if not full_refresh:
+        changed = get_changed_fred_series(fred_client, ids)
+        for (schema, table), table_specs in _group_by_table(specs).items():
+            if not any(spec['series_id'] in changed for spec in table_specs):
+                log_update(schema, table, 0, 'unchanged')
+        specs = [spec for spec in specs if spec['series_id'] in changed]
+        if not specs:
+            print("All FRED series unchanged since last load")
+            return {'inserted': 0, 'updated': 0}
+
+    start_dates = _start_dates(specs, full_refresh)
+
+    if is_stream_mode(context):
+        return _stream_tables(fred_client, specs, start_dates)
+
+    try:
+        frames = fred_client.get_many_series(
+            [spec['series_id'] for spec in specs],
+            start_dates=start_dates,
+            if_changed=not full_refresh
+        )
+        errors = {}
+    except SeriesFetchError as e:
+        frames, errors = e.results, e.errors
+
+    totals, failed = _load_tables(
+        [spec for spec in specs if spec['series_id'] in frames], frames, 'FRED',
+        on_loaded=lambda loaded_specs: mark_fred_series_loaded([spec['series_id'] for spec in loaded_specs])
+    )
+    for spec in specs:
+        if spec['series_id'] in errors:
+            log_update(spec['schema'], spec['table'], 0, 'failed',
+                       error_message=f"{spec['series_id']}: {errors[spec['series_id']]}")
+            failed.append(spec['series_id'])
+
+    if failed:
+        # Leave every fetched response unconfirmed so a retry reloads it
+        raise RuntimeError(f"FRED load failed for {', '.join(failed)}")
+
+    fred_client.confirm_loaded()
+    print(f"FRED cache stats: {fred_client.cache_stats()}")
+    return totals
+
+
+def load_bls_series(series_ids: Optional[List[str]] = None, **context) -> Dict[str, int]:
+    """Fetch registry BLS series in a few batched requests and bulk load them per table
+
+    series_ids defaults to every series in BLS_SERIES. All series are
+    requested together from the earliest year any of them needs, and each
+    target table is loaded with a single write_observations.
+    Returns {'inserted': n, 'updated': n}.
+    """
+    specs = [BLS_SERIES_BY_ID[series_id] for series_id in series_ids] if series_ids else BLS_SERIES
+    bls_client = get_bls_client()
+
+    start_dates = _start_dates(specs, is_full_refresh(context))
+    start_year = min(pd.Timestamp(start).year for start in start_dates.values())
+    data = bls_client.get_many_series([spec['series_id'] for spec in specs], start_year=start_year)
+
+    frames = {}
+    for spec in specs:
+        series = data[data['series_id'] == spec['series_id']]
+        frames[spec['series_id']] = series.loc[series['date'] >= start_dates[spec['series_id']], ['date', 'value']]
+
+    totals, failed = _load_tables(specs, frames, 'BLS')
+    if failed:
+        raise RuntimeError(f"BLS load failed for {', '.join(failed)}")
+    return totals
+
+
+def _is_flow(spec: Dict) -> bool:
+    return spec.get('factor') in ('demand', 'supply')
+
+
+def _demand_supply_catalog(observations: pd.DataFrame, row_units: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """Catalog entries projecting factor series into commodities.demand_supply_factors
+
+    The series of one commodity fill one row per date, so they share its
+    dimensions. Flows and stocks share a unit family (e.g. MBBL/D and MBBL);
+    the row records the flow unit, or the stock unit for commodities without
+    flow series. row_units fixes the row unit of commodities whose flow
+    series are not in observations.
+    """
+    specs = [EIA_SERIES_BY_ID[series_id] for series_id in observations['series_id'].unique()]
+    series_units = observations.groupby('series_id')['unit'].first()
+    units = pd.DataFrame({
+        'commodity': [spec['commodity'] for spec in specs],
+        'is_flow': [_is_flow(spec) for spec in specs],
+        'unit': [series_units[spec['series_id']] for spec in specs],
+    }).sort_values('is_flow', ascending=False, kind='stable').groupby('commodity')['unit'].first().to_dict()
+    units.update(row_units or {})
+
+    return [
+        catalog_entry(
+            spec['series_id'], 'EIA', 'commodities', 'demand_supply_factors', spec['factor'],
+            dimensions={'commodity': spec['commodity'], 'unit': units[spec['commodity']]},
+            name=spec['name'], frequency=spec['frequency'], units=series_units[spec['series_id']]
+        )
+        for spec in specs
+    ]
+
+
+def _summary_observations(page: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Observations of a chunk of EIA data and their commodities.eia_summary catalog entries"""
+    units = page.groupby('series_id')['unit'].first()
+    catalog = []
+    for series_id, unit in units.items():
+        spec = EIA_SERIES_BY_ID[series_id]
+        catalog.append(catalog_entry(
+            series_id, 'EIA', 'commodities', 'eia_summary', 'value',
+            dimensions={'series_id': series_id, 'product': spec['name'], 'unit': unit,
+                        'frequency': spec['frequency']},
+            name=spec['name'], frequency=spec['frequency'], units=unit
+        ))
+    return page[['series_id', 'date', 'value']], catalog
+
+
+def eia_observations(page: pd.DataFrame, row_units: Optional[Dict[str, str]] = None) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Observations of EIA data rows with their eia_summary and demand_supply_factors catalog entries
+
+    row_units fixes the demand_supply_factors row unit per commodity, as in
+    _demand_supply_catalog.
+    """
+    observations, catalog = _summary_observations(page)
+    factors = page[page['series_id'].map(lambda series_id: bool(EIA_SERIES_BY_ID[series_id].get('factor')))]
+    if not factors.empty:
+        catalog = catalog + _demand_supply_catalog(factors, row_units)
+    return observations, catalog
+
+
+class _EIAObservations:
+    """to_observations for stream_observations: each chunk's eia_summary and demand_supply_factors entries
+
+    A commodity's demand_supply_factors row records its flow unit, which every
+    chunk must agree on. Its factor rows are therefore held back until a chunk
+    carries one of its flow series; commodities without flow series in specs
+    are written at once. held() returns what is still held once the stream ends.
+    """
+
+    def __init__(self, specs: List[Dict]):
+        self.factor_ids = [spec['series_id'] for spec in specs if spec.get('factor')]
+        self.flow_commodities = {spec['commodity'] for spec in specs if _is_flow(spec)}
+        self.flow_units: Dict[str, str] = {}
+        self._held = pd.DataFrame()
+
+    def __call__(self, chunk: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict]]:
+        observations, catalog = _summary_observations(chunk)
+        held = self._held
+        factors = pd.concat([held, chunk[chunk['series_id'].isin(self.factor_ids)]], ignore_index=True)
+        if factors.empty:
+            return observations, catalog
+
+        specs = factors['series_id'].map(EIA_SERIES_BY_ID)
+        flows = specs.map(_is_flow)
+        commodities = specs.map(lambda spec: spec['commodity'])
+        for commodity, unit in zip(commodities[flows], factors.loc[flows, 'unit']):
+            self.flow_units.setdefault(commodity, unit)
+        ready = ~commodities.isin(self.flow_commodities - set(self.flow_units))
+        self._held = factors[~ready]
+
+        if ready.any():
+            catalog = catalog + _demand_supply_catalog(factors[ready], self.flow_units)
+            # Released rows of earlier chunks are written again so their dates
+            # are projected into demand_supply_factors with the new catalog entries
+            released = factors[ready & (factors.index < len(held))]
+            observations = pd.concat([observations, released[['series_id', 'date', 'value']]], ignore_index=True)
+        return observations, catalog
+
+    def held(self) -> pd.DataFrame:
+        return self._held
+
+
+def load_eia_series(series_ids: Optional[List[str]] = None, **context) -> Dict[str, int]:
+    """Stream registry EIA series into commodities.eia_summary and commodities.demand_supply_factors
+
+    series_ids defaults to every series in EIA_SERIES. Series published under
+    the same route are requested together from the earliest start any of them
+    needs; their pages are fetched concurrently and written through the
+    observations store while the download is still running. The factor series
+    are also catalogued into demand_supply_factors, one row per date and
+    commodity, in the same stream (see _EIAObservations).
+    Returns {'inserted': n, 'updated': n}.
+    """
+    specs = [EIA_SERIES_BY_ID[series_id] for series_id in series_ids] if series_ids else EIA_SERIES
+    eia_client = get_eia_client()
+    start_dates = _start_dates(specs, is_full_refresh(context))
+
+    queries = {}
+    for spec in specs:
+        queries.setdefault((spec['route'], spec['frequency']), []).append(spec['series_id'])
+
+    fetched = []
+
+    def pages():
+        for (route, frequency), query_ids in queries.items():
+            start = min(start_dates[series_id] for series_id in query_ids)
+            for page in eia_client.iter_data(route, query_ids, frequency, start=start):
+                fetched.append(len(page))
+                yield page
+
+    tables = ['eia_summary', 'demand_supply_factors']
+    to_observations = _EIAObservations(specs)
+    counts = {}
+    try:
+        add_counts(counts, stream_observations(pages(), to_observations))
+        held = to_observations.held()
+        if not held.empty:
+            # Commodities whose flow series returned no data: rows take the stock unit
+            add_counts(counts, write_observations(held[['series_id', 'date', 'value']], _demand_supply_catalog(held)))
+    except Exception as e:
+        for table in tables:
+            log_update('commodities', table, 0, 'failed', error_message=str(e))
+        raise
+
+    totals = {'inserted': 0, 'updated': 0}
+    for table in tables:
+        inserted, updated = counts.get(('commodities', table), (0, 0))
+        log_update('commodities', table, inserted, 'success' if sum(fetched) else 'no_data',
+                   records_updated=updated)
+        totals['inserted'] += inserted
+        totals['updated'] += updated
+    return totals
+
+
+def update_fred_series(series_ids: Optional[List[str]] = None, **context):
+    """Update a batch of registry FRED series, or all of them"""
+    return load_fred_series(series_ids, **context)
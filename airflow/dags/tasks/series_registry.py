@@ -0,0 +1,526 @@
+"""
+Registry of FRED-, BLS- and EIA-backed series and the tables they load into
+
+Each spec is a plain dict so it can be passed through XCom and task mapping:
+
+    series_id         Source series ID
+    name              Label used in logs
+    schema, table     Target table
+    value_column      Column that receives the observation value
+    constants         Extra columns with a fixed value for every row; every
+                      primary key column other than date and series_id
+                      needs one
+    conflict_columns  Primary key of the target table
+    series_id_column  False for tables without a series_id column
+                      (default True: series_id is written with each row)
+    default_start     First date fetched when the table has no rows for the series
+    lookback_months   Revision window re-fetched before the watermark
+                      (None uses REVISION_LOOKBACK_MONTHS)
+    frequency         Publication frequency of the series
+
+EIA specs replace value_column, constants and conflict_columns with:
+
+    route             v2 API data route the series is published under
+    commodity, factor Row and column of commodities.demand_supply_factors
+                      the series fills (demand, supply, inventory or
+                      capacity_utilization)
+
+Adding a series is a matter of adding an entry here.
+"""
+
+from typing import Dict, List
+
+
+FRED_SERIES: List[Dict] = [
+    # China
+    {
+        'series_id': 'CHNPMI',
+        'name': 'China Manufacturing PMI',
+        'schema': 'china',
+        'table': 'manufacturing_pmi',
+        'value_column': 'pmi_value',
+        'constants': {'source': 'FRED'},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '1900-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'IRSTCI01CNM156N',  # Interbank overnight rate
+        'name': 'China Interbank Rate',
+        'schema': 'china',
+        'table': 'real_rates',
+        'value_column': 'nominal_rate',
+        'constants': {'source': 'FRED'},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '1900-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'CHNCPALTT01IXOBM',
+        'name': 'China Consumer Price Index',
+        'schema': 'china',
+        'table': 'consumer_price_index',
+        'value_column': 'cpi_value',
+        'constants': {'source': 'FRED'},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '1900-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+
+    # Coincident indicators
+    {
+        'series_id': 'DGORDER',  # Manufacturers' New Orders: Durable Goods
+        'name': 'Durable Goods Shipments',
+        'schema': 'coincident_indicators',
+        'table': 'durable_goods_shipments',
+        'value_column': 'value',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'PAYEMS',  # All Employees, Total Nonfarm
+        'name': 'Employment Data',
+        'schema': 'coincident_indicators',
+        'table': 'employment_situation',
+        'value_column': 'total_nonfarm_payroll',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'INDPRO',  # Industrial Production Index
+        'name': 'Industrial Production',
+        'schema': 'coincident_indicators',
+        'table': 'industrial_production',
+        'value_column': 'index_value',
+        'constants': {'industry_category': 'Total', 'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id', 'industry_category'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'ICSA',  # Initial Claims
+        'name': 'Jobless Claims',
+        'schema': 'coincident_indicators',
+        'table': 'jobless_claims',
+        'value_column': 'initial_claims',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Weekly',
+    },
+
+    # Commodities
+    {
+        'series_id': 'GOLDAMGBD228NLBM',  # Gold Price
+        'name': 'Gold Price',
+        'schema': 'commodities',
+        'table': 'commodity_prices',
+        'value_column': 'price',
+        'constants': {'commodity_name': 'gold', 'price_type': 'london_am_fix', 'currency': 'USD',
+                      'unit': 'USD per troy ounce'},
+        'conflict_columns': ['date', 'commodity_name', 'price_type'],
+        'series_id_column': False,
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Daily',
+    },
+
+    # Fixed income
+    {
+        'series_id': 'DGS10',  # 10-Year Treasury Constant Maturity Rate
+        'name': '10-Year Treasury Yield',
+        'schema': 'fixed_income',
+        'table': 'benchmark_yields',
+        'value_column': 'yield',
+        'constants': {'country': 'US', 'maturity': '10Y', 'source': 'FRED'},
+        'conflict_columns': ['date', 'country', 'maturity', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Daily',
+    },
+
+    # General macro
+    {
+        'series_id': 'CPIAUCSL',  # Consumer Price Index for All Urban Consumers
+        'name': 'CPI',
+        'schema': 'general_macro',
+        'table': 'inflation',
+        'value_column': 'cpi_all_items',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'PERMIT',  # New Private Housing Units Authorized by Building Permits
+        'name': 'Building Permits',
+        'schema': 'general_macro',
+        'table': 'building_permits',
+        'value_column': 'total_permits',
+        'constants': {'region': 'US', 'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id', 'region'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'M2SL',  # M2 Money Stock
+        'name': 'M2 Money Supply',
+        'schema': 'general_macro',
+        'table': 'm2_money_supply',
+        'value_column': 'm2_value',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'DTWEXBGS',  # Trade Weighted U.S. Dollar Index
+        'name': 'USD Index',
+        'schema': 'general_macro',
+        'table': 'usd_trade_weighted',
+        'value_column': 'broad_index',
+        'constants': {},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Daily',
+    },
+
+    # Survey data
+    {
+        'series_id': 'NAPM',  # ISM Manufacturing PMI
+        'name': 'ISM Manufacturing PMI',
+        'schema': 'survey_data',
+        'table': 'ism_manufacturing',
+        'value_column': 'pmi',
+        'constants': {},
+        'conflict_columns': ['date'],
+        'series_id_column': False,
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'NONREVSL',  # ISM Non-Manufacturing PMI
+        'name': 'ISM Non-Manufacturing PMI',
+        'schema': 'survey_data',
+        'table': 'ism_non_manufacturing',
+        'value_column': 'nmi',
+        'constants': {},
+        'conflict_columns': ['date'],
+        'series_id_column': False,
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'NFIB',  # NFIB Small Business Optimism Index
+        'name': 'NFIB Small Business Optimism',
+        'schema': 'survey_data',
+        'table': 'nfib_optimism',
+        'value_column': 'optimism_index',
+        'constants': {'region': 'US', 'industry': 'All'},
+        'conflict_columns': ['date', 'region', 'industry'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'UMCSENT',  # University of Michigan: Consumer Sentiment
+        'name': 'UMCSI Consumer Sentiment',
+        'schema': 'survey_data',
+        'table': 'umcsi',
+        'value_column': 'sentiment_index',
+        'constants': {},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': 0,
+        'frequency': 'Monthly',
+    },
+]
+
+FRED_SERIES_BY_ID: Dict[str, Dict] = {spec['series_id']: spec for spec in FRED_SERIES}
+
+
+# BLS series, same spec shape; each series is its own row keyed by (date, series_id)
+BLS_SERIES: List[Dict] = [
+    # Employment Situation
+    {
+        'series_id': 'CES0000000001',  # All employees, total nonfarm (thousands)
+        'name': 'Total Nonfarm Payroll',
+        'schema': 'coincident_indicators',
+        'table': 'employment_situation',
+        'value_column': 'total_nonfarm_payroll',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'LNS14000000',
+        'name': 'Unemployment Rate',
+        'schema': 'coincident_indicators',
+        'table': 'employment_situation',
+        'value_column': 'unemployment_rate',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'LNS11300000',
+        'name': 'Labor Force Participation Rate',
+        'schema': 'coincident_indicators',
+        'table': 'employment_situation',
+        'value_column': 'labor_force_participation_rate',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'CES0500000003',  # Total private
+        'name': 'Average Hourly Earnings',
+        'schema': 'coincident_indicators',
+        'table': 'employment_situation',
+        'value_column': 'average_hourly_earnings',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'CES0500000002',  # Total private
+        'name': 'Average Weekly Hours',
+        'schema': 'coincident_indicators',
+        'table': 'employment_situation',
+        'value_column': 'average_weekly_hours',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+
+    # Inflation
+    {
+        'series_id': 'CUSR0000SA0',
+        'name': 'CPI-U All Items',
+        'schema': 'general_macro',
+        'table': 'inflation',
+        'value_column': 'cpi_all_items',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'CUSR0000SA0L1E',  # All items less food and energy
+        'name': 'CPI-U Core',
+        'schema': 'general_macro',
+        'table': 'inflation',
+        'value_column': 'cpi_core',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'WPU00000000',
+        'name': 'PPI All Commodities',
+        'schema': 'general_macro',
+        'table': 'inflation',
+        'value_column': 'ppi_all_commodities',
+        'constants': {'seasonally_adjusted': False},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+    {
+        'series_id': 'WPSFD49116',  # Final demand less foods and energy
+        'name': 'PPI Core',
+        'schema': 'general_macro',
+        'table': 'inflation',
+        'value_column': 'ppi_core',
+        'constants': {'seasonally_adjusted': True},
+        'conflict_columns': ['date', 'series_id'],
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+        'frequency': 'Monthly',
+    },
+]
+
+BLS_SERIES_BY_ID: Dict[str, Dict] = {spec['series_id']: spec for spec in BLS_SERIES}
+
+
+# EIA v2 series: every series is loaded into commodities.eia_summary; those with
+# a commodity and factor also fill that column of commodities.demand_supply_factors
+EIA_SERIES: List[Dict] = [
+    {
+        'series_id': 'WCRFPUS2',
+        'name': 'Crude Oil Field Production',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'crude_oil',
+        'factor': 'supply',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'WRPUPUS2',
+        'name': 'Product Supplied of Petroleum Products',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'crude_oil',
+        'factor': 'demand',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'WCESTUS1',
+        'name': 'Crude Oil Ending Stocks excl. SPR',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'crude_oil',
+        'factor': 'inventory',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'WPULEUS3',
+        'name': 'Refinery Utilization Rate',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'crude_oil',
+        'factor': 'capacity_utilization',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'WGFRPUS2',
+        'name': 'Finished Motor Gasoline Refiner Production',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'gasoline',
+        'factor': 'supply',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'WGFUPUS2',
+        'name': 'Finished Motor Gasoline Product Supplied',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'gasoline',
+        'factor': 'demand',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'WGTSTUS1',
+        'name': 'Total Gasoline Ending Stocks',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'gasoline',
+        'factor': 'inventory',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'WDIRPUS2',
+        'name': 'Distillate Fuel Oil Refiner Production',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'distillate',
+        'factor': 'supply',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'WDIUPUS2',
+        'name': 'Distillate Fuel Oil Product Supplied',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'distillate',
+        'factor': 'demand',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'WDISTUS1',
+        'name': 'Distillate Fuel Oil Ending Stocks',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'petroleum/sum/sndw',
+        'frequency': 'weekly',
+        'commodity': 'distillate',
+        'factor': 'inventory',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+    {
+        'series_id': 'NW2_EPG0_SWO_R48_BCF',
+        'name': 'Natural Gas Working Storage, Lower 48',
+        'schema': 'commodities',
+        'table': 'eia_summary',
+        'route': 'natural-gas/stor/wkly',
+        'frequency': 'weekly',
+        'commodity': 'natural_gas',
+        'factor': 'inventory',
+        'default_start': '2010-01-01',
+        'lookback_months': None,
+    },
+]
+
+EIA_SERIES_BY_ID: Dict[str, Dict] = {spec['series_id']: spec for spec in EIA_SERIES}
+
+
+def batch_fred_series(batch_size: int) -> List[List[str]]:
+    """Split FRED_SERIES into batches of at most batch_size series IDs
+
+    Series are ordered by target table first so that a table's series tend to
+    land in the same batch and are loaded with one statement.
+    """
+    batch_size = max(1, batch_size)
+    ordered = sorted(FRED_SERIES, key=lambda spec: (spec['schema'], spec['table']))
+    series_ids = [spec['series_id'] for spec in ordered]
+    return [series_ids[i:i + batch_size] for i in range(0, len(series_ids), batch_size)]
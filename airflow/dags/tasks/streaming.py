@@ -0,0 +1,120 @@
+"""
+Streaming fetch -> parse -> load pipeline with bounded memory
+"""
+
+import os
+import queue
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import pandas as pd
+
+from .utils import add_counts, write_observations
+
+
+# Marks the end of the producer's batches on the queue
+_DONE = object()
+
+
+def _put(out: queue.Queue, item, stop: threading.Event) -> bool:
+    """Block until item is queued or the consumer has stopped"""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(batches: Iterable[pd.DataFrame], out: queue.Queue, stop: threading.Event):
+    """Drive the fetch/parse generator, handing each batch to the loader"""
+    try:
+        for batch in batches:
+            if not _put(out, batch, stop):
+                return
+    except Exception as e:
+        _put(out, e, stop)
+    finally:
+        _put(out, _DONE, stop)
+
+
+def _consume(out: queue.Queue) -> Iterator[pd.DataFrame]:
+    while True:
+        item = out.get()
+        if item is _DONE:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def rechunk(batches: Iterable[pd.DataFrame], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Regroup frames of any size into frames of exactly chunk_rows rows (the last may be shorter)"""
+    pending: List[pd.DataFrame] = []
+    rows = 0
+    for batch in batches:
+        if batch.empty:
+            continue
+        pending.append(batch)
+        rows += len(batch)
+        while rows >= chunk_rows:
+            combined = pd.concat(pending, ignore_index=True)
+            yield combined.iloc[:chunk_rows]
+            rest = combined.iloc[chunk_rows:]
+            pending, rows = ([rest] if len(rest) else []), len(rest)
+    if pending:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def _run_stream(name: str, batches: Iterable[pd.DataFrame], flush: Callable[[pd.DataFrame], None],
+                chunk_rows: Optional[int], queue_size: Optional[int]) -> int:
+    """Drive batches in a producer thread and flush them in chunks; returns the chunk count"""
+    chunk_rows = chunk_rows or int(os.getenv('STREAM_CHUNK_ROWS', 50000))
+    queue_size = queue_size or int(os.getenv('STREAM_QUEUE_SIZE', 4))
+
+    out: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_produce, args=(batches, out, stop),
+        name=f"stream-{name}", daemon=True
+    )
+    producer.start()
+
+    chunks = 0
+    try:
+        for chunk in rechunk(_consume(out), chunk_rows):
+            flush(chunk)
+            chunks += 1
+    finally:
+        stop.set()
+        producer.join()
+    return chunks
+
+
+def stream_observations(batches: Iterable[pd.DataFrame],
+                        to_observations: Callable[[pd.DataFrame], Tuple[pd.DataFrame, List[Dict]]],
+                        chunk_rows: Optional[int] = None,
+                        queue_size: Optional[int] = None,
+                        write: Callable = write_observations) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """Stream source-shaped batches through write_observations in fixed-size chunks
+
+    batches is typically a generator that fetches and parses one page at a
+    time. It runs in a producer thread while this thread flushes chunks of
+    chunk_rows (STREAM_CHUNK_ROWS, default 50000). The queue between them
+    holds at most queue_size (STREAM_QUEUE_SIZE, default 4) batches, so
+    fetching pauses whenever loading falls behind and memory stays bounded
+    however much history is pulled. to_observations turns each chunk into its
+    series_id/date/value observations and the catalog entries of its series,
+    and each chunk is committed on its own. write may be write_vintages for
+    frames that carry a vintage column.
+    Returns {(schema, table): (rows_inserted, rows_updated)} summed over chunks.
+    """
+    totals: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+    def flush(chunk: pd.DataFrame):
+        observations, catalog = to_observations(chunk)
+        add_counts(totals, write(observations, catalog))
+
+    chunks = _run_stream('observations', batches, flush, chunk_rows, queue_size)
+    print(f"Streamed {chunks} chunks of observations into {len(totals)} tables")
+    return totals
@@ -2,8 +2,21 @@
 Utility functions for economic data tasks
 """
 
+import io
+import os
+import json
 from airflow.providers.postgres.hooks.postgres import PostgresHook
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+
+# Integer columns are staged as NUMERIC so COPY accepts float-formatted values
+# (e.g. "224000.0"); the INSERT's assignment cast rounds them like a plain INSERT would
+_STAGING_TYPE_OVERRIDES = {
+    'smallint': 'numeric',
+    'integer': 'numeric',
+    'bigint': 'numeric',
+}
 
 
 def get_db_hook() -> PostgresHook:
@@ -11,19 +24,620 @@ def get_db_hook() -> PostgresHook:
     return PostgresHook(postgres_conn_id='timescaledb_conn')
 
 
-def get_last_date(schema: str, table: str, series_id: str) -> Optional[str]:
-    """Get the last date for a specific series in a table"""
+def _fetch_watermarks(cur, keys: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], Optional[str]]:
+    cur.execute(
+        """
+        SELECT w.schema_name, w.table_name, w.series_id, w.last_date
+        FROM metadata.series_watermarks w
+        JOIN unnest(%s::text[], %s::text[], %s::text[]) AS k(schema_name, table_name, series_id)
+          USING (schema_name, table_name, series_id)
+        """,
+        ([k[0] for k in keys], [k[1] for k in keys], [k[2] for k in keys])
+    )
+    return {
+        (schema, table, series_id): last_date.strftime('%Y-%m-%d') if last_date else None
+        for schema, table, series_id, last_date in cur.fetchall()
+    }
+
+
+def get_watermarks(keys: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], Optional[str]]:
+    """Last loaded date for many (schema, table, series_id) keys in one query
+
+    Watermarks are read from metadata.series_watermarks, which
+    metadata.project_observations advances with every load. Keys missing there are rebuilt from their hypertables with
+    metadata.rebuild_series_watermarks, and series with no rows at all are
+    recorded empty so the rebuild is not repeated. Tables without a series_id
+    column keep their watermark under series_id ''; other keys into them are
+    not recorded. Returns None for empty series.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+
     hook = get_db_hook()
-    
-    query = f"SELECT MAX(date) FROM {schema}.{table} WHERE series_id = %s"
-    result = hook.get_first(query, parameters=(series_id,))
-    
-    if result and result[0]:
-        return result[0].strftime('%Y-%m-%d')
-    
-    return None
+    conn = hook.get_conn()
+    try:
+        with conn.cursor() as cur:
+            watermarks = _fetch_watermarks(cur, keys)
+            missing = [key for key in keys if key not in watermarks]
+            if missing:
+                for schema, table in sorted({(key[0], key[1]) for key in missing}):
+                    print(f"Rebuilding watermarks for {schema}.{table} from the hypertable")
+                    cur.execute("SELECT metadata.rebuild_series_watermarks(%s, %s)", (schema, table))
+                cur.execute(
+                    """
+                    INSERT INTO metadata.series_watermarks (schema_name, table_name, series_id, row_count)
+                    SELECT k.*, 0
+                    FROM unnest(%s::text[], %s::text[], %s::text[]) AS k(schema_name, table_name, series_id)
+                    WHERE k.series_id = '' OR EXISTS (
+                        SELECT 1 FROM information_schema.columns c
+                        WHERE c.table_schema = k.schema_name AND c.table_name = k.table_name
+                          AND c.column_name = 'series_id'
+                    )
+                    ON CONFLICT (schema_name, table_name, series_id) DO NOTHING
+                    """,
+                    ([k[0] for k in missing], [k[1] for k in missing], [k[2] for k in missing])
+                )
+                conn.commit()
+                watermarks = _fetch_watermarks(cur, keys)
+    finally:
+        conn.close()
+
+    return {key: watermarks.get(key) for key in keys}
+
+
+def get_table_watermark(schema: str, table: str) -> Optional[str]:
+    """Latest loaded date across all series of a table, for sources without a fixed series list"""
+    hook = get_db_hook()
+    query = """
+        SELECT MAX(last_date) FROM metadata.series_watermarks
+        WHERE schema_name = %s AND table_name = %s
+    """
+    row = hook.get_first(query, parameters=(schema, table))
+    if row is None or row[0] is None:
+        hook.run("SELECT metadata.rebuild_series_watermarks(%s, %s)", parameters=(schema, table))
+        row = hook.get_first(query, parameters=(schema, table))
+    return row[0].strftime('%Y-%m-%d') if row and row[0] else None
+
+
+def is_full_refresh(context: Dict) -> bool:
+    """Whether this run should re-pull full history instead of an incremental window
+
+    A full refresh is triggered with dag_run.conf {"full_refresh": true} or on
+    the FULL_REFRESH_DAY_OF_MONTH (default 1st, 0 disables) of the logical date.
+    """
+    dag_run = context.get('dag_run')
+    if dag_run is not None and (dag_run.conf or {}).get('full_refresh'):
+        return True
+
+    refresh_day = int(os.getenv('FULL_REFRESH_DAY_OF_MONTH', 1))
+    logical_date = context.get('logical_date')
+    return bool(refresh_day) and logical_date is not None and logical_date.day == refresh_day
+
+
+def is_stream_mode(context: Dict) -> bool:
+    """Whether loads should stream page by page instead of materializing whole series
+
+    Enabled with dag_run.conf {"stream": true} or STREAM_LOADS=true; meant for
+    large backfills where memory, not request count, is the constraint.
+    """
+    dag_run = context.get('dag_run')
+    if dag_run is not None and (dag_run.conf or {}).get('stream'):
+        return True
+    return os.getenv('STREAM_LOADS', 'false').lower() in ('1', 'true', 'yes')
+
+
+def is_vintage_mode(context: Dict) -> bool:
+    """Whether FRED series should be loaded with their full ALFRED vintage history
+
+    Enabled with dag_run.conf {"vintages": true} or FRED_VINTAGES=true.
+    """
+    dag_run = context.get('dag_run')
+    if dag_run is not None and (dag_run.conf or {}).get('vintages'):
+        return True
+    return os.getenv('FRED_VINTAGES', 'false').lower() in ('1', 'true', 'yes')
+
+
+def start_from_watermark(last_date: Optional[str], default: str,
+                         lookback_months: Optional[int] = None) -> str:
+    """Watermark minus the revision window, never earlier than default"""
+    if last_date is None:
+        return default
+
+    if lookback_months is None:
+        lookback_months = int(os.getenv('REVISION_LOOKBACK_MONTHS', 6))
+    start = pd.Timestamp(last_date) - pd.DateOffset(months=lookback_months)
+    return max(start.strftime('%Y-%m-%d'), default)
+
+
+def _copy_frame(cur, table: str, df: pd.DataFrame):
+    """Stream a DataFrame into table (its columns in the frame's order) with COPY"""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def bulk_upsert(schema: str, table: str, df: pd.DataFrame,
+                conflict_columns: Optional[List[str]] = None,
+                update_columns: Optional[List[str]] = None,
+                hook: Optional[PostgresHook] = None) -> Tuple[int, int]:
+    """Load a DataFrame into schema.table with COPY and a single upsert
+
+    The rows are streamed through COPY into a temporary staging table and merged
+    into the target with one INSERT ... ON CONFLICT statement, all in one
+    transaction on one connection. Without conflict_columns the rows are simply
+    appended. Frames with a date column also advance metadata.series_watermarks
+    in the same statement and refresh the table's derived columns
+    (metadata.derived_columns) for the loaded dates in the same transaction.
+    Catalogued series load through write_observations instead; this is for
+    tables outside the observations store, such as public.market_data.
+    Returns (rows_inserted, rows_updated).
+    """
+    if df.empty:
+        return 0, 0
+
+    hook = hook or get_db_hook()
+    target = f"{schema}.{table}"
+    columns = list(df.columns)
+    column_list = ', '.join(columns)
+    staging = f"staging_{table}"
+
+    if conflict_columns:
+        # ON CONFLICT cannot touch the same row twice in one statement
+        df = df.drop_duplicates(subset=conflict_columns, keep='last')
+
+    if conflict_columns and update_columns:
+        assignments = ', '.join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+        conflict_sql = f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {assignments}"
+    elif conflict_columns:
+        conflict_sql = f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"
+    else:
+        conflict_sql = ""
+
+    # Keep metadata.series_watermarks current in the same statement as the load;
+    # tables without a series_id column get one table-level watermark ('')
+    if 'date' in columns:
+        series_expr = "COALESCE(series_id, '')" if 'series_id' in columns else "''"
+        returning_sql = f"RETURNING (xmax = 0) AS inserted, {series_expr} AS series_id, date"
+        watermark_sql = f"""
+    , watermarks AS (
+        INSERT INTO metadata.series_watermarks
+            (schema_name, table_name, series_id, last_date, last_loaded_at, row_count)
+        SELECT '{schema}', '{table}', series_id, MAX(date), NOW(), COUNT(*) FILTER (WHERE inserted)
+        FROM upserted
+        GROUP BY series_id
+        ON CONFLICT (schema_name, table_name, series_id) DO UPDATE
+        SET last_date = GREATEST(series_watermarks.last_date, EXCLUDED.last_date),
+            last_loaded_at = EXCLUDED.last_loaded_at,
+            row_count = series_watermarks.row_count + EXCLUDED.row_count
+    )"""
+    else:
+        returning_sql = "RETURNING (xmax = 0) AS inserted"
+        watermark_sql = ""
+
+    upsert_sql = f"""
+    WITH upserted AS (
+        INSERT INTO {target} ({column_list})
+        SELECT {column_list} FROM {staging}
+        {conflict_sql}
+        {returning_sql}
+    ){watermark_sql}
+    SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted)
+    FROM upserted
+    """
+
+    conn = hook.get_conn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT attname, format_type(atttypid, atttypmod)
+                FROM pg_attribute
+                WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+                """,
+                (target,)
+            )
+            column_types = dict(cur.fetchall())
+            staging_columns = ', '.join(
+                f"{col} {_STAGING_TYPE_OVERRIDES.get(column_types[col], column_types[col])}"
+                for col in columns
+            )
+            cur.execute(f"CREATE TEMP TABLE {staging} ({staging_columns}) ON COMMIT DROP")
+            _copy_frame(cur, staging, df)
+            cur.execute(upsert_sql)
+            inserted, updated = cur.fetchone()
+            if 'date' in columns:
+                # Recompute YoY/MoM/moving-average columns affected by these dates
+                dates = pd.to_datetime(df['date'])
+                cur.execute(
+                    "SELECT metadata.refresh_derived_columns(%s, %s, %s, %s)",
+                    (schema, table, dates.min().date(), dates.max().date())
+                )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"Bulk upsert into {target}: {inserted} inserted, {updated} updated")
+    return inserted, updated
+
+
+def catalog_entry(series_id: str, source: str, schema: str, table: str, column: str,
+                  dimensions: Optional[Dict] = None, name: Optional[str] = None,
+                  frequency: Optional[str] = None, units: Optional[str] = None) -> Dict:
+    """A metadata.series_catalog entry: the table column a series is projected into
+
+    dimensions are the other columns of the series' rows in that table (key
+    columns and constants). Each must be a column of the table and every
+    primary key column other than date needs one, or the projection raises;
+    missing (NaN) values are left out.
+    """
+    return {
+        'series_id': series_id,
+        'source': source,
+        'name': name,
+        'frequency': frequency,
+        'units': None if pd.isna(units) else units,
+        'target_schema': schema,
+        'target_table': table,
+        'target_column': column,
+        'dimensions': {key: value for key, value in (dimensions or {}).items() if not pd.isna(value)},
+    }
+
+
+_CATALOG_COLUMNS = ['series_id', 'source', 'name', 'frequency', 'units',
+                    'target_schema', 'target_table', 'target_column']
+
+
+def _register_series(cur, catalog: List[Dict]) -> List[str]:
+    """Upsert catalog entries into metadata.series_catalog; returns the series added or changed"""
+    entries = list({
+        (entry['series_id'], entry['target_schema'], entry['target_table']): entry for entry in catalog
+    }.values())
+    if not entries:
+        return []
+
+    cur.execute(
+        """
+        INSERT INTO metadata.series_catalog AS c
+            (series_id, source, name, frequency, units, target_schema, target_table, target_column,
+             dimensions, updated_at)
+        SELECT e.*, NOW()
+        FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], %s::text[], %s::text[], %s::text[],
+                    %s::text[], %s::jsonb[])
+          AS e(series_id, source, name, frequency, units, target_schema, target_table, target_column, dimensions)
+        ON CONFLICT (series_id, target_schema, target_table) DO UPDATE
+        SET source = EXCLUDED.source, name = EXCLUDED.name, frequency = EXCLUDED.frequency,
+            units = EXCLUDED.units, target_column = EXCLUDED.target_column,
+            dimensions = EXCLUDED.dimensions, updated_at = EXCLUDED.updated_at
+        WHERE (c.source, c.name, c.frequency, c.units, c.target_column, c.dimensions)
+              IS DISTINCT FROM (EXCLUDED.source, EXCLUDED.name, EXCLUDED.frequency, EXCLUDED.units,
+                                EXCLUDED.target_column, EXCLUDED.dimensions)
+        RETURNING series_id
+        """,
+        [[entry[col] for entry in entries] for col in _CATALOG_COLUMNS]
+        + [[json.dumps(entry['dimensions'], default=str) for entry in entries]]
+    )
+    return sorted({row[0] for row in cur.fetchall()})
 
 
-def log_update(schema: str, table: str, records_count: int, status: str):
-    """Log update results"""
-    print(f"Update {schema}.{table}: {records_count} records, status: {status}")
+def _apply_projections(cur, projections: List[Tuple]) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """Project (schema, table, since, until, series_ids) ranges and refresh their series' latest values"""
+    results = {}
+    for schema, table, since, until, series_ids in projections:
+        cur.execute(
+            "SELECT rows_inserted, rows_updated FROM metadata.project_observations(%s, %s, %s, %s, %s)",
+            (schema, table, since, until, series_ids)
+        )
+        results[(schema, table)] = tuple(cur.fetchone())
+
+    changed_series = sorted({series_id for row in projections for series_id in row[4]})
+    if changed_series:
+        cur.execute("SELECT metadata.refresh_latest_values(%s::text[])", (changed_series,))
+    return results
+
+
+def write_observations(observations: pd.DataFrame, catalog: List[Dict], vintage: Optional[str] = None,
+                       hook: Optional[PostgresHook] = None) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """Store observations in metadata.observations and project them into their tables
+
+    This is the write path of every loader. observations has series_id, date
+    and value columns; catalog holds a catalog_entry for each series, which is
+    registered in metadata.series_catalog. Values that differ from the latest
+    stored vintage are added as a new vintage (default today) and unchanged
+    values are skipped. Every table a changed series is catalogued into is
+    then brought up to date for the changed dates with
+    metadata.project_observations, which also maintains watermarks and derived
+    columns; series whose catalog entry changed are projected over all the
+    dates given. The changed series' rows in metadata.latest_values are
+    refreshed last. Everything runs in one transaction.
+    Returns {(schema, table): (rows_inserted, rows_updated)}.
+    """
+    if observations.empty:
+        return {}
+
+    observations = observations[['series_id', 'date', 'value']].drop_duplicates(
+        subset=['series_id', 'date'], keep='last'
+    )
+    dates = pd.to_datetime(observations['date'])
+
+    hook = hook or get_db_hook()
+    conn = hook.get_conn()
+    try:
+        with conn.cursor() as cur:
+            recatalogued = _register_series(cur, catalog)
+            cur.execute(
+                "CREATE TEMP TABLE staging_observations (series_id TEXT, date DATE, value NUMERIC) ON COMMIT DROP"
+            )
+            _copy_frame(cur, 'staging_observations', observations)
+            cur.execute(
+                """
+                WITH latest AS (
+                    SELECT DISTINCT ON (o.series_id, o.date) o.series_id, o.date, o.value
+                    FROM metadata.observations o
+                    WHERE o.series_id IN (SELECT DISTINCT series_id FROM staging_observations)
+                      AND o.date BETWEEN %(since)s AND %(until)s
+                    ORDER BY o.series_id, o.date, o.vintage DESC
+                ), merged AS (
+                    INSERT INTO metadata.observations (series_id, date, value, vintage)
+                    SELECT s.series_id, s.date, s.value, COALESCE(%(vintage)s::date, CURRENT_DATE)
+                    FROM staging_observations s
+                    LEFT JOIN latest l USING (series_id, date)
+                    WHERE l.series_id IS NULL OR l.value IS DISTINCT FROM s.value
+                    ON CONFLICT (series_id, date, vintage) DO UPDATE SET value = EXCLUDED.value
+                    RETURNING series_id, date
+                ), touched AS (
+                    SELECT series_id, date FROM merged
+                    UNION
+                    SELECT series_id, date FROM staging_observations WHERE series_id = ANY(%(recatalogued)s::text[])
+                )
+                SELECT c.target_schema, c.target_table, MIN(t.date), MAX(t.date),
+                       array_agg(DISTINCT t.series_id), (SELECT COUNT(*) FROM merged)
+                FROM touched t
+                JOIN metadata.series_catalog c USING (series_id)
+                GROUP BY c.target_schema, c.target_table
+                ORDER BY c.target_schema, c.target_table
+                """,
+                {
+                    'since': dates.min().date(),
+                    'until': dates.max().date(),
+                    'vintage': vintage,
+                    'recatalogued': recatalogued,
+                }
+            )
+            projections = cur.fetchall()
+            results = _apply_projections(cur, [row[:5] for row in projections])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    changed = projections[0][5] if projections else 0
+    print(f"Stored {len(observations)} observations of {observations['series_id'].nunique()} series: "
+          f"{changed} new or revised")
+    for (schema, table), (inserted, updated) in results.items():
+        print(f"Projected into {schema}.{table}: {inserted} inserted, {updated} updated")
+    return results
+
+
+def write_vintages(vintages: pd.DataFrame, catalog: List[Dict],
+                   hook: Optional[PostgresHook] = None) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """Store point-in-time vintages in metadata.observations and project the latest into their tables
+
+    vintages has series_id, date, vintage (the date the value became known,
+    e.g. an ALFRED realtime_start) and value columns. They are merged into
+    the store, and vintages that repeat the value of the vintage before them
+    are then removed from the series and dates written, so only changes are
+    kept. The latest vintages are projected as in write_observations, in
+    the same transaction. Returns {(schema, table): (rows_inserted, rows_updated)}.
+    """
+    if vintages.empty:
+        return {}
+
+    vintages = vintages[['series_id', 'date', 'vintage', 'value']].drop_duplicates(
+        subset=['series_id', 'date', 'vintage'], keep='last'
+    )
+    dates = pd.to_datetime(vintages['date'])
+    series_ids = sorted(vintages['series_id'].unique())
+    params = {'series': series_ids, 'since': dates.min().date(), 'until': dates.max().date()}
+
+    hook = hook or get_db_hook()
+    conn = hook.get_conn()
+    try:
+        with conn.cursor() as cur:
+            _register_series(cur, catalog)
+            cur.execute(
+                "CREATE TEMP TABLE staging_vintages "
+                "(series_id TEXT, date DATE, vintage DATE, value NUMERIC) ON COMMIT DROP"
+            )
+            _copy_frame(cur, 'staging_vintages', vintages)
+            cur.execute(
+                """
+                INSERT INTO metadata.observations (series_id, date, vintage, value)
+                SELECT series_id, date, vintage, value FROM staging_vintages
+                ON CONFLICT (series_id, date, vintage) DO UPDATE SET value = EXCLUDED.value
+                WHERE observations.value IS DISTINCT FROM EXCLUDED.value
+                """
+            )
+            stored = cur.rowcount
+            cur.execute(
+                """
+                DELETE FROM metadata.observations o
+                USING (
+                    SELECT series_id, date, vintage
+                    FROM (
+                        SELECT series_id, date, vintage,
+                               LAG(vintage) OVER w IS NOT NULL
+                               AND value IS NOT DISTINCT FROM LAG(value) OVER w AS repeated
+                        FROM metadata.observations
+                        WHERE series_id = ANY(%(series)s::text[]) AND date BETWEEN %(since)s AND %(until)s
+                        WINDOW w AS (PARTITION BY series_id, date ORDER BY vintage)
+                    ) v
+                    WHERE repeated
+                ) r
+                WHERE o.series_id = r.series_id AND o.date = r.date AND o.vintage = r.vintage
+                  AND o.date BETWEEN %(since)s AND %(until)s
+                """,
+                params
+            )
+            removed = cur.rowcount
+            cur.execute(
+                """
+                SELECT target_schema, target_table, %(since)s::date, %(until)s::date, array_agg(series_id)
+                FROM metadata.series_catalog
+                WHERE series_id = ANY(%(series)s::text[])
+                GROUP BY target_schema, target_table
+                ORDER BY target_schema, target_table
+                """,
+                params
+            )
+            results = _apply_projections(cur, cur.fetchall())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"Stored {len(vintages)} vintages of {len(series_ids)} series: "
+          f"{stored} new or changed, {removed} repeated values removed")
+    for (schema, table), (inserted, updated) in results.items():
+        print(f"Projected into {schema}.{table}: {inserted} inserted, {updated} updated")
+    return results
+
+
+def add_counts(totals: Dict[Tuple[str, str], Tuple[int, int]],
+               counts: Dict[Tuple[str, str], Tuple[int, int]]) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """Add per-table (inserted, updated) counts from write_observations into totals"""
+    for key, (inserted, updated) in counts.items():
+        total_inserted, total_updated = totals.get(key, (0, 0))
+        totals[key] = (total_inserted + inserted, total_updated + updated)
+    return totals
+
+
+def get_changed_fred_series(fred_client, series_ids: List[str]) -> Dict[str, Optional[str]]:
+    """Return the FRED series updated upstream since their last successful load
+
+    Each series' last_updated timestamp is fetched from the FRED series
+    endpoint and stored in metadata.fred_series_updates in one statement.
+    Series whose metadata could not be retrieved are treated as changed.
+    Returns {series_id: last_updated}.
+    """
+    info = fred_client.get_many_series_info(series_ids)
+    last_updated = {series_id: info[series_id].get('last_updated') for series_id in series_ids}
+
+    known = [series_id for series_id, updated in last_updated.items() if updated]
+    changed_series = {series_id: None for series_id, updated in last_updated.items() if not updated}
+    if not known:
+        return changed_series
+
+    hook = get_db_hook()
+    conn = hook.get_conn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO metadata.fred_series_updates (series_id, last_updated, checked_at)
+                SELECT series_id, last_updated, NOW()
+                FROM unnest(%s::text[], %s::timestamptz[]) AS t(series_id, last_updated)
+                ON CONFLICT (series_id) DO UPDATE
+                SET last_updated = EXCLUDED.last_updated, checked_at = EXCLUDED.checked_at
+                RETURNING series_id, last_updated IS DISTINCT FROM loaded_last_updated
+                """,
+                (known, [last_updated[series_id] for series_id in known])
+            )
+            changed = {series_id for series_id, is_changed in cur.fetchall() if is_changed}
+        conn.commit()
+    finally:
+        conn.close()
+
+    unchanged = len(known) - len(changed)
+    if unchanged:
+        print(f"{unchanged} of {len(series_ids)} FRED series unchanged since last load")
+
+    changed_series.update({series_id: last_updated[series_id] for series_id in changed})
+    return changed_series
+
+
+def mark_fred_series_loaded(series_ids: List[str]):
+    """Record that the FRED series were loaded up to their current last_updated"""
+    hook = get_db_hook()
+    hook.run(
+        """
+        UPDATE metadata.fred_series_updates
+        SET loaded_last_updated = last_updated, loaded_at = NOW()
+        WHERE series_id = ANY(%s)
+        """,
+        parameters=(list(series_ids),)
+    )
+
+
+def get_vintages_loaded(series_ids: List[str]) -> Dict[str, Optional[str]]:
+    """Date through which each FRED series' ALFRED vintages are loaded, None if never"""
+    hook = get_db_hook()
+    rows = hook.get_records(
+        "SELECT series_id, vintages_loaded_through FROM metadata.fred_series_updates WHERE series_id = ANY(%s)",
+        parameters=(list(series_ids),)
+    )
+    loaded = {series_id: through.strftime('%Y-%m-%d') for series_id, through in rows if through}
+    return {series_id: loaded.get(series_id) for series_id in series_ids}
+
+
+def mark_vintages_loaded(series_ids: List[str], through: str):
+    """Record that the FRED series' ALFRED vintages are loaded through a date"""
+    hook = get_db_hook()
+    hook.run(
+        """
+        INSERT INTO metadata.fred_series_updates (series_id, vintages_loaded_through, checked_at)
+        SELECT series_id, %s, NOW() FROM unnest(%s::text[]) AS t(series_id)
+        ON CONFLICT (series_id) DO UPDATE SET vintages_loaded_through = EXCLUDED.vintages_loaded_through
+        """,
+        parameters=(through, list(series_ids))
+    )
+
+
+def get_export_snapshot(table_code: str) -> Optional[pd.Timestamp]:
+    """Snapshot time a bulk export table was last loaded up to, or None"""
+    hook = get_db_hook()
+    row = hook.get_first(
+        "SELECT snapshot_time FROM metadata.bulk_exports WHERE table_code = %s",
+        parameters=(table_code,)
+    )
+    return pd.Timestamp(row[0]) if row else None
+
+
+def set_export_snapshot(table_code: str, snapshot_time: str, export_type: str):
+    """Record that a bulk export table is loaded up to snapshot_time"""
+    hook = get_db_hook()
+    hook.run(
+        """
+        INSERT INTO metadata.bulk_exports (table_code, snapshot_time, export_type, loaded_at)
+        VALUES (%s, %s, %s, NOW())
+        ON CONFLICT (table_code) DO UPDATE
+        SET snapshot_time = EXCLUDED.snapshot_time, export_type = EXCLUDED.export_type,
+            loaded_at = EXCLUDED.loaded_at
+        """,
+        parameters=(table_code, snapshot_time, export_type)
+    )
+
+
+def log_update(schema: str, table: str, records_count: int, status: str,
+               records_updated: int = 0, error_message: Optional[str] = None):
+    """Log update results and record them in metadata.data_updates"""
+    print(f"Update {schema}.{table}: {records_count} records added, "
+          f"{records_updated} updated, status: {status}")
+
+    hook = get_db_hook()
+    hook.run(
+        """
+        INSERT INTO metadata.data_updates
+            (schema_name, table_name, records_added, records_updated, update_status, error_message, completed_at)
+        VALUES (%s, %s, %s, %s, %s, %s, NOW())
+        """,
+        parameters=(schema, table, records_count, records_updated, status, error_message)
+    )
@@ -0,0 +1,65 @@
+"""
+Canned HTTP responses for the API client tests
+"""
+
+import json
+from typing import List
+
+import pytest
+import requests
+
+from api_clients import base_client
+from api_clients.base_client import CircuitBreaker, TokenBucketRateLimiter
+
+
+class FakeResponse:
+    def __init__(self, status_code: int = 200, content: bytes = b'{}', headers: dict = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.url = 'https://example.test'
+        self.closed = False
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for url: {self.url}", response=self)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """requests.Session stand-in answering with queued responses (or raising queued exceptions)"""
+
+    def __init__(self):
+        self.queue: List = []
+        self.requests: List[dict] = []
+
+    def request(self, method, url, params=None, json=None, headers=None, timeout=None, stream=False):  # noqa: A002
+        self.requests.append({'method': method, 'url': url, 'params': params, 'headers': headers or {}})
+        answer = self.queue.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture(autouse=True)
+def local_state(monkeypatch):
+    """Per-process rate limiter and circuit breaker state, reset for every test"""
+    monkeypatch.setattr(base_client, '_get_redis_client', lambda: None)
+    monkeypatch.setattr(TokenBucketRateLimiter, '_local_buckets', {})
+    monkeypatch.setattr(CircuitBreaker, '_local_state', {})
+
+
+@pytest.fixture
+def fake_session():
+    return FakeSession()
+
+
+@pytest.fixture
+def response():
+    return FakeResponse
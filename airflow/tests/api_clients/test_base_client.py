@@ -0,0 +1,136 @@
+"""
+Rate limiting, circuit breaking and retries shared by every API client
+"""
+
+import pytest
+import requests
+
+from api_clients import base_client
+from api_clients.base_client import (
+    BaseAPIClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    TokenBucketRateLimiter,
+    _parse_retry_after,
+    pack_codes,
+)
+
+
+class Client(BaseAPIClient):
+    source_name = 'test'
+    requests_per_minute = 6000
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(base_client.time, 'sleep', slept.append)
+    return slept
+
+
+@pytest.fixture
+def client(monkeypatch, fake_session):
+    monkeypatch.setenv('API_MAX_RETRIES', '2')
+    monkeypatch.setenv('API_CIRCUIT_FAILURE_THRESHOLD', '2')
+    client = Client('https://api.example.test')
+    client.session = fake_session
+    return client
+
+
+def test_token_bucket_allows_a_burst_then_spaces_requests(monkeypatch):
+    monkeypatch.setattr(base_client.time, 'monotonic', lambda: 100.0)
+    limiter = TokenBucketRateLimiter('bucket', requests_per_minute=60, burst=2)
+
+    assert [limiter._reserve() for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+
+
+def test_token_bucket_refills_over_time(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(base_client.time, 'monotonic', lambda: now[0])
+    limiter = TokenBucketRateLimiter('bucket', requests_per_minute=60, burst=2)
+    limiter._reserve(), limiter._reserve()
+
+    now[0] += 1.5
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == pytest.approx(0.5)
+
+
+def test_circuit_breaker_opens_after_consecutive_failures(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(base_client.time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker('breaker', failure_threshold=2, reset_timeout=60)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    now[0] += 61
+    breaker.check()
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after('12') == 12.0
+    assert _parse_retry_after('-3') == 0.0
+    assert _parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert _parse_retry_after('soon') is None
+    assert _parse_retry_after(None) is None
+
+
+def test_pack_codes_fills_groups_up_to_the_joined_length():
+    assert pack_codes(['US', 'DE', 'FR', 'JP', 'GB'], ';', 8) == [['US', 'DE', 'FR'], ['JP', 'GB']]
+    assert pack_codes(['NY.GDP.MKTP.CD', 'FP.CPI.TOTL', 'SL'], '+', 11) == \
+        [['NY.GDP.MKTP.CD'], ['FP.CPI.TOTL'], ['SL']]
+    assert pack_codes([], ';', 8) == []
+
+
+def test_send_retries_and_closes_retried_responses(client, fake_session, response, sleeps):
+    failed = [response(503), response(429, headers={'Retry-After': '2'})]
+    fake_session.queue = failed + [response(200, b'{"ok": true}')]
+
+    assert client._send('https://api.example.test/x').json() == {'ok': True}
+    assert all(r.closed for r in failed)
+    assert len(sleeps) == 2 and sleeps[1] == 2.0
+
+
+def test_send_fails_fast_on_client_errors(client, fake_session, response, sleeps):
+    not_found = response(404)
+    fake_session.queue = [not_found]
+
+    with pytest.raises(requests.HTTPError):
+        client._send('https://api.example.test/x')
+    assert not_found.closed and sleeps == []
+
+
+def test_send_gives_up_when_retry_after_exceeds_backoff_max(client, fake_session, response, sleeps):
+    fake_session.queue = [response(429, headers={'Retry-After': '3600'})]
+
+    with pytest.raises(requests.HTTPError):
+        client._send('https://api.example.test/x')
+    assert sleeps == []
+
+
+def test_send_opens_the_circuit_after_exhausted_retries(client, fake_session, sleeps):
+    fake_session.queue = [requests.ConnectionError('down')] * 6
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            client._send('https://api.example.test/x')
+    with pytest.raises(CircuitOpenError):
+        client._send('https://api.example.test/x')
+    assert len(fake_session.requests) == 6
+
+
+def test_send_stops_retrying_once_the_circuit_opens(client, fake_session, response, monkeypatch):
+    fake_session.queue = [response(503), response(200)]
+    # Another worker opens the circuit while this request backs off
+    monkeypatch.setattr(base_client.time, 'sleep', lambda delay: client.circuit_breaker._call(
+        lambda: None, lambda state: state.update(open_until=float('inf'))
+    ))
+
+    with pytest.raises(CircuitOpenError):
+        client._send('https://api.example.test/x')
+    assert len(fake_session.requests) == 1
@@ -0,0 +1,109 @@
+"""
+FRED observation fetching
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from api_clients import fred_client
+from api_clients.base_client import CircuitOpenError
+from api_clients.fred_client import FREDClient, SeriesFetchError, parse_observations, parse_vintages
+
+
+def observations_body(*values) -> bytes:
+    return json.dumps({'observations': [
+        {'date': f'2024-0{i + 1}-01', 'value': value} for i, value in enumerate(values)
+    ]}).encode()
+
+
+@pytest.fixture(params=['ijson', 'json'])
+def decoder(request, monkeypatch):
+    """Run a parser test with the streaming ijson decoder and with the json module fallback"""
+    if request.param == 'ijson':
+        pytest.importorskip('ijson')
+    else:
+        monkeypatch.setattr(fred_client, 'ijson', None)
+    return request.param
+
+
+def test_parse_observations_drops_missing_values(decoder):
+    body = json.dumps({'count': 3, 'observations': [
+        {'realtime_start': '2024-06-01', 'date': '2024-01-01', 'value': '1.5'},
+        {'realtime_start': '2024-06-01', 'date': '2024-02-01', 'value': '.'},
+        {'realtime_start': '2024-06-01', 'date': '2024-03-01', 'value': '-0.25'},
+    ]}).encode()
+
+    df = parse_observations(body)
+
+    assert df['date'].dtype == 'datetime64[ns]' and df['value'].dtype == np.float64
+    assert df.to_dict('list') == {
+        'date': [pd.Timestamp('2024-01-01'), pd.Timestamp('2024-03-01')],
+        'value': [1.5, -0.25],
+    }
+
+
+def test_parse_observations_of_an_empty_body(decoder):
+    df = parse_observations(b'{"count": 0, "observations": []}')
+
+    assert df.empty and list(df.columns) == ['date', 'value']
+
+
+def test_capacity_is_bounded_by_the_body_size():
+    assert fred_client._capacity(b'{"count": 2, "observations": []}' + b' ' * 200) == 2
+    assert fred_client._capacity(b'{"count": 1000000, "observations": []}') == 1
+    assert fred_client._capacity(b'{"observations": []}' + b' ' * 300) == 10
+
+
+def test_parse_vintages_keeps_unpublished_values(decoder):
+    body = json.dumps({'observations': [
+        {'realtime_start': '2024-02-15', 'realtime_end': '2024-03-14', 'date': '2024-01-01', 'value': '1.0'},
+        {'realtime_start': '2024-03-15', 'realtime_end': '9999-12-31', 'date': '2024-01-01', 'value': '1.1'},
+        {'realtime_start': '2024-03-15', 'realtime_end': '9999-12-31', 'date': '2024-02-01', 'value': '.'},
+    ]}).encode()
+
+    df, n = parse_vintages(body)
+
+    assert n == 3
+    assert df['realtime_start'].tolist() == [pd.Timestamp('2024-02-15'), pd.Timestamp('2024-03-15'),
+                                             pd.Timestamp('2024-03-15')]
+    assert df['date'].tolist() == [pd.Timestamp('2024-01-01')] * 2 + [pd.Timestamp('2024-02-01')]
+    assert df['value'].tolist()[:2] == [1.0, 1.1] and np.isnan(df['value'].iloc[2])
+
+
+@pytest.fixture
+def fred(monkeypatch, fake_session):
+    monkeypatch.setenv('FRED_API_KEY', 'secret')
+    monkeypatch.setenv('API_MAX_RETRIES', '0')
+    client = FREDClient()
+    client.session = fake_session
+    return client
+
+
+def test_get_series_raises_request_errors(fred, fake_session, response):
+    fake_session.queue = [response(400)]
+
+    with pytest.raises(requests.HTTPError):
+        fred.get_series('NOPE')
+
+
+def test_get_series_raises_when_the_circuit_is_open(fred, fake_session):
+    fred.circuit_breaker._call(lambda: None, lambda state: state.update(open_until=float('inf')))
+
+    with pytest.raises(CircuitOpenError):
+        fred.get_series('GDP')
+    assert fake_session.requests == []
+
+
+def test_get_many_series_raises_after_fetching_the_batch(fred, fake_session, response):
+    fake_session.queue = [response(content=observations_body('1.0', '.')), response(403)]
+
+    with pytest.raises(SeriesFetchError) as raised:
+        fred.get_many_series(['GDP', 'SECRET'])
+
+    assert list(raised.value.errors) == ['SECRET']
+    assert list(raised.value.results) == ['GDP']
+    assert raised.value.results['GDP']['value'].tolist() == [1.0]
@@ -0,0 +1,77 @@
+"""
+HTTP cache keys and if_changed detection
+"""
+
+import json
+
+import pytest
+
+from api_clients.fred_client import FREDClient
+from api_clients.http_cache import HTTPCache, NotModified
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(str(tmp_path / 'http' / 'responses.sqlite3'), 1024 * 1024)
+
+
+@pytest.fixture
+def fred(monkeypatch, cache, fake_session):
+    monkeypatch.setenv('FRED_API_KEY', 'secret')
+    client = FREDClient()
+    client.cache = cache
+    client.session = fake_session
+    return client
+
+
+def fred_body(realtime: str, values) -> bytes:
+    return json.dumps({
+        'realtime_start': realtime, 'realtime_end': realtime, 'count': len(values),
+        'observations': [
+            {'realtime_start': realtime, 'realtime_end': realtime, 'date': f'2024-0{i + 1}-01', 'value': value}
+            for i, value in enumerate(values)
+        ],
+    }).encode()
+
+
+def test_make_key_ignores_credentials():
+    url = 'https://api.example.test/series'
+    key = HTTPCache.make_key(url, {'series_id': 'GDP', 'api_key': 'a'})
+
+    assert key == HTTPCache.make_key(url, {'series_id': 'GDP', 'API_KEY': 'b'})
+    assert key == HTTPCache.make_key(url, {'registrationkey': 'c', 'token': 'd', 'series_id': 'GDP'})
+    assert key != HTTPCache.make_key(url, {'series_id': 'GDPC1', 'api_key': 'a'})
+    assert key != HTTPCache.make_key(url + '/other', {'series_id': 'GDP'})
+
+
+def test_put_keeps_the_loaded_digest(cache):
+    cache.put('k', 'https://example.test', b'one')
+    cache.mark_loaded({'k': cache.digest(b'one')})
+    cache.put('k', 'https://example.test', b'two', etag='"2"', digest='data')
+
+    entry = cache.get('k')
+    assert (entry['body'], entry['digest'], entry['etag']) == (b'two', 'data', '"2"')
+    assert entry['loaded_digest'] == cache.digest(b'one')
+
+
+def test_fred_if_changed_ignores_the_request_date(fred, fake_session, response):
+    fake_session.queue = [
+        response(content=fred_body('2024-10-16', ['1.5', '2.5'])),
+        response(content=fred_body('2024-10-17', ['1.5', '2.5'])),
+        response(content=fred_body('2024-10-18', ['1.5', '2.75'])),
+    ]
+
+    assert len(fred.get_series('GDP', if_changed=True)) == 2
+    fred.confirm_loaded()
+    with pytest.raises(NotModified):
+        fred._request_body('series/observations', fred._observation_params('GDP'), if_changed=True)
+    assert fred.get_series('GDP', if_changed=True)['value'].tolist() == [1.5, 2.75]
+    assert 'secret' not in json.dumps(fake_session.requests[0]['headers'])
+
+
+def test_unconfirmed_loads_are_fetched_again(fred, fake_session, response):
+    fake_session.queue = [response(content=fred_body('2024-10-16', ['1.5'])) for _ in range(2)]
+
+    fred.get_series('GDP', if_changed=True)
+
+    assert len(fred.get_series('GDP', if_changed=True)) == 1
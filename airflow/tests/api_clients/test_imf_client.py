@@ -0,0 +1,66 @@
+"""
+IMF CompactData requests and parsing, with fetch_many replaced by canned payloads
+"""
+
+import pandas as pd
+import pytest
+
+from api_clients.imf_client import IMFClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """IMFClient answering every request with client.payload and recording the calls"""
+    client = IMFClient()
+    client.calls = []
+
+    def fetch_many(calls, **kwargs):
+        client.calls.extend(calls)
+        return [client.payload for _ in calls]
+
+    monkeypatch.setattr(client, 'fetch_many', fetch_many)
+    return client
+
+
+def test_compact_data_reads_single_and_listed_series_and_observations(client):
+    client.payload = {'CompactData': {'DataSet': {'Series': [
+        {'@REF_AREA': 'W00', '@COMMODITY': 'POILBRE', '@UNIT_MEASURE': 'USD',
+         'Obs': [{'@TIME_PERIOD': '2024-01', '@OBS_VALUE': '80.1'},
+                 {'@TIME_PERIOD': '2024-02', '@OBS_VALUE': 'n/a'}]},
+        # A one-element list collapses into a bare object
+        {'@REF_AREA': 'W00', '@COMMODITY': 'PGOLD', '@UNIT_MEASURE': 'USD',
+         'Obs': {'@TIME_PERIOD': '2024-Q1', '@OBS_VALUE': '2050'}},
+        {'@REF_AREA': 'W00', '@COMMODITY': 'PCOPP', '@UNIT_MEASURE': 'USD'},
+    ]}}}
+
+    df = client.get_compact_data('PCPS', 'M', ['W00'], ['POILBRE', 'PGOLD', 'PCOPP'], suffix='USD',
+                                 start_period='2024')
+
+    assert client.calls == [('CompactData/PCPS/M.W00.POILBRE+PGOLD+PCOPP.USD', {'startPeriod': '2024'})]
+    assert df.to_dict('records') == [
+        {'area': 'W00', 'indicator': 'POILBRE', 'unit': 'USD', 'date': pd.Timestamp('2024-01-01'), 'value': 80.1},
+        {'area': 'W00', 'indicator': 'PGOLD', 'unit': 'USD', 'date': pd.Timestamp('2024-01-01'), 'value': 2050.0},
+    ]
+
+
+def test_compact_data_packs_areas_into_url_sized_requests(client):
+    client.max_url_length = len(client.base_url) + len('IFS') + 100 + 40
+    client.payload = {'CompactData': {'DataSet': {'Series': {
+        '@REF_AREA': 'US', '@INDICATOR': 'PCPI_IX', 'Obs': {'@TIME_PERIOD': '2024', '@OBS_VALUE': '310.3'}
+    }}}}
+
+    df = client.get_compact_data('IFS', 'A', ['US', 'DE', 'FR', 'JP', 'GB'], ['PCPI_IX'])
+
+    # Areas get a quarter of the 40-character budget: three codes per request
+    assert [endpoint for endpoint, _ in client.calls] == [
+        'CompactData/IFS/A.US+DE+FR.PCPI_IX', 'CompactData/IFS/A.JP+GB.PCPI_IX'
+    ]
+    assert list(df['indicator']) == ['PCPI_IX', 'PCPI_IX']
+    assert df['unit'].isna().all()
+
+
+def test_compact_data_raises_failed_requests(client):
+    client.payload = ConnectionError('IMF unavailable')
+
+    with pytest.raises(ConnectionError):
+        client.get_compact_data('IFS', 'M', ['US'], ['PCPI_IX'])
@@ -0,0 +1,55 @@
+"""
+SDMX-CSV parsing shared by the ECB and OECD clients
+"""
+
+from io import StringIO
+
+import pandas as pd
+
+from api_clients.sdmx import iter_sdmx_csv, parse_time_period
+
+
+def test_parse_time_period_handles_every_frequency_in_one_column():
+    periods = pd.Series(['2024-01-31', '2024-02', '2024-Q3', '2024-S2', '2024', 'not a period'])
+
+    dates = parse_time_period(periods)
+
+    assert list(dates[:5]) == [
+        pd.Timestamp('2024-01-31'), pd.Timestamp('2024-02-01'), pd.Timestamp('2024-07-01'),
+        pd.Timestamp('2024-07-01'), pd.Timestamp('2024-01-01'),
+    ]
+    assert pd.isna(dates[5])
+
+
+SDMX_CSV = """DATAFLOW,FREQ,REF_AREA,DATA_TYPE_FM,TIME_PERIOD,OBS_VALUE,OBS_STATUS
+ECB:YC(1.0),B,U2,SR_10Y,2024-01-02,2.05,A
+ECB:YC(1.0),B,U2,SR_10Y,2024-01-03,,M
+ECB:YC(1.0),B,U2,SR_2Y,2024-01-02,2.61,A
+ECB:YC(1.0),B,U2,SR_2Y,2024-01-03,2.58,A
+ECB:YC(1.0),B,U2,SR_2Y,2024-01-04,2.55,A
+"""
+
+
+def test_iter_sdmx_csv_yields_typed_chunks_without_missing_values():
+    chunks = list(iter_sdmx_csv(StringIO(SDMX_CSV), ['REF_AREA', 'DATA_TYPE_FM'], chunk_rows=2,
+                                renames={'DATA_TYPE_FM': 'maturity'}))
+
+    assert [len(chunk) for chunk in chunks] == [1, 2, 1]
+    df = pd.concat(chunks, ignore_index=True)
+    assert list(df.columns) == ['REF_AREA', 'maturity', 'value', 'date']
+    assert df['value'].dtype == 'float64'
+    assert df.to_dict('records') == [
+        {'REF_AREA': 'U2', 'maturity': 'SR_10Y', 'value': 2.05, 'date': pd.Timestamp('2024-01-02')},
+        {'REF_AREA': 'U2', 'maturity': 'SR_2Y', 'value': 2.61, 'date': pd.Timestamp('2024-01-02')},
+        {'REF_AREA': 'U2', 'maturity': 'SR_2Y', 'value': 2.58, 'date': pd.Timestamp('2024-01-03')},
+        {'REF_AREA': 'U2', 'maturity': 'SR_2Y', 'value': 2.55, 'date': pd.Timestamp('2024-01-04')},
+    ]
+
+
+def test_iter_sdmx_csv_skips_chunks_left_empty():
+    body = "REF_AREA,TIME_PERIOD,OBS_VALUE\nU2,2024-01,\nU2,2024-02,\nU2,2024-03,1.5\n"
+
+    chunks = list(iter_sdmx_csv(StringIO(body), ['REF_AREA'], chunk_rows=2))
+
+    assert len(chunks) == 1
+    assert chunks[0][['date', 'value']].to_dict('records') == [{'date': pd.Timestamp('2024-03-01'), 'value': 1.5}]
@@ -0,0 +1,66 @@
+"""
+World Bank indicator requests and paging, with fetch_many replaced by canned pages
+"""
+
+import pandas as pd
+import pytest
+
+from api_clients.world_bank_client import WorldBankClient
+
+
+def record(country, indicator, year, value):
+    return {'country': {'id': country, 'value': country}, 'indicator': {'id': indicator, 'value': indicator},
+            'countryiso3code': '', 'date': str(year), 'value': value}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """WorldBankClient answering from client.pages, keyed by (endpoint, page), and recording the batches"""
+    client = WorldBankClient()
+    client.batches = []
+
+    def fetch_many(calls, **kwargs):
+        if not calls:
+            return []
+        client.batches.append([(endpoint, params['page']) for endpoint, params in calls])
+        return [client.pages[(endpoint, params['page'])] for endpoint, params in calls]
+
+    monkeypatch.setattr(client, 'fetch_many', fetch_many)
+    return client
+
+
+def test_indicators_fetch_first_pages_then_the_rest_at_once(client):
+    endpoint = 'country/US;DE/indicator/NY.GDP.MKTP.CD'
+    client.pages = {
+        (endpoint, 1): [{'page': 1, 'pages': 3}, [record('US', 'NY.GDP.MKTP.CD', 2023, 27.4e12)]],
+        (endpoint, 2): [{'page': 2, 'pages': 3}, [record('DE', 'NY.GDP.MKTP.CD', 2023, None)]],
+        (endpoint, 3): [{'page': 3, 'pages': 3}, [record('DE', 'NY.GDP.MKTP.CD', 2022, 4.1e12)]],
+    }
+
+    df = client.get_indicators(['US', 'DE'], ['NY.GDP.MKTP.CD'], start_year=2022, end_year=2023)
+
+    assert client.batches == [[(endpoint, 1)], [(endpoint, 2), (endpoint, 3)]]
+    assert df.to_dict('records') == [
+        {'country': 'US', 'indicator': 'NY.GDP.MKTP.CD', 'date': pd.Timestamp('2023-01-01'), 'value': 27.4e12},
+        {'country': 'DE', 'indicator': 'NY.GDP.MKTP.CD', 'date': pd.Timestamp('2022-01-01'), 'value': 4.1e12},
+    ]
+
+
+def test_indicators_pack_countries_into_url_sized_requests(client):
+    client.max_url_length = len(client.base_url) + 100 + 12
+    endpoints = ['country/US;DE;FR/indicator/SP.POP.TOTL', 'country/JP;GB/indicator/SP.POP.TOTL']
+    client.pages = {(endpoint, 1): [{'page': 1, 'pages': 1}, []] for endpoint in endpoints}
+
+    df = client.get_indicators(['US', 'DE', 'FR', 'JP', 'GB'], ['SP.POP.TOTL'])
+
+    # Countries get three quarters of the 12-character budget: three codes per request
+    assert client.batches == [[(endpoint, 1) for endpoint in endpoints]]
+    assert df.empty
+
+
+def test_indicators_raise_on_error_messages(client):
+    endpoint = 'country/XX/indicator/SP.POP.TOTL'
+    client.pages = {(endpoint, 1): [{'message': [{'id': '120', 'value': 'Invalid value'}]}]}
+
+    with pytest.raises(ValueError, match='World Bank API error'):
+        client.get_indicators(['XX'], ['SP.POP.TOTL'])
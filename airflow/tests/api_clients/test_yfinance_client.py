@@ -0,0 +1,71 @@
+"""
+Parquet price cache and the cached, batched yfinance price history
+"""
+
+import pandas as pd
+import pytest
+
+from api_clients.price_cache import PriceHistoryCache
+from api_clients.yfinance_client import YFinanceClient
+
+
+def bars(start, end):
+    index = pd.date_range(start, end, freq='B', inclusive='left', name='Date')
+    return pd.DataFrame({'Close': range(len(index)), 'Volume': 1000}, index=index, dtype=float)
+
+
+def test_cache_round_trips_bars_and_coverage(tmp_path):
+    cache = PriceHistoryCache(str(tmp_path))
+    cached = bars('2024-01-01', '2024-01-10')
+
+    cache.write('^GSPC', '1d', cached, {'start': '2024-01-01', 'end': '2024-01-10'})
+    df, coverage = cache.read('^GSPC', '1d')
+
+    pd.testing.assert_frame_equal(df, cached, check_freq=False)
+    assert coverage == {'start': '2024-01-01', 'end': '2024-01-10'}
+
+    uncached, coverage = cache.read('MSFT', '1d')
+    assert uncached.empty and coverage is None
+
+
+def test_missing_ranges_refetch_the_last_cached_bar(tmp_path):
+    cache = PriceHistoryCache(str(tmp_path))
+    cached = bars('2024-01-01', '2024-01-10')
+    coverage = {'start': '2024-01-01', 'end': '2024-01-10'}
+
+    assert cache.missing_ranges(None, pd.DataFrame(), '2024-01-01', '2024-02-01') == [('2024-01-01', '2024-02-01')]
+    assert cache.missing_ranges(coverage, cached, '2024-01-02', '2024-01-09') == []
+    assert cache.missing_ranges(coverage, cached, '2023-12-01', '2024-02-01') == [
+        ('2023-12-01', '2024-01-01'), ('2024-01-09', '2024-02-01')
+    ]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """YFinanceClient on a temporary cache whose downloads are recorded instead of sent"""
+    client = YFinanceClient()
+    client.price_cache = PriceHistoryCache(str(tmp_path))
+    client.downloads = []
+
+    def download(tickers, start, end, interval):
+        client.downloads.append((sorted(tickers), start, end))
+        return {ticker: bars(start, end) for ticker in tickers}
+
+    monkeypatch.setattr(client, '_download', download)
+    return client
+
+
+def test_price_history_downloads_only_what_the_cache_lacks(client):
+    first = client.get_price_history(['AAPL', 'MSFT'], '2024-01-01', '2024-01-10', interval='1d')
+    second = client.get_price_history(['AAPL', 'MSFT', 'TSLA'], '2024-01-03', '2024-01-17', interval='1d')
+
+    assert client.downloads == [
+        (['AAPL', 'MSFT'], '2024-01-01', '2024-01-10'),
+        (['AAPL', 'MSFT'], '2024-01-09', '2024-01-17'),
+        (['TSLA'], '2024-01-03', '2024-01-17'),
+    ]
+    assert list(first['AAPL'].index.strftime('%Y-%m-%d')) == \
+        ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05', '2024-01-08', '2024-01-09']
+    assert second['MSFT'].index.min() == pd.Timestamp('2024-01-03')
+    assert second['MSFT'].index.max() == pd.Timestamp('2024-01-16')
+    assert second['MSFT'].index.is_unique
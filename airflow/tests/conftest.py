@@ -0,0 +1,112 @@
+"""
+Shared fixtures for the DAG task and API client tests
+
+Run from the repository root with: python -m pytest airflow/tests
+"""
+
+import os
+import re
+import sys
+from typing import Dict, List
+
+import pytest
+
+AIRFLOW_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INIT_SQL = os.path.join(os.path.dirname(AIRFLOW_DIR), 'init-scripts', 'init-timescaledb.sql')
+
+# The DAG folder is the import root, as in the Airflow containers
+sys.path.insert(0, os.path.join(AIRFLOW_DIR, 'dags'))
+
+# Keep API clients off the shared HTTP and price caches and Redis while testing
+os.environ.setdefault('API_CACHE_ENABLED', 'false')
+os.environ.setdefault('PRICE_CACHE_ENABLED', 'false')
+os.environ.setdefault('API_RATE_LIMIT_REDIS_URL', 'redis://127.0.0.1:1/0')
+
+_TABLE_PATTERN = re.compile(r'CREATE TABLE IF NOT EXISTS (\w+)\.(\w+) \((.*?)\n\);', re.S)
+_CONSTRAINT_WORDS = ('PRIMARY', 'UNIQUE', 'CONSTRAINT', 'FOREIGN', 'CHECK')
+
+
+def parse_tables(sql: str) -> Dict[str, Dict[str, List[str]]]:
+    """Columns and primary key of every CREATE TABLE in sql, keyed by 'schema.table'"""
+    tables = {}
+    for schema, table, body in _TABLE_PATTERN.findall(sql):
+        columns, primary_key = [], []
+        for line in body.strip().splitlines():
+            line = line.strip().rstrip(',')
+            if not line or line.startswith('--'):
+                continue
+            if line.startswith('PRIMARY KEY'):
+                primary_key = [column.strip() for column in line[line.index('(') + 1:line.index(')')].split(',')]
+            elif not line.startswith(_CONSTRAINT_WORDS):
+                columns.append(line.split()[0])
+                if 'PRIMARY KEY' in line:
+                    primary_key = [line.split()[0]]
+        tables[f"{schema}.{table}"] = {'columns': columns, 'primary_key': primary_key}
+    return tables
+
+
+@pytest.fixture(scope='session')
+def init_sql() -> str:
+    """Text of init-scripts/init-timescaledb.sql"""
+    with open(INIT_SQL) as f:
+        return f.read()
+
+
+@pytest.fixture(scope='session')
+def schema_tables(init_sql) -> Dict[str, Dict[str, List[str]]]:
+    """Tables defined by init-scripts/init-timescaledb.sql"""
+    return parse_tables(init_sql)
+
+
+@pytest.fixture
+def db_cursor():
+    """Cursor on a database initialized with init-timescaledb.sql, rolled back after the test
+
+    Skipped unless TIMESCALEDB_TEST_DSN points at such a database.
+    """
+    dsn = os.getenv('TIMESCALEDB_TEST_DSN')
+    if not dsn:
+        pytest.skip('TIMESCALEDB_TEST_DSN is not set')
+    psycopg2 = pytest.importorskip('psycopg2')
+
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            yield cur
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+class _TestHook:
+    """PostgresHook stand-in whose connections share the test transaction"""
+
+    class _Connection:
+        def __init__(self, conn):
+            self._conn = conn
+
+        def cursor(self, *args, **kwargs):
+            return self._conn.cursor(*args, **kwargs)
+
+        def commit(self):
+            # Stands in for the commit dropping ON COMMIT DROP staging tables
+            with self._conn.cursor() as cur:
+                cur.execute("DISCARD TEMP")
+
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def get_conn(self):
+        return self._Connection(self._conn)
+
+
+@pytest.fixture
+def db_hook(db_cursor):
+    """Hook whose connections run in db_cursor's transaction"""
+    return _TestHook(db_cursor.connection)
@@ -0,0 +1,173 @@
+"""
+Backfill range splitting and per-source dispatch, with the clients and database replaced by recorders
+"""
+
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from tasks import backfill
+from tasks.series_registry import BLS_SERIES, EIA_SERIES, FRED_SERIES
+
+
+def test_chunk_ranges_cover_the_span_on_chunk_boundaries():
+    ranges = backfill.chunk_ranges(date(2000, 3, 15), date(2003, 6, 30), timedelta(days=365))
+
+    assert ranges[0][0] == date(2000, 3, 15)
+    assert ranges[-1][1] == date(2003, 7, 1)
+    assert all(previous[1] == following[0] for previous, following in zip(ranges, ranges[1:]))
+    for range_start, _ in ranges[1:]:
+        assert (range_start - backfill.CHUNK_ORIGIN).days % 365 == 0
+
+
+def test_chunk_ranges_span_whole_chunks_of_at_least_min_days():
+    ranges = backfill.chunk_ranges(date(1970, 1, 1), date(1970, 12, 31), timedelta(days=7), min_days=30)
+
+    # 30 days round up to five 7-day chunks
+    assert ranges[0] == (date(1970, 1, 1), date(1970, 2, 5))
+    assert all((end - start).days == 35 for start, end in ranges[:-1])
+
+
+def test_chunk_ranges_of_a_single_day():
+    assert backfill.chunk_ranges(date(2024, 1, 3), date(2024, 1, 3), timedelta(days=7)) == \
+        [(date(2024, 1, 3), date(2024, 1, 4))]
+
+
+def test_registry_source_dispatches_every_registry_series():
+    for source, specs in (('FRED', FRED_SERIES), ('BLS', BLS_SERIES), ('EIA', EIA_SERIES)):
+        assert {backfill.registry_source(spec['series_id']) for spec in specs} == {source}
+
+    with pytest.raises(KeyError):
+        backfill.registry_source('NOT_A_SERIES')
+
+
+class FakeFREDClient:
+    """Pages of monthly 1.0 values; later ranges answer first"""
+
+    def __init__(self):
+        self.started = threading.Event()
+
+    def iter_series_pages(self, series_id, start_date=None, end_date=None):
+        if start_date.startswith('2000'):
+            self.started.wait(timeout=5)
+        else:
+            self.started.set()
+        yield pd.DataFrame({'date': pd.date_range(start_date, end_date, freq='MS'), 'value': 1.0})
+
+
+class FakeBLSClient:
+    def __init__(self):
+        self.requests = []
+
+    def get_many_series(self, series_ids, start_year=None, end_year=None):
+        self.requests.append((series_ids, start_year, end_year))
+        dates = pd.date_range(f"{start_year}-01-01", f"{end_year}-12-01", freq='MS')
+        return pd.DataFrame({'series_id': series_ids[0], 'date': dates, 'value': 1.0})
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Record writes and checkpoints of a backfill over ten-year ranges from 2000"""
+    calls = {'written': [], 'ranges': []}
+
+    def write_observations(observations, catalog):
+        calls['written'].append((observations['date'].min(), observations['date'].max(), catalog))
+        return {(entry['target_schema'], entry['target_table']): (len(observations), 0) for entry in catalog}
+
+    monkeypatch.setattr(backfill, 'write_observations', write_observations)
+    monkeypatch.setattr(backfill, 'get_chunk_interval', lambda schema, table: timedelta(days=3650))
+    monkeypatch.setattr(backfill, '_checkpoint_ranges', lambda spec, ranges, restart: ranges)
+    monkeypatch.setattr(backfill, '_record_range', lambda spec, chunk_start, status, *args, **kwargs:
+                        calls['ranges'].append((chunk_start, status)))
+    monkeypatch.setattr(backfill, 'log_update', lambda *args, **kwargs: None)
+    monkeypatch.setattr(backfill, 'CHUNK_ORIGIN', date(2000, 1, 1))
+    return calls
+
+
+def test_fred_ranges_are_written_oldest_first(monkeypatch, recorded):
+    monkeypatch.setattr(backfill, 'get_fred_client', FakeFREDClient)
+
+    result = backfill.backfill_series('INDPRO', '2000-01-01', '2019-12-31', workers=2)
+
+    # The first range is fetched last, but nothing is written before it
+    assert result['failed'] == 0
+    assert [written[0] for written in recorded['written']] == [pd.Timestamp('2000-01-01'), pd.Timestamp('2010-01-01')]
+    assert recorded['ranges'] == [
+        (date(2000, 1, 1), 'done'), (date(2009, 12, 29), 'done'), (date(2019, 12, 27), 'done')
+    ]
+
+
+def test_bls_series_are_fetched_from_bls_within_the_range(monkeypatch, recorded):
+    client = FakeBLSClient()
+    monkeypatch.setattr(backfill, 'get_bls_client', lambda: client)
+    spec = BLS_SERIES[0]
+
+    backfill.backfill_series(spec['series_id'], '2000-03-01', '2004-06-30', workers=1)
+
+    assert client.requests == [([spec['series_id']], 2000, 2004)]
+    (first, last, catalog), = recorded['written']
+    assert (first, last) == (pd.Timestamp('2000-03-01'), pd.Timestamp('2004-06-01'))
+    assert [entry['source'] for entry in catalog] == ['BLS']
+
+
+class FakeEIAClient:
+    def __init__(self):
+        self.requests = []
+
+    def iter_data(self, route, series_ids, frequency, start=None, end=None):
+        self.requests.append((route, series_ids, frequency, start, end))
+        yield pd.DataFrame({'series_id': series_ids[0], 'date': pd.to_datetime([start]), 'value': 430000.0,
+                            'unit': 'MBBL'})
+
+
+def test_eia_stock_series_keep_their_commodity_row_unit(monkeypatch, recorded):
+    client = FakeEIAClient()
+    monkeypatch.setattr(backfill, 'get_eia_client', lambda: client)
+    monkeypatch.setattr(backfill, '_catalogued_row_units', lambda: {'crude_oil': 'MBBL/D'})
+
+    backfill.backfill_series('WCESTUS1', '2024-01-05', '2024-03-29', workers=1)
+
+    assert client.requests == [('petroleum/sum/sndw', ['WCESTUS1'], 'weekly', '2024-01-05', '2024-03-29')]
+    (_, _, catalog), = recorded['written']
+    units = {entry['target_table']: entry['dimensions']['unit'] for entry in catalog}
+    assert units == {'eia_summary': 'MBBL', 'demand_supply_factors': 'MBBL/D'}
+
+
+class CountingFREDClient:
+    def __init__(self):
+        self.fetched = 0
+
+    def iter_series_pages(self, series_id, start_date=None, end_date=None):
+        self.fetched += 1
+        yield pd.DataFrame({'date': pd.date_range(start_date, end_date, freq='D'), 'value': 1.0})
+
+
+def test_ranges_are_fetched_at_most_workers_ahead_of_the_writes(monkeypatch, recorded):
+    client = CountingFREDClient()
+    monkeypatch.setattr(backfill, 'get_fred_client', lambda: client)
+    monkeypatch.setattr(backfill, 'get_chunk_interval', lambda schema, table: timedelta(days=365))
+    fetched_at_write = []
+    write = backfill.write_observations
+    monkeypatch.setattr(backfill, 'write_observations', lambda observations, catalog: (
+        fetched_at_write.append(client.fetched), write(observations, catalog)
+    )[1])
+
+    backfill.backfill_series('INDPRO', '2000-01-01', '2019-12-31', workers=2)
+
+    assert len(fetched_at_write) == 5
+    assert all(fetched <= written + 2 for written, fetched in enumerate(fetched_at_write))
+
+
+def test_run_backfill_takes_only_its_sources_series(monkeypatch):
+    backfilled = []
+    monkeypatch.setattr(backfill, 'backfill_series', lambda series_id, **kwargs: (
+        backfilled.append(series_id), {'failed': 0}
+    )[1])
+    params = {'series_ids': [FRED_SERIES[0]['series_id'], BLS_SERIES[0]['series_id'], EIA_SERIES[0]['series_id']]}
+
+    backfill.run_backfill(source='BLS', params=params)
+    backfill.run_backfill(source='EIA', params={})
+
+    assert backfilled == [BLS_SERIES[0]['series_id']] + [spec['series_id'] for spec in EIA_SERIES]
@@ -0,0 +1,74 @@
+"""
+COT export rows, observations and delta deletions
+"""
+
+import pandas as pd
+
+from tasks import cot_loader
+from tasks.cot_loader import _apply_deletions, cot_observations, cot_rows, cot_series_id
+from tasks.utils import write_observations
+
+
+def export_chunk(**overrides):
+    row = {
+        'contract_code': '088691', 'type': 'F_L_ALL', 'date': '2024-01-02',
+        'market_participation': 500, 'commercial_longs': 200, 'commercial_shorts': 260,
+        'noncommercial_longs': 150, 'noncommercial_shorts': 90,
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+class ExportClient:
+    def __init__(self, *chunks):
+        self.chunks = chunks
+
+    def iter_export_csv(self, link, **kwargs):
+        return iter(self.chunks)
+
+
+def test_cot_rows_keep_tracked_contracts_of_the_report_type():
+    chunk = pd.concat([
+        export_chunk(),
+        export_chunk(contract_code='999999'),
+        export_chunk(type='FO_L_ALL'),
+    ], ignore_index=True)
+
+    rows = cot_rows(chunk)
+
+    assert rows[['contract_code', 'commodity']].values.tolist() == [['088691', 'gold']]
+    assert rows['net_position'].tolist() == [60]
+
+
+def test_cot_observations_catalog_every_position_column():
+    observations, catalog = cot_observations(export_chunk())
+
+    assert len(observations) == len(catalog) == 6
+    assert set(observations['series_id']) == {entry['series_id'] for entry in catalog}
+    assert all(entry['dimensions'] == {'commodity': 'gold'} for entry in catalog)
+
+
+def test_deletions_add_a_null_vintage_and_keep_history(db_cursor, db_hook, monkeypatch):
+    monkeypatch.setattr(cot_loader, 'get_db_hook', lambda: db_hook)
+    observations, catalog = cot_observations(export_chunk())
+    write_observations(observations, catalog, vintage='2024-01-05', hook=db_hook)
+
+    assert _apply_deletions(ExportClient(export_chunk()), 'deletions.csv') == 1
+
+    series_id = cot_series_id('088691', 'net_position')
+    db_cursor.execute(
+        "SELECT vintage = '2024-01-05', value FROM metadata.observations WHERE series_id = %s ORDER BY vintage",
+        (series_id,)
+    )
+    assert db_cursor.fetchall() == [(True, 60), (False, None)]
+    db_cursor.execute("SELECT COUNT(*) FROM commodities.cot_metals_energy WHERE commodity = 'gold'")
+    assert db_cursor.fetchone() == (0,)
+    db_cursor.execute("SELECT COUNT(*) FROM metadata.latest_values WHERE series_id = %s", (series_id,))
+    assert db_cursor.fetchone() == (0,)
+
+    # A later projection over the date does not bring the row back
+    db_cursor.execute(
+        "SELECT * FROM metadata.project_observations('commodities', 'cot_metals_energy', '2024-01-02', '2024-01-02')"
+    )
+    db_cursor.execute("SELECT COUNT(*) FROM commodities.cot_metals_energy WHERE commodity = 'gold'")
+    assert db_cursor.fetchone() == (0,)
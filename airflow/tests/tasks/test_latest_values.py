@@ -0,0 +1,60 @@
+"""
+metadata.refresh_latest_values and the latest_* views
+"""
+
+
+def _observe(cur, series_id, date, value, vintage):
+    cur.execute(
+        "INSERT INTO metadata.observations (series_id, date, value, vintage) VALUES (%s, %s, %s, %s)",
+        (series_id, date, value, vintage)
+    )
+
+
+def _latest(cur, series_id):
+    cur.execute(
+        "SELECT date::text, value, previous_date::text, previous_value FROM metadata.latest_values "
+        "WHERE series_id = %s",
+        (series_id,)
+    )
+    return cur.fetchone()
+
+
+def test_refresh_skips_dates_whose_latest_vintage_is_null(db_cursor):
+    _observe(db_cursor, 'TEST.LV', '2024-01-01', 1, '2024-01-05')
+    _observe(db_cursor, 'TEST.LV', '2024-02-01', 2, '2024-02-05')
+    _observe(db_cursor, 'TEST.LV', '2024-03-01', 3, '2024-03-05')
+    db_cursor.execute("SELECT metadata.refresh_latest_values(ARRAY['TEST.LV'])")
+    assert _latest(db_cursor, 'TEST.LV') == ('2024-03-01', 3, '2024-02-01', 2)
+
+    # March is deleted: it falls back to February, not to an older March value
+    _observe(db_cursor, 'TEST.LV', '2024-03-01', None, '2024-03-10')
+    db_cursor.execute("SELECT metadata.refresh_latest_values(ARRAY['TEST.LV'])")
+    assert db_cursor.fetchone() == (1,)
+    assert _latest(db_cursor, 'TEST.LV') == ('2024-02-01', 2, '2024-01-01', 1)
+
+
+def test_refresh_removes_series_with_no_value_left(db_cursor):
+    _observe(db_cursor, 'TEST.LV', '2024-01-01', 1, '2024-01-05')
+    db_cursor.execute("SELECT metadata.refresh_latest_values(ARRAY['TEST.LV'])")
+    _observe(db_cursor, 'TEST.LV', '2024-01-01', None, '2024-01-10')
+
+    db_cursor.execute("SELECT metadata.refresh_latest_values(ARRAY['TEST.LV'])")
+
+    assert db_cursor.fetchone() == (1,)
+    assert _latest(db_cursor, 'TEST.LV') is None
+
+
+def test_latest_views_fall_back_to_the_table_without_watermarks(db_cursor):
+    db_cursor.execute("DELETE FROM metadata.series_watermarks WHERE table_name = 'ism_manufacturing'")
+    db_cursor.execute("DELETE FROM survey_data.ism_manufacturing")
+    db_cursor.execute("INSERT INTO survey_data.ism_manufacturing (date, pmi) VALUES ('2024-01-01', 49), ('2024-02-01', 51)")
+
+    db_cursor.execute("SELECT date::text, pmi FROM survey_data.latest_ism_manufacturing")
+    assert db_cursor.fetchall() == [('2024-02-01', 51)]
+
+    db_cursor.execute(
+        "INSERT INTO metadata.series_watermarks (schema_name, table_name, series_id, last_date) "
+        "VALUES ('survey_data', 'ism_manufacturing', '', '2024-01-01')"
+    )
+    db_cursor.execute("SELECT date::text, pmi FROM survey_data.latest_ism_manufacturing")
+    assert db_cursor.fetchall() == [('2024-01-01', 49)]
@@ -0,0 +1,103 @@
+"""
+metadata.project_observations against the schema, for every registry spec
+"""
+
+import pytest
+
+from tasks.series_loader import series_catalog_entry
+from tasks.series_registry import BLS_SERIES, FRED_SERIES
+from tasks.utils import _register_series, catalog_entry
+
+
+def _write(cur, catalog, date='2024-01-01', value=42):
+    _register_series(cur, catalog)
+    cur.execute(
+        """
+        INSERT INTO metadata.observations (series_id, date, value, vintage)
+        SELECT series_id, %s, %s, %s FROM unnest(%s::text[]) AS s(series_id)
+        """,
+        (date, value, date, [entry['series_id'] for entry in catalog])
+    )
+
+
+def _project(cur, schema, table, date='2024-01-01'):
+    cur.execute(
+        "SELECT rows_inserted, rows_updated FROM metadata.project_observations(%s, %s, %s, %s)",
+        (schema, table, date, date)
+    )
+    return cur.fetchone()
+
+
+def test_every_registry_spec_projects_into_its_table(db_cursor):
+    specs = FRED_SERIES + BLS_SERIES
+    _write(db_cursor, [series_catalog_entry(spec, 'FRED') for spec in specs])
+
+    for schema, table in sorted({(spec['schema'], spec['table']) for spec in specs}):
+        inserted, _ = _project(db_cursor, schema, table)
+        assert inserted > 0, f"{schema}.{table}"
+
+    for spec in specs:
+        entry = series_catalog_entry(spec, 'FRED')
+        filters = ' AND '.join(f"{column} = %s" for column in entry['dimensions'])
+        db_cursor.execute(
+            f"SELECT {spec['value_column']} FROM {spec['schema']}.{spec['table']} "
+            f"WHERE date = '2024-01-01'" + (f" AND {filters}" if filters else ''),
+            list(entry['dimensions'].values())
+        )
+        assert db_cursor.fetchall() == [(pytest.approx(42),)], spec['series_id']
+
+
+def test_projection_fills_the_derived_columns_of_registry_tables(db_cursor):
+    specs = FRED_SERIES + BLS_SERIES
+    _register_series(db_cursor, [series_catalog_entry(spec, 'FRED') for spec in specs])
+    # 100 for twelve months, then 104: every mom and yoy change is 4%, avg4 101
+    db_cursor.execute(
+        """
+        INSERT INTO metadata.observations (series_id, date, value, vintage)
+        SELECT series_id, d, CASE WHEN d = '2025-01-01' THEN 104 ELSE 100 END, '2025-02-01'
+        FROM unnest(%s::text[]) AS s(series_id),
+             generate_series('2024-01-01'::date, '2025-01-01', INTERVAL '1 month') AS d
+        """,
+        ([spec['series_id'] for spec in specs],)
+    )
+    tables = sorted({(spec['schema'], spec['table']) for spec in specs})
+    for schema, table in tables:
+        db_cursor.execute("SELECT metadata.project_observations(%s, %s, '2024-01-01', '2025-01-01')", (schema, table))
+
+    db_cursor.execute(
+        "SELECT schema_name, table_name, target_column, transform FROM metadata.derived_columns "
+        "WHERE (schema_name, table_name) IN (SELECT * FROM unnest(%s::text[], %s::text[]))",
+        ([schema for schema, _ in tables], [table for _, table in tables])
+    )
+    derived = db_cursor.fetchall()
+    assert ('coincident_indicators', 'durable_goods_shipments', 'percent_change', 'mom') in derived
+    for schema, table, column, transform in derived:
+        db_cursor.execute(
+            f"SELECT DISTINCT {column} FROM {schema}.{table} WHERE date = '2025-01-01' AND {column} IS NOT NULL"
+        )
+        expected = 101 if transform == 'avg4' else 4
+        assert db_cursor.fetchall() == [(pytest.approx(expected),)], f"{schema}.{table}.{column}"
+
+
+def test_unknown_value_column_raises(db_cursor):
+    _write(db_cursor, [catalog_entry('TEST.UNKNOWN', 'TEST', 'general_macro', 'm2_money_supply', 'shipment_value',
+                                     dimensions={'series_id': 'TEST.UNKNOWN'})])
+
+    with pytest.raises(Exception, match='shipment_value'):
+        _project(db_cursor, 'general_macro', 'm2_money_supply')
+
+
+def test_unknown_dimension_raises(db_cursor):
+    _write(db_cursor, [catalog_entry('TEST.SOURCE', 'TEST', 'general_macro', 'm2_money_supply', 'm2_value',
+                                     dimensions={'series_id': 'TEST.SOURCE', 'source': 'FRED'})])
+
+    with pytest.raises(Exception, match='TEST.SOURCE.source'):
+        _project(db_cursor, 'general_macro', 'm2_money_supply')
+
+
+def test_unset_key_column_raises(db_cursor):
+    _write(db_cursor, [catalog_entry('TEST.GOLD', 'TEST', 'commodities', 'commodity_prices', 'price',
+                                     dimensions={'commodity_name': 'gold'})])
+
+    with pytest.raises(Exception, match='TEST.GOLD.price_type'):
+        _project(db_cursor, 'commodities', 'commodity_prices')
@@ -0,0 +1,202 @@
+"""
+Registry loaders, with the API clients and database replaced by recorders
+"""
+
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from api_clients import SeriesFetchError
+from tasks import series_loader
+from tasks.series_registry import FRED_SERIES_BY_ID
+
+# dag_run of a run triggered with {"full_refresh": true}, which skips the upstream change check
+FULL_REFRESH = SimpleNamespace(conf={'full_refresh': True})
+
+
+class FakeFREDClient:
+    def __init__(self, frames, errors=None):
+        self.frames = frames
+        self.errors = errors or {}
+        self.confirmed = False
+
+    def get_many_series(self, series_ids, start_dates=None, end_date=None, if_changed=False):
+        if self.errors:
+            raise SeriesFetchError(self.errors, self.frames)
+        return self.frames
+
+    def confirm_loaded(self):
+        self.confirmed = True
+
+    def cache_stats(self):
+        return {}
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Record writes, update logs and loaded marks instead of touching the database"""
+    recorded = {'written': [], 'logged': [], 'marked': []}
+
+    def write_observations(observations, catalog):
+        recorded['written'].append(sorted(observations['series_id'].unique()))
+        return {(entry['target_schema'], entry['target_table']): (len(observations), 0) for entry in catalog}
+
+    monkeypatch.setattr(series_loader, 'write_observations', write_observations)
+    monkeypatch.setattr(series_loader, 'log_update', lambda schema, table, added, status, **kwargs:
+                        recorded['logged'].append((f"{schema}.{table}", status)))
+    monkeypatch.setattr(series_loader, 'mark_fred_series_loaded', recorded['marked'].extend)
+    monkeypatch.setattr(series_loader, '_start_dates', lambda specs, full_refresh: {
+        spec['series_id']: spec['default_start'] for spec in specs
+    })
+    return recorded
+
+
+def frame(*values):
+    return pd.DataFrame({'date': pd.date_range('2024-01-01', periods=len(values), freq='MS'), 'value': values})
+
+
+def test_fred_fetch_errors_fail_the_task_after_loading_the_rest(monkeypatch, loads):
+    client = FakeFREDClient({'INDPRO': frame(101.0, 102.0)}, errors={'ICSA': RuntimeError('circuit open')})
+    monkeypatch.setattr(series_loader, 'get_fred_client', lambda: client)
+
+    with pytest.raises(RuntimeError, match='ICSA'):
+        series_loader.load_fred_series(['INDPRO', 'ICSA'], dag_run=FULL_REFRESH)
+
+    icsa = FRED_SERIES_BY_ID['ICSA']
+    assert loads['written'] == [['INDPRO']]
+    assert loads['marked'] == ['INDPRO']
+    assert (f"{icsa['schema']}.{icsa['table']}", 'failed') in loads['logged']
+    assert not client.confirmed
+
+
+class FakeALFREDClient:
+    """Yields each series' vintage pages, raising where a page is an exception"""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def iter_vintage_pages(self, series_id, realtime_start=None):
+        for page in self.pages[series_id]:
+            if isinstance(page, Exception):
+                raise page
+            yield page
+
+
+def vintage_page(*values):
+    return frame(*values).assign(realtime_start=pd.Timestamp('2024-06-01'))
+
+
+def test_vintages_are_marked_loaded_only_for_series_whose_pages_all_loaded(monkeypatch):
+    written, marked, logged = [], [], []
+    monkeypatch.setenv('STREAM_CHUNK_ROWS', '1')
+    monkeypatch.setattr(series_loader, 'write_vintages', lambda vintages, catalog: written.extend(
+        vintages['series_id']) or {})
+    monkeypatch.setattr(series_loader, 'mark_vintages_loaded', lambda series_ids, through: marked.extend(series_ids))
+    monkeypatch.setattr(series_loader, 'log_update', lambda schema, table, added, status, **kwargs:
+                        logged.append((f"{schema}.{table}", status)))
+    client = FakeALFREDClient({
+        'INDPRO': [vintage_page(101.0), vintage_page(102.0)],
+        'ICSA': [vintage_page(210000.0), RuntimeError('HTTP 500')],
+    })
+    specs = [FRED_SERIES_BY_ID['INDPRO'], FRED_SERIES_BY_ID['ICSA']]
+
+    with pytest.raises(RuntimeError, match='ICSA'):
+        series_loader.load_fred_vintages(specs, full_refresh=True, fred_client=client)
+
+    icsa = FRED_SERIES_BY_ID['ICSA']
+    assert written == ['INDPRO', 'INDPRO', 'ICSA']
+    assert marked == ['INDPRO']
+    assert (f"{icsa['schema']}.{icsa['table']}", 'failed') in logged
+
+
+def eia_page(rows):
+    """EIA data rows of (series_id, date, value, unit)"""
+    return pd.DataFrame(rows, columns=['series_id', 'date', 'value', 'unit']).assign(
+        date=lambda page: pd.to_datetime(page['date'])
+    )
+
+
+def demand_supply_units(catalog):
+    return {entry['series_id']: entry['dimensions']['unit']
+            for entry in catalog if entry['target_table'] == 'demand_supply_factors'}
+
+
+def test_eia_factor_rows_wait_for_their_commodity_flow_unit():
+    to_observations = series_loader._EIAObservations(series_loader.EIA_SERIES)
+
+    observations, catalog = to_observations(eia_page([
+        ('WCESTUS1', '2024-01-05', 430000, 'MBBL'),
+        ('NW2_EPG0_SWO_R48_BCF', '2024-01-05', 3300, 'BCF'),
+    ]))
+    assert demand_supply_units(catalog) == {'NW2_EPG0_SWO_R48_BCF': 'BCF'}
+    assert len(observations) == 2
+
+    observations, catalog = to_observations(eia_page([('WCRFPUS2', '2024-01-12', 13300, 'MBBL/D')]))
+    assert demand_supply_units(catalog) == {'WCRFPUS2': 'MBBL/D', 'WCESTUS1': 'MBBL/D'}
+    assert sorted(observations['series_id']) == ['WCESTUS1', 'WCRFPUS2']
+
+    observations, catalog = to_observations(eia_page([('WCESTUS1', '2024-01-12', 429000, 'MBBL')]))
+    assert demand_supply_units(catalog) == {'WCESTUS1': 'MBBL/D'}
+    assert to_observations.held().empty
+
+
+def test_eia_rows_still_held_at_the_end_take_the_stock_unit():
+    to_observations = series_loader._EIAObservations(series_loader.EIA_SERIES)
+    to_observations(eia_page([('WGTSTUS1', '2024-01-05', 230000, 'MBBL')]))
+
+    held = to_observations.held()
+    assert held['series_id'].tolist() == ['WGTSTUS1']
+    assert demand_supply_units(series_loader._demand_supply_catalog(held)) == {'WGTSTUS1': 'MBBL'}
+
+
+class FakeEIAClient:
+    def __init__(self, *pages):
+        self.pages = pages
+
+    def iter_data(self, route, series_ids, frequency, start=None, end=None, page_size=None):
+        return (page[page['series_id'].isin(series_ids)] for page in self.pages)
+
+
+def test_eia_stream_projects_factors_of_every_chunk(db_cursor, db_hook, monkeypatch):
+    from tasks import utils
+    monkeypatch.setattr(utils, 'get_db_hook', lambda: db_hook)
+    monkeypatch.setattr(series_loader, 'log_update', lambda *args, **kwargs: None)
+    monkeypatch.setenv('STREAM_CHUNK_ROWS', '1')
+    monkeypatch.setattr(series_loader, 'get_eia_client', lambda: FakeEIAClient(
+        eia_page([('WDISTUS1', '2023-12-29', 119000, 'MBBL')]),
+        eia_page([('WDISTUS1', '2024-01-05', 120000, 'MBBL')]),
+        eia_page([('WDIRPUS2', '2024-01-05', 4800, 'MBBL/D')]),
+        eia_page([('WDIUPUS2', '2024-01-05', 3700, 'MBBL/D')]),
+    ))
+
+    series_loader.load_eia_series(['WDISTUS1', 'WDIRPUS2', 'WDIUPUS2'], dag_run=FULL_REFRESH)
+
+    db_cursor.execute(
+        "SELECT date::text, demand, supply, inventory, unit FROM commodities.demand_supply_factors "
+        "WHERE commodity = 'distillate' ORDER BY date"
+    )
+    assert db_cursor.fetchall() == [
+        ('2023-12-29', None, None, 119000, 'MBBL/D'),
+        ('2024-01-05', 3700, 4800, 120000, 'MBBL/D'),
+    ]
+
+
+def test_start_dates_follow_watermarks_of_tables_without_series_id(db_cursor, db_hook, monkeypatch):
+    from tasks import utils
+    monkeypatch.setattr(utils, 'get_db_hook', lambda: db_hook)
+    specs = [FRED_SERIES_BY_ID[series_id] for series_id in ('GOLDAMGBD228NLBM', 'NAPM', 'DGS10')]
+    observations = pd.concat([series_loader.observation_rows(spec, frame(1.0, 2.0, 3.0)) for spec in specs])
+    utils.write_observations(observations, [series_loader.series_catalog_entry(spec, 'FRED') for spec in specs])
+
+    assert series_loader._start_dates(specs, full_refresh=False) == {
+        'GOLDAMGBD228NLBM': '2024-03-01', 'NAPM': '2024-03-01', 'DGS10': '2024-03-01'
+    }
+    # No empty watermark is recorded under a series id the projection never writes
+    assert utils.get_watermarks([('survey_data', 'ism_manufacturing', 'NAPM')]) == \
+        {('survey_data', 'ism_manufacturing', 'NAPM'): None}
+    db_cursor.execute(
+        "SELECT series_id FROM metadata.series_watermarks "
+        "WHERE schema_name = 'survey_data' AND table_name = 'ism_manufacturing'"
+    )
+    assert db_cursor.fetchall() == [('',)]
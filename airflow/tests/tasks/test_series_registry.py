@@ -0,0 +1,116 @@
+"""
+Every registry spec and catalog builder must project into columns its table has
+"""
+
+import re
+
+import pandas as pd
+import pytest
+
+from tasks.cot_loader import COT_CONTRACTS, COT_REPORT_TYPE, cot_observations
+from tasks.europe_tasks import ecb_yield_observations
+from tasks.global_tasks import GDP_INDICATORS, IMF_COMMODITIES, gdp_observations, imf_observations
+from tasks.series_loader import _demand_supply_catalog, _summary_observations, series_catalog_entry
+from tasks.series_registry import BLS_SERIES, EIA_SERIES, FRED_SERIES, batch_fred_series
+
+
+def assert_projectable(entry, schema_tables):
+    """The checks metadata.project_observations makes before projecting a catalog entry"""
+    name = f"{entry['target_schema']}.{entry['target_table']}"
+    assert name in schema_tables, f"{entry['series_id']}: no table {name}"
+    table = schema_tables[name]
+
+    assert entry['target_column'] in table['columns'], \
+        f"{entry['series_id']}: {name} has no column {entry['target_column']}"
+    unknown = set(entry['dimensions']) - set(table['columns'])
+    assert not unknown, f"{entry['series_id']}: {name} has no columns {sorted(unknown)}"
+    unset = set(table['primary_key']) - {'date', entry['target_column']} - set(entry['dimensions'])
+    assert not unset, f"{entry['series_id']}: primary key columns {sorted(unset)} of {name} unset"
+
+
+@pytest.mark.parametrize(
+    'spec', FRED_SERIES + BLS_SERIES, ids=lambda spec: spec['series_id']
+)
+def test_registry_spec_matches_schema(spec, schema_tables):
+    table = schema_tables[f"{spec['schema']}.{spec['table']}"]
+
+    assert spec['conflict_columns'] == table['primary_key']
+    assert spec.get('series_id_column', True) == ('series_id' in table['columns'])
+    assert_projectable(series_catalog_entry(spec, 'FRED'), schema_tables)
+
+
+def derived_columns(sql):
+    """(table, target column, source columns, partition columns) of metadata.derived_columns"""
+    rows = sql[sql.index('INSERT INTO metadata.derived_columns'):]
+    rows = rows[:rows.index('ON CONFLICT')]
+    return [
+        (f"{schema}.{table}", target, re.findall(r'\b[a-z_][a-z0-9_]*\b', source),
+         [column.strip() for column in partition.split(',')])
+        for schema, table, target, source, _, partition
+        in re.findall(r"\('(\w+)', '(\w+)', '(\w+)', '([^']+)', '(\w+)', '([^']+)'\)", rows)
+    ]
+
+
+def test_derived_columns_read_columns_the_registry_fills(init_sql, schema_tables):
+    derived = derived_columns(init_sql)
+    assert derived
+
+    for name, target, sources, partition in derived:
+        columns = schema_tables[name]['columns']
+        assert target in columns, f"{name} has no column {target}"
+        unknown = set(sources + partition) - set(columns)
+        assert not unknown, f"{name}.{target} reads missing columns {sorted(unknown)}"
+
+        filled = {spec['value_column'] for spec in FRED_SERIES + BLS_SERIES
+                  if f"{spec['schema']}.{spec['table']}" == name}
+        assert not filled or filled & set(sources), \
+            f"{name}.{target} reads {sources}, the registry fills {sorted(filled)}"
+
+
+def test_series_sharing_a_table_share_conflict_columns():
+    keys = {}
+    for spec in FRED_SERIES + BLS_SERIES:
+        keys.setdefault((spec['schema'], spec['table']), set()).add(tuple(spec['conflict_columns']))
+    assert {table: key for table, key in keys.items() if len(key) > 1} == {}
+
+
+def test_eia_catalogs_match_schema(schema_tables):
+    observations = pd.DataFrame({
+        'series_id': [spec['series_id'] for spec in EIA_SERIES],
+        'date': pd.Timestamp('2024-01-05'),
+        'value': 1.0,
+        'unit': 'MBBL',
+    })
+
+    _, summary = _summary_observations(observations)
+    for entry in summary + _demand_supply_catalog(observations):
+        assert_projectable(entry, schema_tables)
+
+
+def test_loader_catalogs_match_schema(schema_tables):
+    date = pd.Timestamp('2024-01-01')
+    world_bank = pd.DataFrame({'country': 'US', 'indicator': list(GDP_INDICATORS), 'date': date, 'value': 1.0})
+    imf = pd.DataFrame({'indicator': list(IMF_COMMODITIES), 'unit': 'USD', 'date': date, 'value': 1.0})
+    ecb = pd.DataFrame({'series_id': ['YC.B.U2.EUR.4F.G_N_A.SV_C_YM.SR_10Y'], 'country': ['EA'],
+                        'maturity': ['10Y'], 'date': [date], 'yield': [2.5]})
+    cot = pd.DataFrame({
+        'contract_code': list(COT_CONTRACTS), 'type': COT_REPORT_TYPE, 'date': date,
+        'market_participation': 10, 'commercial_longs': 4, 'commercial_shorts': 5,
+        'noncommercial_longs': 3, 'noncommercial_shorts': 2,
+    })
+
+    for _, catalog in (gdp_observations(world_bank), imf_observations(imf),
+                       ecb_yield_observations(ecb), cot_observations(cot)):
+        assert catalog
+        for entry in catalog:
+            assert_projectable(entry, schema_tables)
+
+
+def test_batch_fred_series_covers_registry_in_table_order():
+    batches = batch_fred_series(4)
+
+    assert all(len(batch) <= 4 for batch in batches)
+    assert sorted(sum(batches, [])) == sorted(spec['series_id'] for spec in FRED_SERIES)
+    tables = [(spec['schema'], spec['table']) for spec in FRED_SERIES]
+    order = {spec['series_id']: (spec['schema'], spec['table']) for spec in FRED_SERIES}
+    assert [order[series_id] for series_id in sum(batches, [])] == sorted(tables)
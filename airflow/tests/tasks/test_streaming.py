@@ -0,0 +1,53 @@
+"""
+Streaming loads: rechunking and the producer/consumer pipeline
+"""
+
+import pandas as pd
+import pytest
+
+from tasks.streaming import rechunk, stream_observations
+
+
+def frame(start, rows):
+    return pd.DataFrame({'n': range(start, start + rows)})
+
+
+def test_rechunk_regroups_into_fixed_size_chunks():
+    chunks = list(rechunk([frame(0, 3), frame(3, 0), frame(3, 6), frame(9, 1)], 4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert pd.concat(chunks)['n'].tolist() == list(range(10))
+
+
+def test_rechunk_of_nothing_yields_nothing():
+    assert list(rechunk([frame(0, 0)], 4)) == []
+
+
+def test_stream_observations_writes_every_chunk():
+    written = []
+
+    def to_observations(chunk):
+        return chunk, [{'rows': len(chunk)}]
+
+    def write(observations, catalog):
+        written.append(observations['n'].tolist())
+        return {('s', 't'): (len(observations), 0)}
+
+    counts = stream_observations(iter([frame(0, 5), frame(5, 2)]), to_observations,
+                                 chunk_rows=3, queue_size=1, write=write)
+
+    assert written == [[0, 1, 2], [3, 4, 5], [6]]
+    assert counts == {('s', 't'): (7, 0)}
+
+
+def test_stream_observations_raises_fetch_errors_after_loading_earlier_pages():
+    written = []
+
+    def pages():
+        yield frame(0, 2)
+        raise ConnectionError('page 2 failed')
+
+    with pytest.raises(ConnectionError, match='page 2'):
+        stream_observations(pages(), lambda chunk: (chunk, []), chunk_rows=2,
+                            write=lambda observations, catalog: written.append(len(observations)) or {})
+    assert written == [2]
@@ -0,0 +1,40 @@
+"""
+Incremental load windows: full refresh triggers and watermark lookback
+"""
+
+from types import SimpleNamespace
+
+import pendulum
+import pytest
+
+from tasks.utils import is_full_refresh, start_from_watermark
+
+
+def context(day, conf=None):
+    return {'dag_run': SimpleNamespace(conf=conf), 'logical_date': pendulum.datetime(2024, 5, day)}
+
+
+def test_full_refresh_on_request_or_on_the_refresh_day(monkeypatch):
+    monkeypatch.delenv('FULL_REFRESH_DAY_OF_MONTH', raising=False)
+
+    assert is_full_refresh(context(1))
+    assert not is_full_refresh(context(2))
+    assert is_full_refresh(context(2, {'full_refresh': True}))
+    assert not is_full_refresh({})
+
+
+@pytest.mark.parametrize('refresh_day, day, expected', [('15', 15, True), ('15', 1, False), ('0', 1, False)])
+def test_full_refresh_day_is_configurable(monkeypatch, refresh_day, day, expected):
+    monkeypatch.setenv('FULL_REFRESH_DAY_OF_MONTH', refresh_day)
+
+    assert is_full_refresh(context(day)) is expected
+
+
+def test_start_from_watermark_steps_back_the_revision_window(monkeypatch):
+    monkeypatch.setenv('REVISION_LOOKBACK_MONTHS', '3')
+
+    assert start_from_watermark(None, '2000-01-01') == '2000-01-01'
+    assert start_from_watermark('2024-05-31', '2000-01-01') == '2024-02-29'
+    assert start_from_watermark('2024-05-31', '2000-01-01', lookback_months=12) == '2023-05-31'
+    # Never earlier than the default start
+    assert start_from_watermark('2000-03-01', '2000-01-01') == '2000-01-01'
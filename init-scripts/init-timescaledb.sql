@@ -45,6 +45,96 @@ CREATE TABLE IF NOT EXISTS metadata.data_updates (
     completed_at TIMESTAMPTZ
 );
 
+-- Upstream revision timestamps of FRED series, used to skip unchanged series,
+-- and the date through which their ALFRED vintages are loaded
+CREATE TABLE IF NOT EXISTS metadata.fred_series_updates (
+    series_id TEXT PRIMARY KEY,
+    last_updated TIMESTAMPTZ,
+    loaded_last_updated TIMESTAMPTZ,
+    checked_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    loaded_at TIMESTAMPTZ,
+    vintages_loaded_through DATE
+);
+
+-- Per-series load watermarks, maintained by the loaders in the same transaction
+-- as each load; series_id is '' for tables without one
+CREATE TABLE IF NOT EXISTS metadata.series_watermarks (
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    series_id TEXT NOT NULL,
+    last_date DATE,
+    last_loaded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    row_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (schema_name, table_name, series_id)
+);
+
+-- Backfill checkpoints: one row per date range of a series, so an interrupted
+-- backfill resumes with the ranges that are not done yet
+CREATE TABLE IF NOT EXISTS metadata.backfill_chunks (
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    series_id TEXT NOT NULL,
+    chunk_start DATE NOT NULL,
+    chunk_end DATE NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    records_added INTEGER NOT NULL DEFAULT 0,
+    records_updated INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (schema_name, table_name, series_id, chunk_start)
+);
+
+-- Bulk export snapshots: the point in time a datatable export was last loaded
+-- up to, so later runs can apply only the delta files published since
+CREATE TABLE IF NOT EXISTS metadata.bulk_exports (
+    table_code TEXT PRIMARY KEY,
+    snapshot_time TIMESTAMPTZ NOT NULL,
+    export_type VARCHAR(20) NOT NULL,
+    loaded_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Catalog of every loaded series and the table column it is projected into.
+-- dimensions holds the other columns of the target row (key columns and
+-- constants), e.g. {"series_id": "DGS10", "country": "US", "maturity": "10Y"};
+-- series that fill different columns of the same row share their dimensions.
+-- A series may be projected into more than one table.
+CREATE TABLE IF NOT EXISTS metadata.series_catalog (
+    series_id TEXT NOT NULL,
+    source VARCHAR(20) NOT NULL,
+    name TEXT,
+    frequency VARCHAR(20),
+    units TEXT,
+    target_schema TEXT NOT NULL,
+    target_table TEXT NOT NULL,
+    target_column TEXT NOT NULL,
+    dimensions JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (series_id, target_schema, target_table)
+);
+
+CREATE INDEX IF NOT EXISTS idx_series_catalog_target ON metadata.series_catalog (target_schema, target_table);
+
+-- Every observation of every catalogued series in long format. vintage is the
+-- date a value was loaded; a revised value is stored as a new vintage, so the
+-- values seen on earlier dates are kept. The data tables are projections of
+-- the latest vintage (metadata.project_observations).
+CREATE TABLE IF NOT EXISTS metadata.observations (
+    series_id TEXT NOT NULL,
+    date DATE NOT NULL,
+    value NUMERIC,
+    vintage DATE NOT NULL DEFAULT CURRENT_DATE,
+    PRIMARY KEY (series_id, date, vintage)
+);
+
+SELECT create_hypertable('metadata.observations', 'date', if_not_exists => TRUE);
+
+-- Latest vintage of every observation
+CREATE OR REPLACE VIEW metadata.latest_observations AS
+SELECT DISTINCT ON (series_id, date) series_id, date, value, vintage
+FROM metadata.observations
+ORDER BY series_id, date, vintage DESC;
+
 -- =============================================================================
 -- CHINA SCHEMA
 -- =============================================================================
@@ -511,27 +601,571 @@ CREATE INDEX IF NOT EXISTS idx_ism_mfg_date ON survey_data.ism_manufacturing (da
 CREATE INDEX IF NOT EXISTS idx_ism_nonmfg_date ON survey_data.ism_non_manufacturing (date DESC);
 CREATE INDEX IF NOT EXISTS idx_nfib_date ON survey_data.nfib_optimism (date DESC);
 
+-- =============================================================================
+-- HYPERTABLE CHUNKING AND COMPRESSION
+-- =============================================================================
+
+-- Chunk interval and compression settings per hypertable. Chunks are sized by
+-- publication frequency so that each holds a useful number of rows (the 7-day
+-- default gives every monthly observation a chunk of its own); compression
+-- segments by the series key columns and starts once chunks are older than
+-- the dates routine loads rewrite: the revision window (REVISION_LOOKBACK_MONTHS,
+-- 36 months for annual GDP) plus the 12 months of derived columns a revision
+-- moves. A NULL compress_after leaves the table uncompressed: metadata.observations
+-- takes vintages, revisions and deletions at any date.
+CREATE TABLE IF NOT EXISTS metadata.hypertable_settings (
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    frequency VARCHAR(20) NOT NULL,
+    chunk_interval INTERVAL NOT NULL,
+    segment_by TEXT NOT NULL DEFAULT '',
+    compress_after INTERVAL DEFAULT INTERVAL '2 years',
+    PRIMARY KEY (schema_name, table_name)
+);
+
+INSERT INTO metadata.hypertable_settings (schema_name, table_name, frequency, chunk_interval, segment_by, compress_after) VALUES
+('china', 'manufacturing_pmi', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('china', 'real_rates', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('china', 'consumer_price_index', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('coincident_indicators', 'durable_goods_shipments', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('coincident_indicators', 'employment_situation', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('coincident_indicators', 'industrial_production', 'Monthly', INTERVAL '10 years', 'series_id, industry_category', INTERVAL '2 years'),
+('coincident_indicators', 'jobless_claims', 'Weekly', INTERVAL '5 years', 'series_id', INTERVAL '2 years'),
+('commodities', 'cot_metals_energy', 'Weekly', INTERVAL '5 years', 'commodity', INTERVAL '2 years'),
+('commodities', 'commodity_prices', 'Daily', INTERVAL '1 year', 'commodity_name, price_type', INTERVAL '2 years'),
+('commodities', 'eia_summary', 'Weekly', INTERVAL '5 years', 'series_id', INTERVAL '2 years'),
+('commodities', 'demand_supply_factors', 'Weekly', INTERVAL '5 years', 'commodity', INTERVAL '2 years'),
+('europe', 'benchmark_yields_ecb', 'Daily', INTERVAL '1 year', 'country, maturity', INTERVAL '2 years'),
+('europe', 'economic_sentiment', 'Monthly', INTERVAL '10 years', 'country', INTERVAL '2 years'),
+('europe', 'global_gdp', 'Annual', INTERVAL '50 years', 'country, series_id', INTERVAL '5 years'),
+('fixed_income', 'benchmark_yields', 'Daily', INTERVAL '1 year', 'country, maturity, series_id', INTERVAL '2 years'),
+('fixed_income', 'bond_market_basics', 'Daily', INTERVAL '1 year', 'series_id', INTERVAL '2 years'),
+('fixed_income', 'corporate_bond_indices', 'Daily', INTERVAL '1 year', 'index_name, series_id', INTERVAL '2 years'),
+('general_macro', 'inflation', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('general_macro', 'building_permits', 'Monthly', INTERVAL '10 years', 'series_id, region', INTERVAL '2 years'),
+('general_macro', 'm2_money_supply', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('general_macro', 'usd_trade_weighted', 'Daily', INTERVAL '1 year', 'series_id', INTERVAL '2 years'),
+('survey_data', 'ism_manufacturing', 'Monthly', INTERVAL '10 years', '', INTERVAL '2 years'),
+('survey_data', 'ism_non_manufacturing', 'Monthly', INTERVAL '10 years', '', INTERVAL '2 years'),
+('survey_data', 'nfib_optimism', 'Monthly', INTERVAL '10 years', 'region, industry', INTERVAL '2 years'),
+('survey_data', 'nfib_sentiment_components', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('survey_data', 'umcsi', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('metadata', 'observations', 'Mixed', INTERVAL '1 year', 'series_id', NULL)
+ON CONFLICT (schema_name, table_name) DO UPDATE
+SET frequency = EXCLUDED.frequency, chunk_interval = EXCLUDED.chunk_interval,
+    segment_by = EXCLUDED.segment_by, compress_after = EXCLUDED.compress_after;
+
+-- Function to apply metadata.hypertable_settings (all, or one table). The chunk
+-- interval only applies to chunks created afterwards; compression settings
+-- are left alone on tables that already have compression enabled. The
+-- compression policy is recreated with the current compress_after, and chunks
+-- it no longer covers are decompressed so loads write to them uncompressed.
+-- Tables without compress_after are decompressed entirely.
+CREATE OR REPLACE FUNCTION metadata.apply_hypertable_settings(p_schema TEXT DEFAULT NULL, p_table TEXT DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    s RECORD;
+    hypertable REGCLASS;
+    applied INTEGER := 0;
+BEGIN
+    FOR s IN
+        SELECT hs.*, h.compression_enabled
+        FROM metadata.hypertable_settings hs
+        JOIN timescaledb_information.hypertables h
+          ON h.hypertable_schema = hs.schema_name AND h.hypertable_name = hs.table_name
+        WHERE (p_schema IS NULL OR hs.schema_name = p_schema)
+          AND (p_table IS NULL OR hs.table_name = p_table)
+    LOOP
+        hypertable := format('%I.%I', s.schema_name, s.table_name)::regclass;
+        PERFORM set_chunk_time_interval(hypertable, s.chunk_interval);
+        IF s.compression_enabled THEN
+            PERFORM remove_compression_policy(hypertable, if_exists => TRUE);
+            PERFORM decompress_chunk(c, if_compressed => TRUE)
+            FROM show_chunks(hypertable) c
+            WHERE s.compress_after IS NULL
+               OR c NOT IN (SELECT show_chunks(hypertable, older_than => s.compress_after));
+        END IF;
+
+        IF s.compress_after IS NULL THEN
+            IF s.compression_enabled THEN
+                EXECUTE format('ALTER TABLE %s SET (timescaledb.compress = false)', hypertable);
+            END IF;
+        ELSE
+            IF NOT s.compression_enabled THEN
+                EXECUTE format(
+                    'ALTER TABLE %s SET (timescaledb.compress, timescaledb.compress_segmentby = %L, timescaledb.compress_orderby = %L)',
+                    hypertable, s.segment_by, 'date DESC'
+                );
+            END IF;
+            PERFORM add_compression_policy(hypertable, s.compress_after);
+        END IF;
+        applied := applied + 1;
+    END LOOP;
+    RETURN applied;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT metadata.apply_hypertable_settings();
+
+-- =============================================================================
+-- DERIVED COLUMNS
+-- =============================================================================
+
+-- Derived columns (YoY, MoM, 4-week averages) kept up to date in the data
+-- tables themselves. Continuous aggregates cannot hold window functions such
+-- as LAG, so the columns are refreshed incrementally by
+-- metadata.project_observations for the date range each load touched.
+--   transform   yoy:  % change from the observation exactly 12 months earlier
+--               mom:  % change from the previous observation
+--               avg4: average of the last 4 observations (NULL until 4 exist)
+--   source_expr SQL expression over the row the transform is applied to
+--   partition_by columns identifying one series within the table
+CREATE TABLE IF NOT EXISTS metadata.derived_columns (
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    target_column TEXT NOT NULL,
+    source_expr TEXT NOT NULL,
+    transform VARCHAR(10) NOT NULL CHECK (transform IN ('yoy', 'mom', 'avg4')),
+    partition_by TEXT NOT NULL DEFAULT 'series_id',
+    PRIMARY KEY (schema_name, table_name, target_column)
+);
+
+INSERT INTO metadata.derived_columns (schema_name, table_name, target_column, source_expr, transform, partition_by) VALUES
+('coincident_indicators', 'durable_goods_shipments', 'percent_change', 'value', 'mom', 'series_id'),
+('coincident_indicators', 'industrial_production', 'percent_change', 'index_value', 'mom', 'series_id, industry_category'),
+('coincident_indicators', 'jobless_claims', 'four_week_moving_avg', 'initial_claims', 'avg4', 'series_id'),
+('general_macro', 'inflation', 'cpi_yoy_change', 'COALESCE(cpi_all_items, cpi_core)', 'yoy', 'series_id'),
+('general_macro', 'inflation', 'ppi_yoy_change', 'COALESCE(ppi_all_commodities, ppi_core)', 'yoy', 'series_id'),
+('general_macro', 'm2_money_supply', 'm2_yoy_change', 'm2_value', 'yoy', 'series_id')
+ON CONFLICT (schema_name, table_name, target_column) DO UPDATE
+SET source_expr = EXCLUDED.source_expr, transform = EXCLUDED.transform, partition_by = EXCLUDED.partition_by;
+
+-- Function to recompute a table's derived columns for rows from p_since on.
+-- Observations up to 13 months before p_since are read for the windows; rows
+-- are updated up to 12 months past p_until (default: all), since a changed
+-- value moves the derived values of later rows. Returns the rows changed.
+CREATE OR REPLACE FUNCTION metadata.refresh_derived_columns(p_schema TEXT, p_table TEXT,
+                                                            p_since DATE, p_until DATE DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    d RECORD;
+    window_spec TEXT;
+    derived_expr TEXT;
+    join_clause TEXT;
+    column_type TEXT;
+    v_until DATE := p_until + INTERVAL '12 months';
+    updated INTEGER := 0;
+    affected INTEGER;
+BEGIN
+    FOR d IN
+        SELECT * FROM metadata.derived_columns
+        WHERE schema_name = p_schema AND table_name = p_table
+    LOOP
+        window_spec := format('PARTITION BY %s ORDER BY date', d.partition_by);
+        derived_expr := CASE d.transform
+            WHEN 'yoy' THEN format(
+                'ROUND((src / NULLIF(FIRST_VALUE(src) OVER (%s RANGE BETWEEN INTERVAL ''12 months'' PRECEDING AND INTERVAL ''12 months'' PRECEDING), 0) - 1) * 100, 4)',
+                window_spec)
+            WHEN 'mom' THEN format(
+                'ROUND((src / NULLIF(LAG(src) OVER (%s), 0) - 1) * 100, 4)',
+                window_spec)
+            WHEN 'avg4' THEN format(
+                'CASE WHEN COUNT(src) OVER (%1$s ROWS 3 PRECEDING) = 4 THEN ROUND(AVG(src) OVER (%1$s ROWS 3 PRECEDING), 4) END',
+                window_spec)
+        END;
+        -- Cast to the column's type so unchanged values are not rewritten
+        SELECT format_type(atttypid, atttypmod) INTO column_type
+        FROM pg_attribute
+        WHERE attrelid = format('%I.%I', d.schema_name, d.table_name)::regclass AND attname = d.target_column;
+        derived_expr := format('(%s)::%s', derived_expr, column_type);
+
+        SELECT string_agg(format('t.%1$I IS NOT DISTINCT FROM x.%1$I', trim(col)), ' AND ')
+        INTO join_clause
+        FROM unnest(string_to_array(d.partition_by, ',')) AS col;
+
+        EXECUTE format(
+            'UPDATE %1$I.%2$I t SET %3$I = x.derived
+             FROM (
+                 SELECT * FROM (
+                     SELECT %4$s, date, %5$s AS derived
+                     FROM (
+                         SELECT %4$s, date, (%6$s)::numeric AS src
+                         FROM %1$I.%2$I
+                         WHERE date >= $1 - INTERVAL ''13 months'' AND ($2 IS NULL OR date <= $2)
+                     ) s
+                 ) w
+                 WHERE date >= $1
+             ) x
+             WHERE t.date = x.date AND %7$s
+               AND t.date >= $1 AND ($2 IS NULL OR t.date <= $2)
+               AND t.%3$I IS DISTINCT FROM x.derived',
+            d.schema_name, d.table_name, d.target_column, d.partition_by,
+            derived_expr, d.source_expr, join_clause
+        ) USING p_since, v_until;
+        GET DIAGNOSTICS affected = ROW_COUNT;
+        updated := updated + affected;
+    END LOOP;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================================================
+-- OBSERVATION PROJECTIONS
+-- =============================================================================
+
+-- Function to project the latest vintage of a table's catalogued series
+-- (metadata.series_catalog) into the table for dates p_since to p_until.
+-- Values are pivoted into their target columns, one row per date and
+-- dimensions; p_series limits the projection to the rows those series fill.
+-- Rows that already hold the same values are left alone. The watermarks of
+-- the projected series and the table's derived columns for the projected
+-- dates are updated in the same transaction. Series projected into
+-- the same row must share the same dimensions. Rows whose series are all
+-- deleted (NULL latest vintage) are not projected. Raises if a catalogued column
+-- or dimension is not a column of the table, or if a series leaves a primary
+-- key column other than date unset.
+CREATE OR REPLACE FUNCTION metadata.project_observations(p_schema TEXT, p_table TEXT, p_since DATE, p_until DATE,
+                                                         p_series TEXT[] DEFAULT NULL,
+                                                         OUT rows_inserted BIGINT, OUT rows_updated BIGINT)
+AS $$
+DECLARE
+    target REGCLASS := format('%I.%I', p_schema, p_table)::regclass;
+    key_columns TEXT;
+    column_list TEXT;
+    select_list TEXT;
+    update_columns TEXT;
+    excluded_columns TEXT;
+    current_columns TEXT;
+    dimension_columns TEXT[];
+    has_series_id BOOLEAN;
+    conflict_sql TEXT;
+    invalid TEXT;
+BEGIN
+    SELECT string_agg(format('%I', a.attname), ', ')
+    INTO key_columns
+    FROM pg_index i
+    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+    WHERE i.indrelid = target AND i.indisprimary;
+    IF key_columns IS NULL THEN
+        RAISE EXCEPTION '% has no primary key to project observations into', target;
+    END IF;
+
+    SELECT string_agg(DISTINCT format('%s.%s', c.series_id, k.col), ', ')
+    INTO invalid
+    FROM metadata.series_catalog c
+    CROSS JOIN LATERAL (
+        SELECT c.target_column UNION ALL SELECT jsonb_object_keys(c.dimensions)
+    ) AS k(col)
+    WHERE c.target_schema = p_schema AND c.target_table = p_table
+      AND NOT EXISTS (
+          SELECT 1 FROM pg_attribute a
+          WHERE a.attrelid = target AND a.attname = k.col AND a.attnum > 0 AND NOT a.attisdropped
+      );
+    IF invalid IS NOT NULL THEN
+        RAISE EXCEPTION '% has no column for catalogued series columns %', target, invalid;
+    END IF;
+
+    SELECT string_agg(DISTINCT format('%s.%s', c.series_id, a.attname), ', ')
+    INTO invalid
+    FROM metadata.series_catalog c
+    JOIN pg_index i ON i.indrelid = target AND i.indisprimary
+    JOIN pg_attribute a ON a.attrelid = target AND a.attnum = ANY(i.indkey)
+    WHERE c.target_schema = p_schema AND c.target_table = p_table
+      AND a.attname NOT IN ('date', c.target_column)
+      AND NOT c.dimensions ? a.attname;
+    IF invalid IS NOT NULL THEN
+        RAISE EXCEPTION 'Catalogued series leave primary key columns of % unset: %', target, invalid;
+    END IF;
+
+    -- Projected columns: date, the catalogued target columns (pivoted values)
+    -- and the dimension keys
+    WITH catalog AS (
+        SELECT target_column, dimensions FROM metadata.series_catalog
+        WHERE target_schema = p_schema AND target_table = p_table
+    ), row_columns AS (
+        SELECT a.attname::TEXT AS col, a.attnum, format_type(a.atttypid, a.atttypmod) AS col_type,
+               a.attname = 'date' AS is_date,
+               a.attname IN (SELECT target_column FROM catalog) AS is_value,
+               EXISTS (SELECT 1 FROM pg_index i
+                       WHERE i.indrelid = target AND i.indisprimary AND a.attnum = ANY(i.indkey)) AS is_key
+        FROM pg_attribute a
+        WHERE a.attrelid = target AND a.attnum > 0 AND NOT a.attisdropped
+          AND (a.attname = 'date'
+               OR a.attname IN (SELECT target_column FROM catalog)
+               OR a.attname IN (SELECT jsonb_object_keys(dimensions) FROM catalog))
+    )
+    SELECT string_agg(format('%I', col), ', ' ORDER BY attnum),
+           string_agg(CASE
+               WHEN is_date THEN 'l.date'
+               WHEN is_value THEN format('(MAX(l.value) FILTER (WHERE c.target_column = %L))::%s', col, col_type)
+               ELSE format('(c.dims ->> %L)::%s', col, col_type)
+           END, ', ' ORDER BY attnum),
+           string_agg(format('%I', col), ', ' ORDER BY attnum) FILTER (WHERE NOT is_key),
+           string_agg(format('EXCLUDED.%I', col), ', ' ORDER BY attnum) FILTER (WHERE NOT is_key),
+           string_agg(format('t.%I', col), ', ' ORDER BY attnum) FILTER (WHERE NOT is_key),
+           array_agg(col) FILTER (WHERE NOT is_date AND NOT is_value),
+           bool_or(col = 'series_id')
+    INTO column_list, select_list, update_columns, excluded_columns, current_columns,
+         dimension_columns, has_series_id
+    FROM row_columns;
+
+    conflict_sql := CASE WHEN update_columns IS NULL THEN 'DO NOTHING' ELSE format(
+        'DO UPDATE SET (%1$s) = ROW(%2$s) WHERE ROW(%3$s) IS DISTINCT FROM ROW(%2$s)',
+        update_columns, excluded_columns, current_columns
+    ) END;
+
+    EXECUTE format(
+        'WITH catalog AS (
+             SELECT series_id, target_column,
+                    (SELECT COALESCE(jsonb_object_agg(key, value), ''{}'') FROM jsonb_each(dimensions)
+                     WHERE key = ANY($3)) AS dims
+             FROM metadata.series_catalog
+             WHERE target_schema = $1 AND target_table = $2
+         ), selected AS (
+             SELECT * FROM catalog
+             WHERE $4::TEXT[] IS NULL OR dims IN (SELECT dims FROM catalog WHERE series_id = ANY($4))
+         ), latest AS (
+             SELECT DISTINCT ON (o.series_id, o.date) o.series_id, o.date, o.value
+             FROM metadata.observations o
+             WHERE o.series_id IN (SELECT series_id FROM selected) AND o.date BETWEEN $5 AND $6
+             ORDER BY o.series_id, o.date, o.vintage DESC
+         ), upserted AS (
+             INSERT INTO %1$s AS t (%2$s)
+             SELECT %3$s
+             FROM latest l JOIN selected c USING (series_id)
+             GROUP BY l.date, c.dims
+             HAVING bool_or(l.value IS NOT NULL)
+             ON CONFLICT (%4$s) %5$s
+             RETURNING (xmax = 0) AS inserted, %6$s AS series_id, date
+         ), watermarks AS (
+             INSERT INTO metadata.series_watermarks
+                 (schema_name, table_name, series_id, last_date, last_loaded_at, row_count)
+             SELECT $1, $2, series_id, MAX(date), NOW(), COUNT(*) FILTER (WHERE inserted)
+             FROM upserted
+             GROUP BY series_id
+             ON CONFLICT (schema_name, table_name, series_id) DO UPDATE
+             SET last_date = GREATEST(series_watermarks.last_date, EXCLUDED.last_date),
+                 last_loaded_at = EXCLUDED.last_loaded_at,
+                 row_count = series_watermarks.row_count + EXCLUDED.row_count
+         )
+         SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted) FROM upserted',
+        target, column_list, select_list, key_columns, conflict_sql,
+        CASE WHEN has_series_id THEN 'COALESCE(series_id, '''')' ELSE '''''' END
+    ) INTO rows_inserted, rows_updated
+    USING p_schema, p_table, dimension_columns, p_series, p_since, p_until;
+
+    PERFORM metadata.refresh_derived_columns(p_schema, p_table, p_since, p_until);
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================================================
+-- POINT-IN-TIME QUERIES
+-- =============================================================================
+
+-- Values of the given series (all when NULL) as they were known on p_as_of:
+-- for every observation date, the latest vintage on or before that day.
+-- Vintages are ALFRED real-time starts for series loaded in vintage mode and
+-- load dates otherwise; observations unpublished (NULL) as of then are left
+-- out. Answered from the (series_id, date, vintage) primary key.
+CREATE OR REPLACE FUNCTION metadata.observations_as_of(p_as_of DATE, p_series TEXT[] DEFAULT NULL,
+                                                       p_start DATE DEFAULT NULL, p_end DATE DEFAULT NULL)
+RETURNS TABLE (series_id TEXT, date DATE, value NUMERIC, vintage DATE) AS $$
+    SELECT k.series_id, k.date, k.value, k.vintage
+    FROM (
+        SELECT DISTINCT ON (o.series_id, o.date) o.series_id, o.date, o.value, o.vintage
+        FROM metadata.observations o
+        WHERE o.vintage <= p_as_of
+          AND o.date BETWEEN COALESCE(p_start, '-infinity'::date) AND LEAST(COALESCE(p_end, p_as_of), p_as_of)
+          AND (p_series IS NULL OR o.series_id = ANY(p_series))
+        ORDER BY o.series_id, o.date, o.vintage DESC
+    ) k
+    WHERE k.value IS NOT NULL
+$$ LANGUAGE sql STABLE;
+
+-- Newest observation of each given series as known on p_as_of: the
+-- cross-section a backtest sees on that day. One backward index scan per series.
+CREATE OR REPLACE FUNCTION metadata.latest_as_of(p_as_of DATE, p_series TEXT[])
+RETURNS TABLE (series_id TEXT, date DATE, value NUMERIC, vintage DATE) AS $$
+    SELECT s.series_id, k.date, k.value, k.vintage
+    FROM unnest(p_series) AS s(series_id)
+    CROSS JOIN LATERAL (
+        SELECT o.date, o.value, o.vintage
+        FROM (
+            SELECT DISTINCT ON (o.date) o.date, o.value, o.vintage
+            FROM metadata.observations o
+            WHERE o.series_id = s.series_id AND o.vintage <= p_as_of AND o.date <= p_as_of
+            ORDER BY o.date DESC, o.vintage DESC
+        ) o
+        WHERE o.value IS NOT NULL
+        LIMIT 1
+    ) k
+$$ LANGUAGE sql STABLE;
+
+-- =============================================================================
+-- LATEST VALUES AND DASHBOARD COUNTERS
+-- =============================================================================
+
+-- Newest observation of every series with the one before it, maintained by
+-- write_observations for the series each load changed, so the latest print
+-- of everything is a scan of one small table
+CREATE TABLE IF NOT EXISTS metadata.latest_values (
+    series_id TEXT PRIMARY KEY,
+    date DATE NOT NULL,
+    value NUMERIC NOT NULL,
+    previous_date DATE,
+    previous_value NUMERIC,
+    change NUMERIC,
+    loaded_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Function to refresh metadata.latest_values for the given series (all
+-- catalogued series when NULL) from the latest vintage of their last two
+-- dates. Dates whose latest vintage is NULL (deleted) are skipped, and series
+-- with no value left are removed. Rows are only rewritten when a value
+-- changed. Returns the rows written or removed.
+CREATE OR REPLACE FUNCTION metadata.refresh_latest_values(p_series TEXT[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    refreshed INTEGER;
+BEGIN
+    WITH latest AS (
+        SELECT s.series_id, p.dates, p.vals
+        FROM (
+            SELECT unnest(p_series) AS series_id WHERE p_series IS NOT NULL
+            UNION
+            SELECT series_id FROM metadata.series_catalog WHERE p_series IS NULL
+        ) s
+        CROSS JOIN LATERAL (
+            SELECT array_agg(top.date ORDER BY top.date DESC) AS dates,
+                   array_agg(top.value ORDER BY top.date DESC) AS vals
+            FROM (
+                SELECT v.date, v.value
+                FROM (
+                    SELECT DISTINCT ON (o.date) o.date, o.value
+                    FROM metadata.observations o
+                    WHERE o.series_id = s.series_id
+                    ORDER BY o.date DESC, o.vintage DESC
+                ) v
+                WHERE v.value IS NOT NULL
+                LIMIT 2
+            ) top
+        ) p
+    ), removed AS (
+        DELETE FROM metadata.latest_values lv
+        USING latest l
+        WHERE lv.series_id = l.series_id AND l.dates IS NULL
+        RETURNING lv.series_id
+    ), written AS (
+        INSERT INTO metadata.latest_values AS lv
+            (series_id, date, value, previous_date, previous_value, change, loaded_at)
+        SELECT l.series_id, l.dates[1], l.vals[1], l.dates[2], l.vals[2], l.vals[1] - l.vals[2], NOW()
+        FROM latest l
+        WHERE l.dates IS NOT NULL
+        ON CONFLICT (series_id) DO UPDATE
+        SET date = EXCLUDED.date, value = EXCLUDED.value,
+            previous_date = EXCLUDED.previous_date, previous_value = EXCLUDED.previous_value,
+            change = EXCLUDED.change, loaded_at = EXCLUDED.loaded_at
+        WHERE (lv.date, lv.value, lv.previous_date, lv.previous_value)
+              IS DISTINCT FROM (EXCLUDED.date, EXCLUDED.value, EXCLUDED.previous_date, EXCLUDED.previous_value)
+        RETURNING lv.series_id
+    )
+    SELECT (SELECT COUNT(*) FROM removed) + (SELECT COUNT(*) FROM written) INTO refreshed;
+    RETURN refreshed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Dashboard counters (one row), maintained by triggers on metadata.data_sources
+-- and metadata.data_updates instead of being counted on every read
+CREATE TABLE IF NOT EXISTS metadata.dashboard_counters (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    total_data_sources BIGINT NOT NULL DEFAULT 0,
+    successful_updates BIGINT NOT NULL DEFAULT 0,
+    last_update TIMESTAMPTZ
+);
+
+INSERT INTO metadata.dashboard_counters (id, total_data_sources, successful_updates, last_update)
+SELECT TRUE,
+       (SELECT COUNT(*) FROM metadata.data_sources),
+       (SELECT COUNT(*) FROM metadata.data_updates WHERE update_status = 'success'),
+       (SELECT MAX(completed_at) FROM metadata.data_updates)
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION metadata.count_data_sources()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE metadata.dashboard_counters
+    SET total_data_sources = total_data_sources + CASE TG_OP WHEN 'INSERT' THEN 1 ELSE -1 END;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- last_update only moves forward; deleting update log rows leaves it as is
+CREATE OR REPLACE FUNCTION metadata.count_data_updates()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE metadata.dashboard_counters
+    SET successful_updates = successful_updates
+            + CASE WHEN TG_OP <> 'DELETE' AND NEW.update_status = 'success' THEN 1 ELSE 0 END
+            - CASE WHEN TG_OP <> 'INSERT' AND OLD.update_status = 'success' THEN 1 ELSE 0 END,
+        last_update = CASE WHEN TG_OP = 'DELETE' THEN last_update
+                           ELSE GREATEST(last_update, NEW.completed_at) END;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_count_data_sources ON metadata.data_sources;
+CREATE TRIGGER trg_count_data_sources
+AFTER INSERT OR DELETE ON metadata.data_sources
+FOR EACH ROW EXECUTE FUNCTION metadata.count_data_sources();
+
+DROP TRIGGER IF EXISTS trg_count_data_updates ON metadata.data_updates;
+CREATE TRIGGER trg_count_data_updates
+AFTER INSERT OR UPDATE OF update_status, completed_at OR DELETE ON metadata.data_updates
+FOR EACH ROW EXECUTE FUNCTION metadata.count_data_updates();
+
 -- =============================================================================
 -- CREATE VIEWS FOR COMMON QUERIES
 -- =============================================================================
 
--- Comprehensive Economic Dashboard View
+-- Comprehensive Economic Dashboard View (counters in metadata.dashboard_counters)
 CREATE OR REPLACE VIEW metadata.economic_dashboard AS
-SELECT 
+SELECT
     CURRENT_DATE as snapshot_date,
-    (SELECT COUNT(*) FROM metadata.data_sources) as total_data_sources,
-    (SELECT COUNT(*) FROM metadata.data_updates WHERE update_status = 'success') as successful_updates,
-    (SELECT MAX(completed_at) FROM metadata.data_updates) as last_update;
+    total_data_sources,
+    successful_updates,
+    last_update
+FROM metadata.dashboard_counters;
 
--- Latest ISM Manufacturing Data
+-- Latest ISM Manufacturing Data (latest date from the table's watermarks, or the
+-- table itself for data loaded without them)
 CREATE OR REPLACE VIEW survey_data.latest_ism_manufacturing AS
 SELECT * FROM survey_data.ism_manufacturing
-WHERE date = (SELECT MAX(date) FROM survey_data.ism_manufacturing);
+WHERE date = COALESCE(
+    (SELECT MAX(last_date) FROM metadata.series_watermarks
+     WHERE schema_name = 'survey_data' AND table_name = 'ism_manufacturing'),
+    (SELECT MAX(date) FROM survey_data.ism_manufacturing)
+);
 
--- Latest Employment Data
+-- Latest Employment Data (latest date from the table's watermarks, or the
+-- table itself for data loaded without them)
 CREATE OR REPLACE VIEW coincident_indicators.latest_employment AS
 SELECT * FROM coincident_indicators.employment_situation
-WHERE date = (SELECT MAX(date) FROM coincident_indicators.employment_situation);
+WHERE date = COALESCE(
+    (SELECT MAX(last_date) FROM metadata.series_watermarks
+     WHERE schema_name = 'coincident_indicators' AND table_name = 'employment_situation'),
+    (SELECT MAX(date) FROM coincident_indicators.employment_situation)
+);
+
+-- Latest print of every catalogued series
+CREATE OR REPLACE VIEW metadata.latest_prints AS
+SELECT lv.*, c.source, c.name, c.frequency, c.units
+FROM metadata.latest_values lv
+LEFT JOIN LATERAL (
+    SELECT source, name, frequency, units FROM metadata.series_catalog
+    WHERE series_id = lv.series_id
+    ORDER BY target_schema, target_table
+    LIMIT 1
+) c ON TRUE;
 
 -- =============================================================================
 -- INSERT SAMPLE DATA SOURCES
@@ -569,6 +1203,44 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Function to rebuild series watermarks from the data tables (all, or one table)
+CREATE OR REPLACE FUNCTION metadata.rebuild_series_watermarks(p_schema TEXT DEFAULT NULL, p_table TEXT DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    tbl RECORD;
+    series_expr TEXT;
+    rebuilt INTEGER := 0;
+    affected INTEGER;
+BEGIN
+    FOR tbl IN
+        SELECT c.table_schema, c.table_name,
+               bool_or(c.column_name = 'series_id') AS has_series_id
+        FROM information_schema.columns c
+        JOIN information_schema.tables t
+          ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+        WHERE t.table_type = 'BASE TABLE'
+          AND c.table_schema IN ('china', 'coincident_indicators', 'commodities', 'europe',
+                                 'fixed_income', 'general_macro', 'survey_data')
+          AND (p_schema IS NULL OR c.table_schema = p_schema)
+          AND (p_table IS NULL OR c.table_name = p_table)
+        GROUP BY c.table_schema, c.table_name
+        HAVING bool_or(c.column_name = 'date')
+    LOOP
+        series_expr := CASE WHEN tbl.has_series_id THEN 'COALESCE(series_id, '''')' ELSE '''''' END;
+        EXECUTE format(
+            'INSERT INTO metadata.series_watermarks (schema_name, table_name, series_id, last_date, last_loaded_at, row_count)
+             SELECT %L, %L, %s, MAX(date), NOW(), COUNT(*) FROM %I.%I GROUP BY 3
+             ON CONFLICT (schema_name, table_name, series_id) DO UPDATE
+             SET last_date = EXCLUDED.last_date, row_count = EXCLUDED.row_count',
+            tbl.table_schema, tbl.table_name, series_expr, tbl.table_schema, tbl.table_name
+        );
+        GET DIAGNOSTICS affected = ROW_COUNT;
+        rebuilt := rebuilt + affected;
+    END LOOP;
+    RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Function to count records in a table
 CREATE OR REPLACE FUNCTION metadata.count_records(schema_name TEXT, table_name TEXT)
 RETURNS INTEGER AS $$
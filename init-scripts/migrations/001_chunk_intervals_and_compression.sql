@@ -0,0 +1,247 @@
+-- =============================================================================
+-- Migration 001: frequency-aware chunk intervals and compression
+-- =============================================================================
+--
+-- Brings a database created before the HYPERTABLE CHUNKING AND COMPRESSION
+-- section of init-timescaledb.sql up to date:
+--
+--   1. creates metadata.hypertable_settings and apply_hypertable_settings
+--      (same definitions as in init-timescaledb.sql);
+--   2. re-chunks every hypertable whose chunk interval differs from its
+--      setting. set_chunk_time_interval only affects new chunks, so the rows
+--      are copied to a temporary table, the hypertable truncated (dropping
+--      its chunks) and the rows inserted back. Table identity, indexes,
+--      grants and dependent views are kept. Each table is migrated and
+--      committed on its own;
+--   3. enables compression and the compression policy, and compresses the
+--      chunks already older than compress_after (tables without one stay
+--      uncompressed);
+--   4. records chunk count, total size and the latency of MAX(date) and of a
+--      ten-year range count before and after in
+--      metadata.hypertable_migration_report.
+--
+-- Run it with psql outside an explicit transaction, e.g.:
+--
+--   docker compose exec -T timescaledb psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" \
+--       -f /docker-entrypoint-initdb.d/migrations/001_chunk_intervals_and_compression.sql
+--
+-- Re-running is safe: tables already on their interval are only measured.
+
+-- Chunk interval and compression settings per hypertable. Chunks are sized by
+-- publication frequency so that each holds a useful number of rows (the 7-day
+-- default gives every monthly observation a chunk of its own); compression
+-- segments by the series key columns and starts once chunks are older than
+-- the dates routine loads rewrite: the revision window (REVISION_LOOKBACK_MONTHS,
+-- 36 months for annual GDP) plus the 12 months of derived columns a revision
+-- moves. A NULL compress_after leaves the table uncompressed: metadata.observations
+-- takes vintages, revisions and deletions at any date.
+CREATE TABLE IF NOT EXISTS metadata.hypertable_settings (
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    frequency VARCHAR(20) NOT NULL,
+    chunk_interval INTERVAL NOT NULL,
+    segment_by TEXT NOT NULL DEFAULT '',
+    compress_after INTERVAL DEFAULT INTERVAL '2 years',
+    PRIMARY KEY (schema_name, table_name)
+);
+
+INSERT INTO metadata.hypertable_settings (schema_name, table_name, frequency, chunk_interval, segment_by, compress_after) VALUES
+('china', 'manufacturing_pmi', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('china', 'real_rates', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('china', 'consumer_price_index', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('coincident_indicators', 'durable_goods_shipments', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('coincident_indicators', 'employment_situation', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('coincident_indicators', 'industrial_production', 'Monthly', INTERVAL '10 years', 'series_id, industry_category', INTERVAL '2 years'),
+('coincident_indicators', 'jobless_claims', 'Weekly', INTERVAL '5 years', 'series_id', INTERVAL '2 years'),
+('commodities', 'cot_metals_energy', 'Weekly', INTERVAL '5 years', 'commodity', INTERVAL '2 years'),
+('commodities', 'commodity_prices', 'Daily', INTERVAL '1 year', 'commodity_name, price_type', INTERVAL '2 years'),
+('commodities', 'eia_summary', 'Weekly', INTERVAL '5 years', 'series_id', INTERVAL '2 years'),
+('commodities', 'demand_supply_factors', 'Weekly', INTERVAL '5 years', 'commodity', INTERVAL '2 years'),
+('europe', 'benchmark_yields_ecb', 'Daily', INTERVAL '1 year', 'country, maturity', INTERVAL '2 years'),
+('europe', 'economic_sentiment', 'Monthly', INTERVAL '10 years', 'country', INTERVAL '2 years'),
+('europe', 'global_gdp', 'Annual', INTERVAL '50 years', 'country, series_id', INTERVAL '5 years'),
+('fixed_income', 'benchmark_yields', 'Daily', INTERVAL '1 year', 'country, maturity, series_id', INTERVAL '2 years'),
+('fixed_income', 'bond_market_basics', 'Daily', INTERVAL '1 year', 'series_id', INTERVAL '2 years'),
+('fixed_income', 'corporate_bond_indices', 'Daily', INTERVAL '1 year', 'index_name, series_id', INTERVAL '2 years'),
+('general_macro', 'inflation', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('general_macro', 'building_permits', 'Monthly', INTERVAL '10 years', 'series_id, region', INTERVAL '2 years'),
+('general_macro', 'm2_money_supply', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('general_macro', 'usd_trade_weighted', 'Daily', INTERVAL '1 year', 'series_id', INTERVAL '2 years'),
+('survey_data', 'ism_manufacturing', 'Monthly', INTERVAL '10 years', '', INTERVAL '2 years'),
+('survey_data', 'ism_non_manufacturing', 'Monthly', INTERVAL '10 years', '', INTERVAL '2 years'),
+('survey_data', 'nfib_optimism', 'Monthly', INTERVAL '10 years', 'region, industry', INTERVAL '2 years'),
+('survey_data', 'nfib_sentiment_components', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years'),
+('survey_data', 'umcsi', 'Monthly', INTERVAL '10 years', 'series_id', INTERVAL '2 years')
+ON CONFLICT (schema_name, table_name) DO UPDATE
+SET frequency = EXCLUDED.frequency, chunk_interval = EXCLUDED.chunk_interval,
+    segment_by = EXCLUDED.segment_by, compress_after = EXCLUDED.compress_after;
+
+-- Function to apply metadata.hypertable_settings (all, or one table). The chunk
+-- interval only applies to chunks created afterwards; compression settings
+-- are left alone on tables that already have compression enabled. The
+-- compression policy is recreated with the current compress_after, and chunks
+-- it no longer covers are decompressed so loads write to them uncompressed.
+-- Tables without compress_after are decompressed entirely.
+CREATE OR REPLACE FUNCTION metadata.apply_hypertable_settings(p_schema TEXT DEFAULT NULL, p_table TEXT DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    s RECORD;
+    hypertable REGCLASS;
+    applied INTEGER := 0;
+BEGIN
+    FOR s IN
+        SELECT hs.*, h.compression_enabled
+        FROM metadata.hypertable_settings hs
+        JOIN timescaledb_information.hypertables h
+          ON h.hypertable_schema = hs.schema_name AND h.hypertable_name = hs.table_name
+        WHERE (p_schema IS NULL OR hs.schema_name = p_schema)
+          AND (p_table IS NULL OR hs.table_name = p_table)
+    LOOP
+        hypertable := format('%I.%I', s.schema_name, s.table_name)::regclass;
+        PERFORM set_chunk_time_interval(hypertable, s.chunk_interval);
+        IF s.compression_enabled THEN
+            PERFORM remove_compression_policy(hypertable, if_exists => TRUE);
+            PERFORM decompress_chunk(c, if_compressed => TRUE)
+            FROM show_chunks(hypertable) c
+            WHERE s.compress_after IS NULL
+               OR c NOT IN (SELECT show_chunks(hypertable, older_than => s.compress_after));
+        END IF;
+
+        IF s.compress_after IS NULL THEN
+            IF s.compression_enabled THEN
+                EXECUTE format('ALTER TABLE %s SET (timescaledb.compress = false)', hypertable);
+            END IF;
+        ELSE
+            IF NOT s.compression_enabled THEN
+                EXECUTE format(
+                    'ALTER TABLE %s SET (timescaledb.compress, timescaledb.compress_segmentby = %L, timescaledb.compress_orderby = %L)',
+                    hypertable, s.segment_by, 'date DESC'
+                );
+            END IF;
+            PERFORM add_compression_policy(hypertable, s.compress_after);
+        END IF;
+        applied := applied + 1;
+    END LOOP;
+    RETURN applied;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Before/after numbers of each migration run
+CREATE TABLE IF NOT EXISTS metadata.hypertable_migration_report (
+    id SERIAL PRIMARY KEY,
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    old_chunk_interval INTERVAL,
+    new_chunk_interval INTERVAL,
+    row_count BIGINT,
+    chunks_before INTEGER,
+    chunks_after INTEGER,
+    compressed_chunks INTEGER,
+    bytes_before BIGINT,
+    bytes_after BIGINT,
+    max_date_ms_before NUMERIC,
+    max_date_ms_after NUMERIC,
+    range_ms_before NUMERIC,
+    range_ms_after NUMERIC,
+    migrated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Best-of-n wall time of a query in milliseconds, planning included
+CREATE OR REPLACE FUNCTION metadata.time_query(p_query TEXT, p_runs INTEGER DEFAULT 5)
+RETURNS NUMERIC AS $$
+DECLARE
+    started TIMESTAMPTZ;
+    best NUMERIC;
+BEGIN
+    FOR i IN 1..p_runs LOOP
+        started := clock_timestamp();
+        EXECUTE p_query;
+        best := LEAST(best, EXTRACT(EPOCH FROM clock_timestamp() - started) * 1000);
+    END LOOP;
+    RETURN round(best, 3);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE PROCEDURE metadata.rechunk_hypertables()
+LANGUAGE plpgsql AS $$
+DECLARE
+    s RECORD;
+    hypertable REGCLASS;
+    max_date_query TEXT;
+    range_query TEXT;
+    r metadata.hypertable_migration_report%ROWTYPE;
+BEGIN
+    FOR s IN
+        SELECT hs.*, d.time_interval
+        FROM metadata.hypertable_settings hs
+        JOIN timescaledb_information.dimensions d
+          ON d.hypertable_schema = hs.schema_name AND d.hypertable_name = hs.table_name
+         AND d.dimension_number = 1
+        ORDER BY hs.schema_name, hs.table_name
+    LOOP
+        hypertable := format('%I.%I', s.schema_name, s.table_name)::regclass;
+        max_date_query := format('SELECT MAX(date) FROM %s', hypertable);
+        range_query := format('SELECT COUNT(*) FROM %s WHERE date >= CURRENT_DATE - INTERVAL ''10 years''', hypertable);
+
+        SELECT COUNT(*) INTO r.chunks_before FROM show_chunks(hypertable);
+        r.bytes_before := hypertable_size(hypertable);
+        r.max_date_ms_before := metadata.time_query(max_date_query);
+        r.range_ms_before := metadata.time_query(range_query);
+
+        IF s.time_interval IS DISTINCT FROM s.chunk_interval THEN
+            EXECUTE format('CREATE TEMP TABLE rechunk_rows AS SELECT * FROM %s', hypertable);
+            PERFORM set_chunk_time_interval(hypertable, s.chunk_interval);
+            EXECUTE format('TRUNCATE %s', hypertable);
+            EXECUTE format('INSERT INTO %s SELECT * FROM rechunk_rows', hypertable);
+            DROP TABLE rechunk_rows;
+        END IF;
+
+        PERFORM metadata.apply_hypertable_settings(s.schema_name, s.table_name);
+        IF s.compress_after IS NOT NULL THEN
+            PERFORM compress_chunk(c, if_not_compressed => TRUE)
+            FROM show_chunks(hypertable, older_than => s.compress_after) c;
+        END IF;
+        EXECUTE format('ANALYZE %s', hypertable);
+
+        EXECUTE format('SELECT COUNT(*) FROM %s', hypertable) INTO r.row_count;
+        SELECT COUNT(*) INTO r.chunks_after FROM show_chunks(hypertable);
+        SELECT COUNT(*) INTO r.compressed_chunks
+        FROM timescaledb_information.chunks
+        WHERE hypertable_schema = s.schema_name AND hypertable_name = s.table_name AND is_compressed;
+        r.bytes_after := hypertable_size(hypertable);
+        r.max_date_ms_after := metadata.time_query(max_date_query);
+        r.range_ms_after := metadata.time_query(range_query);
+
+        INSERT INTO metadata.hypertable_migration_report
+            (schema_name, table_name, old_chunk_interval, new_chunk_interval, row_count,
+             chunks_before, chunks_after, compressed_chunks, bytes_before, bytes_after,
+             max_date_ms_before, max_date_ms_after, range_ms_before, range_ms_after)
+        VALUES
+            (s.schema_name, s.table_name, s.time_interval, s.chunk_interval, r.row_count,
+             r.chunks_before, r.chunks_after, r.compressed_chunks, r.bytes_before, r.bytes_after,
+             r.max_date_ms_before, r.max_date_ms_after, r.range_ms_before, r.range_ms_after);
+
+        RAISE NOTICE '%.%: % -> % chunks (% compressed), % -> %, MAX(date) % -> % ms, 10y range % -> % ms',
+            s.schema_name, s.table_name, r.chunks_before, r.chunks_after, r.compressed_chunks,
+            pg_size_pretty(r.bytes_before), pg_size_pretty(r.bytes_after),
+            r.max_date_ms_before, r.max_date_ms_after, r.range_ms_before, r.range_ms_after;
+        COMMIT;
+    END LOOP;
+END;
+$$;
+
+CALL metadata.rechunk_hypertables();
+
+-- Report of this run
+SELECT schema_name || '.' || table_name AS hypertable,
+       old_chunk_interval, new_chunk_interval, row_count,
+       chunks_before, chunks_after, compressed_chunks,
+       pg_size_pretty(bytes_before) AS size_before, pg_size_pretty(bytes_after) AS size_after,
+       max_date_ms_before, max_date_ms_after, range_ms_before, range_ms_after
+FROM metadata.hypertable_migration_report
+WHERE migrated_at >= NOW() - INTERVAL '1 hour'
+ORDER BY schema_name, table_name;
+
+-- Grants for the new metadata tables
+GRANT ALL PRIVILEGES ON metadata.hypertable_settings, metadata.hypertable_migration_report TO economic_data_app;
+GRANT SELECT ON metadata.hypertable_settings, metadata.hypertable_migration_report TO economic_data_readonly;
@@ -0,0 +1,118 @@
+-- =============================================================================
+-- Migration 002: incrementally maintained derived columns
+-- =============================================================================
+--
+-- Creates metadata.derived_columns and metadata.refresh_derived_columns (same
+-- definitions as the DERIVED COLUMNS section of init-timescaledb.sql) and
+-- fills the derived columns for the whole existing history. From then on
+-- bulk_upsert refreshes them for the dates each load touches.
+--
+--   docker compose exec -T timescaledb psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" \
+--       -f /docker-entrypoint-initdb.d/migrations/002_derived_columns.sql
+
+-- Derived columns (YoY, MoM, 4-week averages) kept up to date in the data
+-- tables themselves. Continuous aggregates cannot hold window functions such
+-- as LAG, so the columns are refreshed incrementally by bulk_upsert for the
+-- date range each load touched.
+--   transform   yoy:  % change from the observation exactly 12 months earlier
+--               mom:  % change from the previous observation
+--               avg4: average of the last 4 observations (NULL until 4 exist)
+--   source_expr SQL expression over the row the transform is applied to
+--   partition_by columns identifying one series within the table
+CREATE TABLE IF NOT EXISTS metadata.derived_columns (
+    schema_name TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    target_column TEXT NOT NULL,
+    source_expr TEXT NOT NULL,
+    transform VARCHAR(10) NOT NULL CHECK (transform IN ('yoy', 'mom', 'avg4')),
+    partition_by TEXT NOT NULL DEFAULT 'series_id',
+    PRIMARY KEY (schema_name, table_name, target_column)
+);
+
+INSERT INTO metadata.derived_columns (schema_name, table_name, target_column, source_expr, transform, partition_by) VALUES
+('coincident_indicators', 'durable_goods_shipments', 'percent_change', 'value', 'mom', 'series_id'),
+('coincident_indicators', 'industrial_production', 'percent_change', 'index_value', 'mom', 'series_id, industry_category'),
+('coincident_indicators', 'jobless_claims', 'four_week_moving_avg', 'initial_claims', 'avg4', 'series_id'),
+('general_macro', 'inflation', 'cpi_yoy_change', 'COALESCE(cpi_all_items, cpi_core)', 'yoy', 'series_id'),
+('general_macro', 'inflation', 'ppi_yoy_change', 'COALESCE(ppi_all_commodities, ppi_core)', 'yoy', 'series_id'),
+('general_macro', 'm2_money_supply', 'm2_yoy_change', 'm2_value', 'yoy', 'series_id')
+ON CONFLICT (schema_name, table_name, target_column) DO UPDATE
+SET source_expr = EXCLUDED.source_expr, transform = EXCLUDED.transform, partition_by = EXCLUDED.partition_by;
+
+-- Function to recompute a table's derived columns for rows from p_since on.
+-- Observations up to 13 months before p_since are read for the windows; rows
+-- are updated up to 12 months past p_until (default: all), since a changed
+-- value moves the derived values of later rows. Returns the rows changed.
+CREATE OR REPLACE FUNCTION metadata.refresh_derived_columns(p_schema TEXT, p_table TEXT,
+                                                            p_since DATE, p_until DATE DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    d RECORD;
+    window_spec TEXT;
+    derived_expr TEXT;
+    join_clause TEXT;
+    column_type TEXT;
+    v_until DATE := p_until + INTERVAL '12 months';
+    updated INTEGER := 0;
+    affected INTEGER;
+BEGIN
+    FOR d IN
+        SELECT * FROM metadata.derived_columns
+        WHERE schema_name = p_schema AND table_name = p_table
+    LOOP
+        window_spec := format('PARTITION BY %s ORDER BY date', d.partition_by);
+        derived_expr := CASE d.transform
+            WHEN 'yoy' THEN format(
+                'ROUND((src / NULLIF(FIRST_VALUE(src) OVER (%s RANGE BETWEEN INTERVAL ''12 months'' PRECEDING AND INTERVAL ''12 months'' PRECEDING), 0) - 1) * 100, 4)',
+                window_spec)
+            WHEN 'mom' THEN format(
+                'ROUND((src / NULLIF(LAG(src) OVER (%s), 0) - 1) * 100, 4)',
+                window_spec)
+            WHEN 'avg4' THEN format(
+                'CASE WHEN COUNT(src) OVER (%1$s ROWS 3 PRECEDING) = 4 THEN ROUND(AVG(src) OVER (%1$s ROWS 3 PRECEDING), 4) END',
+                window_spec)
+        END;
+        -- Cast to the column's type so unchanged values are not rewritten
+        SELECT format_type(atttypid, atttypmod) INTO column_type
+        FROM pg_attribute
+        WHERE attrelid = format('%I.%I', d.schema_name, d.table_name)::regclass AND attname = d.target_column;
+        derived_expr := format('(%s)::%s', derived_expr, column_type);
+
+        SELECT string_agg(format('t.%1$I IS NOT DISTINCT FROM x.%1$I', trim(col)), ' AND ')
+        INTO join_clause
+        FROM unnest(string_to_array(d.partition_by, ',')) AS col;
+
+        EXECUTE format(
+            'UPDATE %1$I.%2$I t SET %3$I = x.derived
+             FROM (
+                 SELECT * FROM (
+                     SELECT %4$s, date, %5$s AS derived
+                     FROM (
+                         SELECT %4$s, date, (%6$s)::numeric AS src
+                         FROM %1$I.%2$I
+                         WHERE date >= $1 - INTERVAL ''13 months'' AND ($2 IS NULL OR date <= $2)
+                     ) s
+                 ) w
+                 WHERE date >= $1
+             ) x
+             WHERE t.date = x.date AND %7$s
+               AND t.date >= $1 AND ($2 IS NULL OR t.date <= $2)
+               AND t.%3$I IS DISTINCT FROM x.derived',
+            d.schema_name, d.table_name, d.target_column, d.partition_by,
+            derived_expr, d.source_expr, join_clause
+        ) USING p_since, v_until;
+        GET DIAGNOSTICS affected = ROW_COUNT;
+        updated := updated + affected;
+    END LOOP;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill every table with derived columns
+SELECT schema_name || '.' || table_name AS derived_table,
+       metadata.refresh_derived_columns(schema_name, table_name, DATE '1900-01-01') AS rows_updated
+FROM (SELECT DISTINCT schema_name, table_name FROM metadata.derived_columns) t
+ORDER BY 1;
+
+GRANT ALL PRIVILEGES ON metadata.derived_columns TO economic_data_app;
+GRANT SELECT ON metadata.derived_columns TO economic_data_readonly;
@@ -0,0 +1,209 @@
+-- =============================================================================
+-- Migration 003: long-format observations store and series catalog
+-- =============================================================================
+--
+-- Creates metadata.series_catalog, the metadata.observations hypertable and
+-- metadata.project_observations (same definitions as init-timescaledb.sql).
+-- The loaders register their series and write through the observations store
+-- from then on; the data tables stay in place as projections of it. Run the
+-- DAG once with {"full_refresh": true} to fill the store with full history.
+--
+--   docker compose exec -T timescaledb psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" \
+--       -f /docker-entrypoint-initdb.d/migrations/003_observations_store.sql
+
+-- Catalog of every loaded series and the table column it is projected into.
+-- dimensions holds the other columns of the target row (key columns and
+-- constants), e.g. {"series_id": "DGS10", "country": "US", "maturity": "10Y"};
+-- series that fill different columns of the same row share their dimensions.
+-- A series may be projected into more than one table.
+CREATE TABLE IF NOT EXISTS metadata.series_catalog (
+    series_id TEXT NOT NULL,
+    source VARCHAR(20) NOT NULL,
+    name TEXT,
+    frequency VARCHAR(20),
+    units TEXT,
+    target_schema TEXT NOT NULL,
+    target_table TEXT NOT NULL,
+    target_column TEXT NOT NULL,
+    dimensions JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (series_id, target_schema, target_table)
+);
+
+CREATE INDEX IF NOT EXISTS idx_series_catalog_target ON metadata.series_catalog (target_schema, target_table);
+
+-- Every observation of every catalogued series in long format. vintage is the
+-- date a value was loaded; a revised value is stored as a new vintage, so the
+-- values seen on earlier dates are kept. The data tables are projections of
+-- the latest vintage (metadata.project_observations).
+CREATE TABLE IF NOT EXISTS metadata.observations (
+    series_id TEXT NOT NULL,
+    date DATE NOT NULL,
+    value NUMERIC,
+    vintage DATE NOT NULL DEFAULT CURRENT_DATE,
+    PRIMARY KEY (series_id, date, vintage)
+);
+
+SELECT create_hypertable('metadata.observations', 'date', if_not_exists => TRUE);
+
+-- Latest vintage of every observation
+CREATE OR REPLACE VIEW metadata.latest_observations AS
+SELECT DISTINCT ON (series_id, date) series_id, date, value, vintage
+FROM metadata.observations
+ORDER BY series_id, date, vintage DESC;
+
+-- Function to project the latest vintage of a table's catalogued series
+-- (metadata.series_catalog) into the table for dates p_since to p_until.
+-- Values are pivoted into their target columns, one row per date and
+-- dimensions; p_series limits the projection to the rows those series fill.
+-- Rows that already hold the same values are left alone. The watermarks of
+-- the projected series and the table's derived columns for the projected
+-- dates are updated in the same transaction. Series projected into
+-- the same row must share the same dimensions. Rows whose series are all
+-- deleted (NULL latest vintage) are not projected. Raises if a catalogued column
+-- or dimension is not a column of the table, or if a series leaves a primary
+-- key column other than date unset.
+CREATE OR REPLACE FUNCTION metadata.project_observations(p_schema TEXT, p_table TEXT, p_since DATE, p_until DATE,
+                                                         p_series TEXT[] DEFAULT NULL,
+                                                         OUT rows_inserted BIGINT, OUT rows_updated BIGINT)
+AS $$
+DECLARE
+    target REGCLASS := format('%I.%I', p_schema, p_table)::regclass;
+    key_columns TEXT;
+    column_list TEXT;
+    select_list TEXT;
+    update_columns TEXT;
+    excluded_columns TEXT;
+    current_columns TEXT;
+    dimension_columns TEXT[];
+    has_series_id BOOLEAN;
+    conflict_sql TEXT;
+    invalid TEXT;
+BEGIN
+    SELECT string_agg(format('%I', a.attname), ', ')
+    INTO key_columns
+    FROM pg_index i
+    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+    WHERE i.indrelid = target AND i.indisprimary;
+    IF key_columns IS NULL THEN
+        RAISE EXCEPTION '% has no primary key to project observations into', target;
+    END IF;
+
+    SELECT string_agg(DISTINCT format('%s.%s', c.series_id, k.col), ', ')
+    INTO invalid
+    FROM metadata.series_catalog c
+    CROSS JOIN LATERAL (
+        SELECT c.target_column UNION ALL SELECT jsonb_object_keys(c.dimensions)
+    ) AS k(col)
+    WHERE c.target_schema = p_schema AND c.target_table = p_table
+      AND NOT EXISTS (
+          SELECT 1 FROM pg_attribute a
+          WHERE a.attrelid = target AND a.attname = k.col AND a.attnum > 0 AND NOT a.attisdropped
+      );
+    IF invalid IS NOT NULL THEN
+        RAISE EXCEPTION '% has no column for catalogued series columns %', target, invalid;
+    END IF;
+
+    SELECT string_agg(DISTINCT format('%s.%s', c.series_id, a.attname), ', ')
+    INTO invalid
+    FROM metadata.series_catalog c
+    JOIN pg_index i ON i.indrelid = target AND i.indisprimary
+    JOIN pg_attribute a ON a.attrelid = target AND a.attnum = ANY(i.indkey)
+    WHERE c.target_schema = p_schema AND c.target_table = p_table
+      AND a.attname NOT IN ('date', c.target_column)
+      AND NOT c.dimensions ? a.attname;
+    IF invalid IS NOT NULL THEN
+        RAISE EXCEPTION 'Catalogued series leave primary key columns of % unset: %', target, invalid;
+    END IF;
+
+    -- Projected columns: date, the catalogued target columns (pivoted values)
+    -- and the dimension keys
+    WITH catalog AS (
+        SELECT target_column, dimensions FROM metadata.series_catalog
+        WHERE target_schema = p_schema AND target_table = p_table
+    ), row_columns AS (
+        SELECT a.attname::TEXT AS col, a.attnum, format_type(a.atttypid, a.atttypmod) AS col_type,
+               a.attname = 'date' AS is_date,
+               a.attname IN (SELECT target_column FROM catalog) AS is_value,
+               EXISTS (SELECT 1 FROM pg_index i
+                       WHERE i.indrelid = target AND i.indisprimary AND a.attnum = ANY(i.indkey)) AS is_key
+        FROM pg_attribute a
+        WHERE a.attrelid = target AND a.attnum > 0 AND NOT a.attisdropped
+          AND (a.attname = 'date'
+               OR a.attname IN (SELECT target_column FROM catalog)
+               OR a.attname IN (SELECT jsonb_object_keys(dimensions) FROM catalog))
+    )
+    SELECT string_agg(format('%I', col), ', ' ORDER BY attnum),
+           string_agg(CASE
+               WHEN is_date THEN 'l.date'
+               WHEN is_value THEN format('(MAX(l.value) FILTER (WHERE c.target_column = %L))::%s', col, col_type)
+               ELSE format('(c.dims ->> %L)::%s', col, col_type)
+           END, ', ' ORDER BY attnum),
+           string_agg(format('%I', col), ', ' ORDER BY attnum) FILTER (WHERE NOT is_key),
+           string_agg(format('EXCLUDED.%I', col), ', ' ORDER BY attnum) FILTER (WHERE NOT is_key),
+           string_agg(format('t.%I', col), ', ' ORDER BY attnum) FILTER (WHERE NOT is_key),
+           array_agg(col) FILTER (WHERE NOT is_date AND NOT is_value),
+           bool_or(col = 'series_id')
+    INTO column_list, select_list, update_columns, excluded_columns, current_columns,
+         dimension_columns, has_series_id
+    FROM row_columns;
+
+    conflict_sql := CASE WHEN update_columns IS NULL THEN 'DO NOTHING' ELSE format(
+        'DO UPDATE SET (%1$s) = ROW(%2$s) WHERE ROW(%3$s) IS DISTINCT FROM ROW(%2$s)',
+        update_columns, excluded_columns, current_columns
+    ) END;
+
+    EXECUTE format(
+        'WITH catalog AS (
+             SELECT series_id, target_column,
+                    (SELECT COALESCE(jsonb_object_agg(key, value), ''{}'') FROM jsonb_each(dimensions)
+                     WHERE key = ANY($3)) AS dims
+             FROM metadata.series_catalog
+             WHERE target_schema = $1 AND target_table = $2
+         ), selected AS (
+             SELECT * FROM catalog
+             WHERE $4::TEXT[] IS NULL OR dims IN (SELECT dims FROM catalog WHERE series_id = ANY($4))
+         ), latest AS (
+             SELECT DISTINCT ON (o.series_id, o.date) o.series_id, o.date, o.value
+             FROM metadata.observations o
+             WHERE o.series_id IN (SELECT series_id FROM selected) AND o.date BETWEEN $5 AND $6
+             ORDER BY o.series_id, o.date, o.vintage DESC
+         ), upserted AS (
+             INSERT INTO %1$s AS t (%2$s)
+             SELECT %3$s
+             FROM latest l JOIN selected c USING (series_id)
+             GROUP BY l.date, c.dims
+             HAVING bool_or(l.value IS NOT NULL)
+             ON CONFLICT (%4$s) %5$s
+             RETURNING (xmax = 0) AS inserted, %6$s AS series_id, date
+         ), watermarks AS (
+             INSERT INTO metadata.series_watermarks
+                 (schema_name, table_name, series_id, last_date, last_loaded_at, row_count)
+             SELECT $1, $2, series_id, MAX(date), NOW(), COUNT(*) FILTER (WHERE inserted)
+             FROM upserted
+             GROUP BY series_id
+             ON CONFLICT (schema_name, table_name, series_id) DO UPDATE
+             SET last_date = GREATEST(series_watermarks.last_date, EXCLUDED.last_date),
+                 last_loaded_at = EXCLUDED.last_loaded_at,
+                 row_count = series_watermarks.row_count + EXCLUDED.row_count
+         )
+         SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted) FROM upserted',
+        target, column_list, select_list, key_columns, conflict_sql,
+        CASE WHEN has_series_id THEN 'COALESCE(series_id, '''')' ELSE '''''' END
+    ) INTO rows_inserted, rows_updated
+    USING p_schema, p_table, dimension_columns, p_series, p_since, p_until;
+
+    PERFORM metadata.refresh_derived_columns(p_schema, p_table, p_since, p_until);
+END;
+$$ LANGUAGE plpgsql;
+
+INSERT INTO metadata.hypertable_settings (schema_name, table_name, frequency, chunk_interval, segment_by, compress_after) VALUES
+('metadata', 'observations', 'Mixed', INTERVAL '1 year', 'series_id', NULL)
+ON CONFLICT (schema_name, table_name) DO UPDATE
+SET frequency = EXCLUDED.frequency, chunk_interval = EXCLUDED.chunk_interval,
+    segment_by = EXCLUDED.segment_by, compress_after = EXCLUDED.compress_after;
+
+SELECT metadata.apply_hypertable_settings('metadata', 'observations');
+
+GRANT ALL PRIVILEGES ON metadata.series_catalog, metadata.observations, metadata.latest_observations TO economic_data_app;
+GRANT SELECT ON metadata.series_catalog, metadata.observations, metadata.latest_observations TO economic_data_readonly;
@@ -0,0 +1,178 @@
+-- =============================================================================
+-- Migration 004: latest values and incrementally maintained dashboard counters
+-- =============================================================================
+--
+-- Creates metadata.latest_values, metadata.refresh_latest_values and the
+-- dashboard counters with their triggers (same definitions as
+-- init-timescaledb.sql), fills them from the current data, and repoints the
+-- dashboard and latest_* views at them instead of full aggregates. Run after
+-- migration 003.
+--
+--   docker compose exec -T timescaledb psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" \
+--       -f /docker-entrypoint-initdb.d/migrations/004_latest_values.sql
+
+-- Newest observation of every series with the one before it, maintained by
+-- write_observations for the series each load changed, so the latest print
+-- of everything is a scan of one small table
+CREATE TABLE IF NOT EXISTS metadata.latest_values (
+    series_id TEXT PRIMARY KEY,
+    date DATE NOT NULL,
+    value NUMERIC NOT NULL,
+    previous_date DATE,
+    previous_value NUMERIC,
+    change NUMERIC,
+    loaded_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Function to refresh metadata.latest_values for the given series (all
+-- catalogued series when NULL) from the latest vintage of their last two
+-- dates. Dates whose latest vintage is NULL (deleted) are skipped, and series
+-- with no value left are removed. Rows are only rewritten when a value
+-- changed. Returns the rows written or removed.
+CREATE OR REPLACE FUNCTION metadata.refresh_latest_values(p_series TEXT[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    refreshed INTEGER;
+BEGIN
+    WITH latest AS (
+        SELECT s.series_id, p.dates, p.vals
+        FROM (
+            SELECT unnest(p_series) AS series_id WHERE p_series IS NOT NULL
+            UNION
+            SELECT series_id FROM metadata.series_catalog WHERE p_series IS NULL
+        ) s
+        CROSS JOIN LATERAL (
+            SELECT array_agg(top.date ORDER BY top.date DESC) AS dates,
+                   array_agg(top.value ORDER BY top.date DESC) AS vals
+            FROM (
+                SELECT v.date, v.value
+                FROM (
+                    SELECT DISTINCT ON (o.date) o.date, o.value
+                    FROM metadata.observations o
+                    WHERE o.series_id = s.series_id
+                    ORDER BY o.date DESC, o.vintage DESC
+                ) v
+                WHERE v.value IS NOT NULL
+                LIMIT 2
+            ) top
+        ) p
+    ), removed AS (
+        DELETE FROM metadata.latest_values lv
+        USING latest l
+        WHERE lv.series_id = l.series_id AND l.dates IS NULL
+        RETURNING lv.series_id
+    ), written AS (
+        INSERT INTO metadata.latest_values AS lv
+            (series_id, date, value, previous_date, previous_value, change, loaded_at)
+        SELECT l.series_id, l.dates[1], l.vals[1], l.dates[2], l.vals[2], l.vals[1] - l.vals[2], NOW()
+        FROM latest l
+        WHERE l.dates IS NOT NULL
+        ON CONFLICT (series_id) DO UPDATE
+        SET date = EXCLUDED.date, value = EXCLUDED.value,
+            previous_date = EXCLUDED.previous_date, previous_value = EXCLUDED.previous_value,
+            change = EXCLUDED.change, loaded_at = EXCLUDED.loaded_at
+        WHERE (lv.date, lv.value, lv.previous_date, lv.previous_value)
+              IS DISTINCT FROM (EXCLUDED.date, EXCLUDED.value, EXCLUDED.previous_date, EXCLUDED.previous_value)
+        RETURNING lv.series_id
+    )
+    SELECT (SELECT COUNT(*) FROM removed) + (SELECT COUNT(*) FROM written) INTO refreshed;
+    RETURN refreshed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Dashboard counters (one row), maintained by triggers on metadata.data_sources
+-- and metadata.data_updates instead of being counted on every read
+CREATE TABLE IF NOT EXISTS metadata.dashboard_counters (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    total_data_sources BIGINT NOT NULL DEFAULT 0,
+    successful_updates BIGINT NOT NULL DEFAULT 0,
+    last_update TIMESTAMPTZ
+);
+
+INSERT INTO metadata.dashboard_counters (id, total_data_sources, successful_updates, last_update)
+SELECT TRUE,
+       (SELECT COUNT(*) FROM metadata.data_sources),
+       (SELECT COUNT(*) FROM metadata.data_updates WHERE update_status = 'success'),
+       (SELECT MAX(completed_at) FROM metadata.data_updates)
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION metadata.count_data_sources()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE metadata.dashboard_counters
+    SET total_data_sources = total_data_sources + CASE TG_OP WHEN 'INSERT' THEN 1 ELSE -1 END;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- last_update only moves forward; deleting update log rows leaves it as is
+CREATE OR REPLACE FUNCTION metadata.count_data_updates()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE metadata.dashboard_counters
+    SET successful_updates = successful_updates
+            + CASE WHEN TG_OP <> 'DELETE' AND NEW.update_status = 'success' THEN 1 ELSE 0 END
+            - CASE WHEN TG_OP <> 'INSERT' AND OLD.update_status = 'success' THEN 1 ELSE 0 END,
+        last_update = CASE WHEN TG_OP = 'DELETE' THEN last_update
+                           ELSE GREATEST(last_update, NEW.completed_at) END;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_count_data_sources ON metadata.data_sources;
+CREATE TRIGGER trg_count_data_sources
+AFTER INSERT OR DELETE ON metadata.data_sources
+FOR EACH ROW EXECUTE FUNCTION metadata.count_data_sources();
+
+DROP TRIGGER IF EXISTS trg_count_data_updates ON metadata.data_updates;
+CREATE TRIGGER trg_count_data_updates
+AFTER INSERT OR UPDATE OF update_status, completed_at OR DELETE ON metadata.data_updates
+FOR EACH ROW EXECUTE FUNCTION metadata.count_data_updates();
+
+-- Comprehensive Economic Dashboard View (counters in metadata.dashboard_counters)
+CREATE OR REPLACE VIEW metadata.economic_dashboard AS
+SELECT
+    CURRENT_DATE as snapshot_date,
+    total_data_sources,
+    successful_updates,
+    last_update
+FROM metadata.dashboard_counters;
+
+-- Latest ISM Manufacturing Data (latest date from the table's watermarks, or the
+-- table itself for data loaded without them)
+CREATE OR REPLACE VIEW survey_data.latest_ism_manufacturing AS
+SELECT * FROM survey_data.ism_manufacturing
+WHERE date = COALESCE(
+    (SELECT MAX(last_date) FROM metadata.series_watermarks
+     WHERE schema_name = 'survey_data' AND table_name = 'ism_manufacturing'),
+    (SELECT MAX(date) FROM survey_data.ism_manufacturing)
+);
+
+-- Latest Employment Data (latest date from the table's watermarks, or the
+-- table itself for data loaded without them)
+CREATE OR REPLACE VIEW coincident_indicators.latest_employment AS
+SELECT * FROM coincident_indicators.employment_situation
+WHERE date = COALESCE(
+    (SELECT MAX(last_date) FROM metadata.series_watermarks
+     WHERE schema_name = 'coincident_indicators' AND table_name = 'employment_situation'),
+    (SELECT MAX(date) FROM coincident_indicators.employment_situation)
+);
+
+-- Latest print of every catalogued series
+CREATE OR REPLACE VIEW metadata.latest_prints AS
+SELECT lv.*, c.source, c.name, c.frequency, c.units
+FROM metadata.latest_values lv
+LEFT JOIN LATERAL (
+    SELECT source, name, frequency, units FROM metadata.series_catalog
+    WHERE series_id = lv.series_id
+    ORDER BY target_schema, target_table
+    LIMIT 1
+) c ON TRUE;
+
+-- Fill latest values and the watermarks the latest_* views read
+SELECT metadata.refresh_latest_values() AS latest_values;
+SELECT metadata.rebuild_series_watermarks('survey_data', 'ism_manufacturing')
+     + metadata.rebuild_series_watermarks('coincident_indicators', 'employment_situation') AS watermarks;
+
+GRANT ALL PRIVILEGES ON metadata.latest_values, metadata.dashboard_counters, metadata.latest_prints TO economic_data_app;
+GRANT SELECT ON metadata.latest_values, metadata.dashboard_counters, metadata.latest_prints TO economic_data_readonly;
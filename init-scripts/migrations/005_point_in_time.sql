@@ -0,0 +1,56 @@
+-- =============================================================================
+-- Migration 005: point-in-time (ALFRED vintage) queries
+-- =============================================================================
+--
+-- Adds the ALFRED vintage watermark to metadata.fred_series_updates and the
+-- as-of query functions (same definitions as init-timescaledb.sql). Run
+-- after migration 003; vintages themselves are loaded by triggering the DAG
+-- with {"vintages": true}.
+--
+--   docker compose exec -T timescaledb psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" \
+--       -f /docker-entrypoint-initdb.d/migrations/005_point_in_time.sql
+
+ALTER TABLE metadata.fred_series_updates ADD COLUMN IF NOT EXISTS vintages_loaded_through DATE;
+
+-- Values of the given series (all when NULL) as they were known on p_as_of:
+-- for every observation date, the latest vintage on or before that day.
+-- Vintages are ALFRED real-time starts for series loaded in vintage mode and
+-- load dates otherwise; observations unpublished (NULL) as of then are left
+-- out. Answered from the (series_id, date, vintage) primary key.
+CREATE OR REPLACE FUNCTION metadata.observations_as_of(p_as_of DATE, p_series TEXT[] DEFAULT NULL,
+                                                       p_start DATE DEFAULT NULL, p_end DATE DEFAULT NULL)
+RETURNS TABLE (series_id TEXT, date DATE, value NUMERIC, vintage DATE) AS $$
+    SELECT k.series_id, k.date, k.value, k.vintage
+    FROM (
+        SELECT DISTINCT ON (o.series_id, o.date) o.series_id, o.date, o.value, o.vintage
+        FROM metadata.observations o
+        WHERE o.vintage <= p_as_of
+          AND o.date BETWEEN COALESCE(p_start, '-infinity'::date) AND LEAST(COALESCE(p_end, p_as_of), p_as_of)
+          AND (p_series IS NULL OR o.series_id = ANY(p_series))
+        ORDER BY o.series_id, o.date, o.vintage DESC
+    ) k
+    WHERE k.value IS NOT NULL
+$$ LANGUAGE sql STABLE;
+
+-- Newest observation of each given series as known on p_as_of: the
+-- cross-section a backtest sees on that day. One backward index scan per series.
+CREATE OR REPLACE FUNCTION metadata.latest_as_of(p_as_of DATE, p_series TEXT[])
+RETURNS TABLE (series_id TEXT, date DATE, value NUMERIC, vintage DATE) AS $$
+    SELECT s.series_id, k.date, k.value, k.vintage
+    FROM unnest(p_series) AS s(series_id)
+    CROSS JOIN LATERAL (
+        SELECT o.date, o.value, o.vintage
+        FROM (
+            SELECT DISTINCT ON (o.date) o.date, o.value, o.vintage
+            FROM metadata.observations o
+            WHERE o.series_id = s.series_id AND o.vintage <= p_as_of AND o.date <= p_as_of
+            ORDER BY o.date DESC, o.vintage DESC
+        ) o
+        WHERE o.value IS NOT NULL
+        LIMIT 1
+    ) k
+$$ LANGUAGE sql STABLE;
+
+GRANT EXECUTE ON FUNCTION metadata.observations_as_of(DATE, TEXT[], DATE, DATE),
+                          metadata.latest_as_of(DATE, TEXT[])
+    TO economic_data_app, economic_data_readonly;
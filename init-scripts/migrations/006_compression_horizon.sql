@@ -0,0 +1,83 @@
+-- =============================================================================
+-- Migration 006: compression horizon
+-- =============================================================================
+--
+-- Moves compression out of the dates routine loads still rewrite (same
+-- settings and apply_hypertable_settings as init-timescaledb.sql):
+--
+--   1. wide tables compress after 2 years instead of 1 (global_gdp keeps 5),
+--      beyond the revision lookback plus the 12 months of derived columns a
+--      revision moves;
+--   2. metadata.observations is not compressed at all: ALFRED vintages, NULL
+--      deletions and revisions land on any date;
+--   3. apply_hypertable_settings recreates each compression policy with the
+--      new interval and decompresses the chunks it no longer covers.
+--
+-- Run it after migration 003:
+--
+--   docker compose exec -T timescaledb psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" \
+--       -f /docker-entrypoint-initdb.d/migrations/006_compression_horizon.sql
+--
+-- Decompressing takes a while on large tables; re-running is safe.
+
+ALTER TABLE metadata.hypertable_settings ALTER COLUMN compress_after DROP NOT NULL;
+ALTER TABLE metadata.hypertable_settings ALTER COLUMN compress_after SET DEFAULT INTERVAL '2 years';
+
+UPDATE metadata.hypertable_settings
+SET compress_after = CASE
+    WHEN (schema_name, table_name) = ('metadata', 'observations') THEN NULL
+    WHEN (schema_name, table_name) = ('europe', 'global_gdp') THEN INTERVAL '5 years'
+    ELSE INTERVAL '2 years'
+END;
+
+-- Function to apply metadata.hypertable_settings (all, or one table). The chunk
+-- interval only applies to chunks created afterwards; compression settings
+-- are left alone on tables that already have compression enabled. The
+-- compression policy is recreated with the current compress_after, and chunks
+-- it no longer covers are decompressed so loads write to them uncompressed.
+-- Tables without compress_after are decompressed entirely.
+CREATE OR REPLACE FUNCTION metadata.apply_hypertable_settings(p_schema TEXT DEFAULT NULL, p_table TEXT DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    s RECORD;
+    hypertable REGCLASS;
+    applied INTEGER := 0;
+BEGIN
+    FOR s IN
+        SELECT hs.*, h.compression_enabled
+        FROM metadata.hypertable_settings hs
+        JOIN timescaledb_information.hypertables h
+          ON h.hypertable_schema = hs.schema_name AND h.hypertable_name = hs.table_name
+        WHERE (p_schema IS NULL OR hs.schema_name = p_schema)
+          AND (p_table IS NULL OR hs.table_name = p_table)
+    LOOP
+        hypertable := format('%I.%I', s.schema_name, s.table_name)::regclass;
+        PERFORM set_chunk_time_interval(hypertable, s.chunk_interval);
+        IF s.compression_enabled THEN
+            PERFORM remove_compression_policy(hypertable, if_exists => TRUE);
+            PERFORM decompress_chunk(c, if_compressed => TRUE)
+            FROM show_chunks(hypertable) c
+            WHERE s.compress_after IS NULL
+               OR c NOT IN (SELECT show_chunks(hypertable, older_than => s.compress_after));
+        END IF;
+
+        IF s.compress_after IS NULL THEN
+            IF s.compression_enabled THEN
+                EXECUTE format('ALTER TABLE %s SET (timescaledb.compress = false)', hypertable);
+            END IF;
+        ELSE
+            IF NOT s.compression_enabled THEN
+                EXECUTE format(
+                    'ALTER TABLE %s SET (timescaledb.compress, timescaledb.compress_segmentby = %L, timescaledb.compress_orderby = %L)',
+                    hypertable, s.segment_by, 'date DESC'
+                );
+            END IF;
+            PERFORM add_compression_policy(hypertable, s.compress_after);
+        END IF;
+        applied := applied + 1;
+    END LOOP;
+    RETURN applied;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT metadata.apply_hypertable_settings();
@@ -0,0 +1,26 @@
+-- =============================================================================
+-- Migration 007: watermark keys of tables without a series_id column
+-- =============================================================================
+--
+-- Tables without a series_id column (commodities.commodity_prices,
+-- survey_data.ism_manufacturing, survey_data.ism_non_manufacturing) keep
+-- their watermark under series_id ''. The registry loaders looked them up by
+-- FRED series id instead, recording empty watermarks that no load advanced,
+-- so those series were re-fetched from their default start every run. This
+-- removes the stray rows and rebuilds the watermarks of those tables.
+--
+--   docker compose exec -T timescaledb psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" \
+--       -f /docker-entrypoint-initdb.d/migrations/007_series_watermark_keys.sql
+
+WITH stray AS (
+    DELETE FROM metadata.series_watermarks w
+    WHERE w.series_id <> ''
+      AND NOT EXISTS (
+          SELECT 1 FROM information_schema.columns c
+          WHERE c.table_schema = w.schema_name AND c.table_name = w.table_name
+            AND c.column_name = 'series_id'
+      )
+    RETURNING w.schema_name, w.table_name
+)
+SELECT metadata.rebuild_series_watermarks(schema_name, table_name)
+FROM (SELECT DISTINCT schema_name, table_name FROM stray) AS t;